@@ -14,5 +14,18 @@ https://www.flightradar24.com/terms-and-conditions
 __author__ = "Jean Loui Bernard Silva de Jesus"
 __version__ = "1.4.0"
 
-from .api import Countries, FlightRadar24API, FlightTrackerConfig
+from .aio import AsyncFlightRadar24API
+from .api import Countries, FlightRadar24API, FlightTrackerConfig, ZonesSnapshot
+from .cache import FlightDetailCache, ResponseCache
 from .entities import Airport, Entity, Flight
+from .events import EventDetector, FlightEvent
+from .filters import FlightFilter
+from .geofence import CircleGeofence, Geofence, GeofenceSet, PolygonGeofence
+from .metrics import MetricsCollector, MetricsHook
+from .reference import ReferenceStore
+from .replay import FixtureServer, FixtureStore, ReplayAdapter
+from .request import HTTPSession
+from .schedule import ScheduleRecord
+from .snapshot import FlightChange, FlightsDelta, SnapshotStore
+from .spatial import AirportIndex, ZoneIndex
+from .tracks import Track, TrackStore
@@ -0,0 +1,290 @@
+# -*- coding: utf-8 -*-
+
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Tuple, Union
+
+import asyncio
+import dataclasses
+import time
+
+import aiohttp
+
+from .api import FlightTrackerConfig
+from .core import Core
+from .entities.airport import Airport
+from .entities.flight import Flight
+from .errors import CloudflareError
+from .filters import FlightFilter
+from .metrics import DecodeSample, MetricsHook, RequestSample, get_endpoint_name
+from .parsers import (
+    build_airport_details_params, build_flights_params, check_airport_code,
+    iter_flights, parse_airport, parse_airport_details, parse_search_results
+)
+from .ratelimit import RateLimiter
+from .replay import get_redirected_url
+from .request import decode_content, decompress_content
+
+
+class AsyncFlightRadar24API(object):
+    """
+    Asynchronous version of the FlightRadar24API, built on aiohttp.
+
+    All the requests share one connection pool and the number of concurrent
+    requests is limited by a semaphore.
+    """
+
+    def __init__(
+        self,
+        timeout: int = 10,
+        max_in_flight: int = 100,
+        session: Optional[aiohttp.ClientSession] = None,
+        flight_tracker_config: Optional[FlightTrackerConfig] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        metrics_hooks: Optional[List[MetricsHook]] = None,
+        redirect_url: Optional[str] = None
+    ):
+        """
+        Constructor of the AsyncFlightRadar24API class.
+
+        :param timeout: Timeout of each request, in seconds
+        :param max_in_flight: Maximum number of concurrent requests
+        :param session: aiohttp session used by the requests (optional). It is not closed by close()
+        :param flight_tracker_config: Settings of the Real Time Flight Tracker (optional)
+        :param rate_limiter: RateLimiter applied to the requests (optional). By default, a new one is created
+        :param metrics_hooks: MetricsHook instances that receive the measurements of every request (optional)
+        :param redirect_url: Base URL of a stand-in server (ex: FixtureServer) that receives all the requests (optional)
+        """
+        self.timeout: int = timeout
+        self.max_in_flight: int = max_in_flight
+
+        self.__session = session
+        self.__owns_session = session is None
+        self.__semaphore = asyncio.Semaphore(max_in_flight)
+        self.rate_limiter: RateLimiter = rate_limiter if rate_limiter is not None else RateLimiter()
+        self.metrics_hooks: List[MetricsHook] = list(metrics_hooks or [])
+        self.redirect_url: Optional[str] = redirect_url
+
+        self.__flight_tracker_config = flight_tracker_config if flight_tracker_config is not None else FlightTrackerConfig()
+
+    async def __aenter__(self) -> "AsyncFlightRadar24API":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    def __get_session(self) -> aiohttp.ClientSession:
+        """
+        Return the aiohttp session, creating it inside the running event loop if needed.
+        """
+        if self.__session is None or self.__session.closed:
+            connector = aiohttp.TCPConnector(limit=self.max_in_flight)
+            # The bodies are decompressed by decompress_content(), like the ones of the synchronous API.
+            self.__session = aiohttp.ClientSession(connector=connector, cookie_jar=aiohttp.DummyCookieJar(), auto_decompress=False)
+            self.__owns_session = True
+
+        return self.__session
+
+    async def __request(
+        self,
+        url: str,
+        params: Optional[Dict] = None,
+        headers: Optional[Dict] = None,
+        exclude_status_codes: Iterable[int] = ()
+    ) -> Tuple[int, Union[Dict, bytes]]:
+        """
+        Make a GET request and return its status code and decoded content.
+        """
+        if params: url += "?" + "&".join(["{}={}".format(k, v) for k, v in params.items()])
+
+        session = self.__get_session()
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        endpoint = get_endpoint_name(url)
+
+        if self.redirect_url: url = get_redirected_url(url, self.redirect_url)
+
+        async with self.__semaphore:
+            attempt = 0
+
+            while True:
+                delay = self.rate_limiter.reserve(url)
+                if delay > 0: await asyncio.sleep(delay)
+
+                start_time = time.perf_counter()
+
+                async with session.get(url, headers=headers, timeout=timeout) as response:
+                    ttfb = time.perf_counter() - start_time
+                    content = await response.read()
+                    retry_after = response.headers.get("Retry-After")
+
+                if self.metrics_hooks:
+                    content_length = response.headers.get("Content-Length", "")
+
+                    sample = RequestSample(
+                        endpoint=endpoint,
+                        method="GET",
+                        status_code=response.status,
+                        ttfb=ttfb,
+                        total=time.perf_counter() - start_time,
+                        compressed_bytes=int(content_length) if content_length.isdecimal() else len(content)
+                    )
+                    for hook in self.metrics_hooks: hook.on_request(sample)
+
+                # Slow down and retry the request if the server is throttling us.
+                if response.status not in self.rate_limiter.retry_status_codes:
+                    self.rate_limiter.reward(url)
+                    break
+
+                self.rate_limiter.penalize(url)
+
+                if attempt >= self.rate_limiter.max_retries:
+                    break
+
+                await asyncio.sleep(self.rate_limiter.get_backoff(attempt, retry_after))
+                attempt += 1
+
+        if response.status == 520:
+            raise CloudflareError(
+                message="An unexpected error has occurred. Perhaps you are making too many calls?",
+                response=response
+            )
+
+        if response.status not in exclude_status_codes:
+            response.raise_for_status()
+
+        # Sessions given by the user may have decompressed the body already.
+        content_encoding = "" if getattr(session, "auto_decompress", True) else response.headers.get("Content-Encoding", "")
+        content_type = response.headers["Content-Type"]
+
+        start_time = time.perf_counter()
+        content = decompress_content(content, content_encoding)
+        decoded_content = decode_content(content, "", content_type)
+
+        if self.metrics_hooks:
+            sample = DecodeSample(
+                endpoint=endpoint,
+                compressed_bytes=sample.compressed_bytes,
+                decompressed_bytes=len(content),
+                decode_time=time.perf_counter() - start_time
+            )
+            for hook in self.metrics_hooks: hook.on_decode(sample)
+
+        return response.status, decoded_content
+
+    async def close(self) -> None:
+        """
+        Close the aiohttp session, if it was created by this instance.
+        """
+        if self.__owns_session and self.__session is not None:
+            await self.__session.close()
+
+        self.__session = None
+
+    async def get_airport(self, code: str, *, details: bool = False) -> Airport:
+        """
+        Return basic information about a specific airport.
+
+        :param code: ICAO or IATA of the airport
+        :param details: If True, it returns an Airport instance with detailed information.
+        """
+        check_airport_code(code)
+
+        if details:
+            airport = Airport()
+
+            airport_details = await self.get_airport_details(code)
+            airport.set_airport_details(airport_details)
+
+            return airport
+
+        _, content = await self.__request(Core.airport_data_url.format(code), headers=Core.json_headers)
+        return parse_airport(code, content)
+
+    async def get_airport_details(self, code: str, flight_limit: int = 100, page: int = 1) -> Dict:
+        """
+        Return the airport details from FlightRadar24.
+
+        :param code: ICAO or IATA of the airport
+        :param flight_limit: Limit of flights related to the airport
+        :param page: Page of result to display
+        """
+        check_airport_code(code)
+
+        request_params = build_airport_details_params(code, flight_limit, page)
+
+        status_code, content = await self.__request(
+            Core.api_airport_data_url, request_params, Core.json_headers, exclude_status_codes=[400,]
+        )
+        return parse_airport_details(code, status_code, content)
+
+    async def get_flight_details(self, flight: Flight) -> Dict[Any, Any]:
+        """
+        Return the flight details from Data Live FlightRadar24.
+
+        :param flight: A Flight instance
+        """
+        _, content = await self.__request(Core.flight_data_url.format(flight.id), headers=Core.json_headers)
+        return content
+
+    async def iter_flight_details(
+        self,
+        flights: Iterable[Flight]
+    ) -> AsyncIterator[Tuple[Flight, Optional[Dict], Optional[Exception]]]:
+        """
+        Fetch the details of many flights concurrently, yielding them as they arrive.
+
+        Each item is a tuple (flight, details, error). A failed request does not stop
+        the others: its details are None and the error is returned instead.
+        """
+        async def fetch(flight: Flight) -> Tuple[Flight, Optional[Dict], Optional[Exception]]:
+            try:
+                return flight, await self.get_flight_details(flight), None
+            except Exception as error:
+                return flight, None, error
+
+        for task in asyncio.as_completed([fetch(flight) for flight in flights]):
+            yield await task
+
+    async def get_flights(
+        self,
+        airline: Optional[str] = None,
+        bounds: Optional[str] = None,
+        registration: Optional[str] = None,
+        aircraft_type: Optional[str] = None,
+        *,
+        details: bool = False,
+        flight_filter: Optional[FlightFilter] = None
+    ) -> List[Flight]:
+        """
+        Return a list of flights. See FlightRadar24API.get_flights() for the parameters.
+        """
+        request_params = build_flights_params(
+            dataclasses.asdict(self.__flight_tracker_config), None,
+            airline, bounds, registration, aircraft_type
+        )
+
+        _, content = await self.__request(Core.real_time_flight_tracker_data_url, request_params, Core.json_headers)
+
+        # Filters with criteria that are not in the feed are applied to the flights.
+        predicate = flight_filter.match_row if flight_filter and flight_filter.can_match_rows() else None
+        flights = list(iter_flights(content, predicate))
+
+        if flight_filter and predicate is None: flights = flight_filter.filter(flights)
+
+        # Set flight details.
+        if details:
+            async for flight, flight_details, error in self.iter_flight_details(flights):
+                if error is None: flight.set_flight_details(flight_details)
+
+        return flights
+
+    def get_flight_tracker_config(self) -> FlightTrackerConfig:
+        """
+        Return a copy of the current config of the Real Time Flight Tracker, used by get_flights() method.
+        """
+        return dataclasses.replace(self.__flight_tracker_config)
+
+    async def search(self, query: str, limit: int = 50) -> Dict:
+        """
+        Return the search result.
+        """
+        _, content = await self.__request(Core.search_data_url.format(query, limit), headers=Core.json_headers)
+        return parse_search_results(content)
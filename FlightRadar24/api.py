@@ -1,16 +1,36 @@
 # -*- coding: utf-8 -*-
 
-from typing import Any, Dict, List, Optional, Tuple, Union
-from bs4 import BeautifulSoup
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, List, Optional, Tuple, Union
+
+from concurrent.futures import Future
 
 import dataclasses
 import math
+import threading
+import time
+import warnings
 
+from .cache import FlightDetailCache, ResponseCache
+from .columnar import columns_to_dataframe, parse_feed_columns
+from .concurrency import bounded_crawl, bounded_map
 from .core import Core, Countries
 from .entities.airport import Airport
 from .entities.flight import Flight
-from .errors import AirportNotFoundError, LoginError
-from .request import APIRequest
+from .errors import LoginError
+from .filters import FlightFilter
+from .geofence import GeofenceSet
+from .metrics import MetricsHook
+from .parsers import (
+    build_airport_details_params, build_flights_params, check_airport_code, iter_flights as iter_parsed_flights,
+    parse_airlines, parse_airport, parse_airport_details, parse_bounds, parse_country_airports, parse_flights,
+    parse_search_results, split_zone
+)
+from .ratelimit import RateLimiter
+from .reference import ReferenceStore
+from .request import APIRequest, HTTPSession
+from .schedule import ScheduleRecord, get_page_count, iter_schedule_records
+
+_missing = object()
 
 
 @dataclasses.dataclass
@@ -33,111 +53,113 @@ class FlightTrackerConfig(object):
     limit: str = "5000"
 
 
+@dataclasses.dataclass
+class ZonesSnapshot(object):
+    """
+    Data class with the flights of many zones, fetched at the same time.
+    """
+    flights: List[Flight]
+    timings: Dict[str, float]
+    errors: Dict[str, Exception]
+    elapsed: float
+
+
 class FlightRadar24API(object):
     """
     Main class of the FlightRadarAPI
     """
 
-    def __init__(self, user: Optional[str] = None, password: Optional[str] = None, timeout: int = 10):
+    def __init__(
+        self,
+        user: Optional[str] = None,
+        password: Optional[str] = None,
+        timeout: int = 10,
+        session: Optional[HTTPSession] = None,
+        max_in_flight: int = 10,
+        cache: Optional[ResponseCache] = None,
+        reference_store: Optional[ReferenceStore] = None,
+        detail_cache: Optional[FlightDetailCache] = None
+    ):
         """
         Constructor of the FlightRadar24API class.
 
         :param user: Your email (optional)
         :param password: Your password (optional)
+        :param session: HTTPSession with the connection pool used by the requests (optional). By default, it has a RateLimiter
+        :param max_in_flight: Maximum number of concurrent requests when fetching flight details
+        :param cache: ResponseCache for airports, airlines, logos and flags (optional)
+        :param reference_store: ReferenceStore that keeps the airports and airlines between restarts (optional). See refresh_reference_data()
+        :param detail_cache: FlightDetailCache used by get_flight_details() to reuse the details of unchanged flights (optional)
         """
         self.__flight_tracker_config = FlightTrackerConfig()
         self.__login_data: Optional[Dict] = None
 
         self.timeout: int = timeout
+        self.session: HTTPSession = session if session is not None else HTTPSession(rate_limiter=RateLimiter())
+        self.max_in_flight: int = max_in_flight
+        self.cache: Optional[ResponseCache] = cache
+        self.reference_store: Optional[ReferenceStore] = reference_store
+        self.detail_cache: Optional[FlightDetailCache] = detail_cache
 
         if user is not None and password is not None:
             self.login(user, password)
 
+    def __cached(self, endpoint: str, key: Hashable, factory: Callable[[], Any], is_valid: Optional[Callable[[Any], bool]] = None) -> Any:
+        """
+        Return the value from the cache, calling the factory if it is not cached (or there is no cache).
+
+        If is_valid is given, the values for which it returns False are returned without caching them.
+        """
+        if self.cache is None:
+            return factory()
+
+        if is_valid is None:
+            return self.cache.get_or_set(endpoint, key, factory)
+
+        value = self.cache.get(endpoint, key, _missing)
+
+        if value is _missing:
+            value = factory()
+            if is_valid(value): self.cache.set(endpoint, key, value)
+
+        return value
+
+    def add_metrics_hook(self, hook: MetricsHook) -> None:
+        """
+        Register a MetricsHook (ex: MetricsCollector) that receives the measurements of every request.
+        """
+        self.session.metrics_hooks.append(hook)
+
     def get_airlines(self) -> List[Dict]:
         """
         Return a list with all airlines.
         """
-        response = APIRequest(Core.airlines_data_url, headers=Core.html_headers, timeout=self.timeout)
-        html_content: bytes = response.get_content()
-        airlines_data = []
-        
-        # Parse HTML content.
-        soup = BeautifulSoup(html_content, "html.parser")
-        
-        tbody = soup.find("tbody")
-
-        if not tbody:
-            return []
-        
-        # Extract data from HTML content.
-        tr_elements = tbody.find_all("tr")
-        
-        for tr in tr_elements:
-            td_notranslate = tr.find("td", class_="notranslate")
-            
-            if td_notranslate:
-                a_element = td_notranslate.find("a", href=lambda href: href and href.startswith("/data/airlines"))
-                
-                if a_element:
-                    td_elements = tr.find_all("td")
-
-                    # Extract airline name.
-                    airline_name = a_element.get_text(strip=True)
-
-                    if len(airline_name) < 2:
-                        continue
-
-                    # Extract IATA / ICAO codes.
-                    iata = None
-                    icao = None
-
-                    if len(td_elements) >= 4:
-                        codes_text = td_elements[3].get_text(strip=True)
-
-                        if " / " in codes_text:
-                            parts = codes_text.split(" / ")
-
-                            if len(parts) == 2:
-                                iata = parts[0].strip()
-                                icao = parts[1].strip()
-
-                        elif len(codes_text) == 2:
-                            iata = codes_text
-
-                        elif len(codes_text) == 3:
-                            icao = codes_text
-                    
-                    # Extract number of aircrafts.
-                    n_aircrafts = None
-
-                    if len(td_elements) >= 5:
-                        aircrafts_text = td_elements[4].get_text(strip=True)
-
-                        if aircrafts_text:
-                            n_aircrafts = aircrafts_text.split(" ", maxsplit=1)[0].strip()
-                            n_aircrafts = int(n_aircrafts)
-
-                    airline_data = {
-                        "Name": airline_name,
-                        "ICAO": icao,
-                        "IATA": iata,
-                        "n_aircrafts": n_aircrafts
-                    }
-                    
-                    airlines_data.append(airline_data)
-        
+        airlines_data = self.reference_store.get_airlines() if self.reference_store is not None else None
+
+        if airlines_data is None:
+            # An empty page (ex: blocked or changed) is neither cached nor stored.
+            airlines_data = self.__cached("airlines", None, self.__get_airlines, bool)
+            if self.reference_store is not None and airlines_data: self.reference_store.set_airlines(airlines_data)
+
         return airlines_data
 
+    def __get_airlines(self) -> List[Dict]:
+        response = APIRequest(Core.airlines_data_url, headers=Core.html_headers, timeout=self.timeout, session=self.session)
+        return parse_airlines(response.get_content())
+
     def get_airline_logo(self, iata: str, icao: str) -> Optional[Tuple[bytes, str]]:
         """
         Download the logo of an airline from FlightRadar24 and return it as bytes.
         """
         iata, icao = iata.upper(), icao.upper()
+        return self.__cached("airline_logo", (iata, icao), lambda: self.__get_airline_logo(iata, icao))
+
+    def __get_airline_logo(self, iata: str, icao: str) -> Optional[Tuple[bytes, str]]:
 
         first_logo_url = Core.airline_logo_url.format(iata, icao)
 
         # Try to get the image by the first URL option.
-        response = APIRequest(first_logo_url, headers=Core.image_headers, exclude_status_codes=[403,], timeout=self.timeout)
+        response = APIRequest(first_logo_url, headers=Core.image_headers, exclude_status_codes=[403,], timeout=self.timeout, session=self.session)
         status_code = response.get_status_code()
 
         if not str(status_code).startswith("4"):
@@ -146,7 +168,7 @@ class FlightRadar24API(object):
         # Get the image by the second airline logo URL.
         second_logo_url = Core.alternative_airline_logo_url.format(icao)
 
-        response = APIRequest(second_logo_url, headers=Core.image_headers, timeout=self.timeout)
+        response = APIRequest(second_logo_url, headers=Core.image_headers, timeout=self.timeout, session=self.session)
         status_code = response.get_status_code()
 
         if not str(status_code).startswith("4"):
@@ -159,8 +181,7 @@ class FlightRadar24API(object):
         :param code: ICAO or IATA of the airport
         :param details: If True, it returns an Airport instance with detailed information.
         """
-        if 4 < len(code) or len(code) < 3:
-            raise ValueError(f"The code '{code}' is invalid. It must be the IATA or ICAO of the airport.")
+        check_airport_code(code)
 
         if details:
             airport = Airport()
@@ -170,13 +191,23 @@ class FlightRadar24API(object):
 
             return airport
 
-        response = APIRequest(Core.airport_data_url.format(code), headers=Core.json_headers, timeout=self.timeout)
-        content = response.get_content()
+        content = self.reference_store.get_airport_content(code) if self.reference_store is not None else None
+
+        if content is not None:
+            return parse_airport(code, content)
 
-        if not content or not isinstance(content, dict) or not content.get("details"):
-            raise AirportNotFoundError(f"Could not find an airport by the code '{code}'.")
+        content = self.__cached("airport", code, lambda: self.__get_airport_content(code))
+        if self.reference_store is not None: self.reference_store.set_airport_content(code, content)
 
-        return Airport(info=content["details"])
+        return parse_airport(code, content)
+
+    def __get_airport_content(self, code: str) -> Any:
+        response = APIRequest(Core.airport_data_url.format(code), headers=Core.json_headers, timeout=self.timeout, session=self.session)
+        content = response.get_content()
+
+        # Invalid responses raise AirportNotFoundError here, so they are neither cached nor stored.
+        parse_airport(code, content)
+        return content
 
     def get_airport_details(self, code: str, flight_limit: int = 100, page: int = 1) -> Dict:
         """
@@ -186,143 +217,157 @@ class FlightRadar24API(object):
         :param flight_limit: Limit of flights related to the airport
         :param page: Page of result to display
         """
-        if 4 < len(code) or len(code) < 3:
-            raise ValueError(f"The code '{code}' is invalid. It must be the IATA or ICAO of the airport.")
-
-        request_params = {"format": "json"}
-
-        if self.__login_data is not None:
-            request_params["token"] = self.__login_data["cookies"]["_frPl"]
-
-        # Insert the method parameters into the dictionary for the request.
-        request_params["code"] = code
-        request_params["limit"] = flight_limit
-        request_params["page"] = page
+        check_airport_code(code)
 
-        # Request details from the FlightRadar24.
-        response = APIRequest(Core.api_airport_data_url, request_params, Core.json_headers, exclude_status_codes=[400,], timeout=self.timeout)
-        content: Dict = response.get_content()
+        def get_details() -> Dict:
+            request_params = build_airport_details_params(code, flight_limit, page, self.__login_data)
 
-        if response.get_status_code() == 400 and content.get("errors"):
-            errors = content["errors"]["errors"]["parameters"]
+            # Request details from the FlightRadar24.
+            response = APIRequest(Core.api_airport_data_url, request_params, Core.json_headers, exclude_status_codes=[400,], timeout=self.timeout, session=self.session)
+            return parse_airport_details(code, response.get_status_code(), response.get_content())
 
-            if errors.get("limit"):
-                raise ValueError(errors["limit"]["notBetween"])
+        return self.__cached("airport_details", (code, flight_limit, page, self.is_logged_in()), get_details)
 
-            raise AirportNotFoundError(f"Could not find an airport by the code '{code}'.", errors)
+    def iter_airport_schedule(
+        self,
+        code: str,
+        flight_limit: int = 100,
+        kinds: Iterable[str] = ("arrivals", "departures")
+    ) -> Iterator[ScheduleRecord]:
+        """
+        Yield every arrival and departure of the airport schedule as flat records, fetching all the pages.
 
-        result = content["result"]["response"]
+        The number of pages is read from the first page and the other pages are fetched concurrently
+        (see max_in_flight). Records are yielded as their pages arrive, so they are not sorted by page.
 
-        # Check whether it received data of an airport.
-        data = result.get("airport", dict()).get("pluginData", dict())
+        :param code: ICAO or IATA of the airport
+        :param flight_limit: Number of flights of each page
+        :param kinds: Parts of the schedule. Ex: ["departures"]
+        """
+        kinds = tuple(kinds)
+        first_page = self.get_airport_details(code, flight_limit, 1)
 
-        if "details" not in data and len(data.get("runways", [])) == 0 and len(data) <= 3:
-            raise AirportNotFoundError(f"Could not find an airport by the code '{code}'.")
+        def fetch_page(page: int) -> Dict:
+            return first_page if page == 1 else self.get_airport_details(code, flight_limit, page)
 
-        # Return the airport details.
-        return result
+        # The first page goes through bounded_map too, so the other pages are requested before it is consumed.
+        for page, airport_details, error in bounded_map(fetch_page, range(1, get_page_count(first_page, kinds) + 1), self.max_in_flight):
+            if error is not None: raise error
+            yield from iter_schedule_records(airport_details, kinds)
 
     def get_airport_disruptions(self) -> Dict:
         """
         Return airport disruptions.
         """
-        response = APIRequest(Core.airport_disruptions_url, headers=Core.json_headers, timeout=self.timeout)
+        response = APIRequest(Core.airport_disruptions_url, headers=Core.json_headers, timeout=self.timeout, session=self.session)
         return response.get_content()
 
     def get_airports(self, countries: List[Countries]) -> List[Airport]:
         """
         Return a list with all airports for specified countries.
 
+        The countries are fetched concurrently, but the airports are returned in the order of the countries.
+
         :param countries: List of country names from Countries enum.
         """
-        airports = []
+        airports_by_country: Dict[Countries, List[Airport]] = dict()
 
-        for country_name in countries:
-            country_href = Core.airports_data_url + "/" + country_name.value
+        for country, country_airports in self.__iter_country_airports(countries):
+            airports_by_country[country] = country_airports
 
-            response = APIRequest(country_href, headers=Core.html_headers, timeout=self.timeout)
+        return [airport for country in countries for airport in airports_by_country[country]]
 
-            html_content: bytes = response.get_content()
+    def iter_airports(self, countries: Iterable[Countries]) -> Iterator[Airport]:
+        """
+        Yield the airports of the specified countries as soon as each country is fetched.
 
-            soup = BeautifulSoup(html_content, "html.parser")
-            
-            tbody = soup.find("tbody")
+        The countries are fetched concurrently (see max_in_flight), so they are yielded in the order they complete.
 
-            if not tbody:
-                continue
-            
-            # Extract country name from the URL
-            country_name = country_href.split("/")[-1].replace("-", " ").title()
-
-            tr_elements = tbody.find_all("tr")
-
-            for tr in tr_elements:
-                a_elements = tr.find_all("a", attrs={"data-iata": True, "data-lat": True, "data-lon": True})
-                
-                if a_elements:
-                    a_element = a_elements[0]
-                    
-                    icao = ""
-                    iata = a_element.get("data-iata", "").strip()
-                    latitude = a_element.get("data-lat", "").strip()
-                    longitude = a_element.get("data-lon", "").strip()
-                    
-                    airport_text = a_element.get_text(strip=True)
-                    name_part = airport_text
-                    
-                    # Get IATA / ICAO from airport text.
-                    small_element = a_element.find("small")
-                    
-                    if small_element:
-                        codes_text = small_element.get_text(strip=True)
-                        codes_text = codes_text.lstrip("(")
-                        codes_text = codes_text.rstrip(")")
-                        codes_text = codes_text.strip()
-                        
-                        # Remove IATA / ICAO from name part.
-                        name_part = name_part.replace(codes_text, "")
-                        name_part = name_part.replace("()", "").strip()
-                        
-                        # Parse codes (can be "IATA/ICAO", "IATA", or "ICAO")
-                        if "/" in codes_text:
-                            codes = codes_text.split("/")
-    
-                            code1 = codes[0].strip()
-                            code2 = codes[1].strip()
-
-                            iata = code1 if len(code1) == 3 else code2
-                            icao = code1 if len(code1) == 4 else code2
-
-                        elif len(codes_text) == 3:
-                            iata = codes_text
-                                
-                        elif len(codes_text) == 4:
-                            icao = codes_text
-                    
-                    # Convert latitude and longitude to float
-                    try:
-                        lat_float = float(latitude) if latitude else 0.0
-                        lon_float = float(longitude) if longitude else 0.0
-
-                    except ValueError:
-                        lat_float = 0.0
-                        lon_float = 0.0
-                    
-                    # Create Airport instance with basic_info format
-                    airport_data = {
-                        "name": name_part,
-                        "icao": icao,
-                        "iata": iata,
-                        "lat": lat_float,
-                        "lon": lon_float,
-                        "alt": None,  # Altitude not available in this format
-                        "country": country_name
-                    }
-                    
-                    airport = Airport(basic_info=airport_data)
-                    airports.append(airport)
-        
-        return airports
+        :param countries: Country names from Countries enum.
+        """
+        for _, country_airports in self.__iter_country_airports(countries):
+            yield from country_airports
+
+    def __iter_country_airports(self, countries: Iterable[Countries]) -> Iterator[Tuple[Countries, List[Airport]]]:
+        def fetch_country(country: Countries) -> List[Dict]:
+            airports_data = self.reference_store.get_country_airports(country.value) if self.reference_store is not None else None
+
+            if airports_data is None:
+                # An empty page (ex: blocked or changed) is neither cached nor stored.
+                airports_data = self.__cached("airports", country.value, lambda: self.__get_country_airports(country), bool)
+                if self.reference_store is not None and airports_data: self.reference_store.set_country_airports(country.value, airports_data)
+
+            return airports_data
+
+        for country, airports_data, error in bounded_map(fetch_country, countries, self.max_in_flight):
+            if error is not None: raise error
+            yield country, [Airport(basic_info=airport_data) for airport_data in airports_data]
+
+    def __get_country_airports(self, country: Countries) -> List[Dict]:
+        country_href = Core.airports_data_url + "/" + country.value
+
+        response = APIRequest(country_href, headers=Core.html_headers, timeout=self.timeout, session=self.session)
+        return parse_country_airports(country_href, response.get_content())
+
+    def refresh_reference_data(self, countries: Optional[Iterable[Countries]] = None) -> Dict[str, Exception]:
+        """
+        Fetch again the stale data of the reference store: airports of each country, airlines and
+        airports of get_airport(). Data that is not stale is not requested. The requests bypass the cache.
+
+        Return the errors of the data that could not be fetched, by country value, "airlines" or airport code.
+
+        :param countries: Countries whose airports are refreshed (or fetched, if they are not stored). Defaults to the stored countries
+        """
+        store = self.reference_store
+
+        if store is None:
+            raise ValueError("The API has no reference store.")
+
+        country_values = [country.value for country in countries] if countries is not None else None
+
+        def refresh(item: Tuple[str, str]) -> None:
+            kind, key = item
+
+            # An empty page (ex: blocked or changed) is an error, so the stored rows are kept.
+            if kind == "airports":
+                airports_data = self.__get_country_airports(Countries(key))
+                if not airports_data: raise ValueError("No airports were found in the page of the country '{}'.".format(key))
+
+                store.set_country_airports(key, airports_data)
+
+            elif kind == "airlines":
+                airlines_data = self.__get_airlines()
+                if not airlines_data: raise ValueError("No airlines were found in the page of airlines.")
+
+                store.set_airlines(airlines_data)
+
+            else:
+                # An invalid response raises AirportNotFoundError and the stored one is kept.
+                store.set_airport_content(key, self.__get_airport_content(key))
+
+        items = [("airports", country) for country in store.get_stale_countries(country_values)]
+        items += [("airport", code) for code in store.get_stale_airport_codes()]
+
+        if store.are_airlines_stale(): items.append(("airlines", "airlines"))
+
+        return {key: error for (_, key), _, error in bounded_map(refresh, items, self.max_in_flight) if error is not None}
+
+    def start_reference_refresh(self, countries: Optional[Iterable[Countries]] = None) -> "Future[Dict[str, Exception]]":
+        """
+        Call refresh_reference_data() in a background thread, so the stored data can be used meanwhile.
+
+        Return a Future with the result of refresh_reference_data().
+        """
+        future: "Future[Dict[str, Exception]]" = Future()
+
+        def run() -> None:
+            try:
+                future.set_result(self.refresh_reference_data(countries))
+            except Exception as error:
+                future.set_exception(error)
+
+        threading.Thread(target=run, name="reference-refresh", daemon=True).start()
+        return future
 
 
     def get_bookmarks(self) -> Dict:
@@ -337,7 +382,7 @@ class FlightRadar24API(object):
 
         cookies = self.__login_data["cookies"]
 
-        response = APIRequest(Core.bookmarks_url, headers=headers, cookies=cookies, timeout=self.timeout)
+        response = APIRequest(Core.bookmarks_url, headers=headers, cookies=cookies, timeout=self.timeout, session=self.session)
         return response.get_content()
 
     def get_bounds(self, zone: Dict[str, float]) -> str:
@@ -408,13 +453,16 @@ class FlightRadar24API(object):
 
         :param country: Country name
         """
+        return self.__cached("country_flag", country.lower(), lambda: self.__get_country_flag(country))
+
+    def __get_country_flag(self, country: str) -> Optional[Tuple[bytes, str]]:
         flag_url = Core.country_flag_url.format(country.lower().replace(" ", "-"))
         headers = Core.image_headers.copy()
 
         if "origin" in headers:
             headers.pop("origin")  # Does not work for this request.
 
-        response = APIRequest(flag_url, headers=headers, timeout=self.timeout)
+        response = APIRequest(flag_url, headers=headers, timeout=self.timeout, session=self.session)
         status_code = response.get_status_code()
 
         if not str(status_code).startswith("4"):
@@ -426,8 +474,31 @@ class FlightRadar24API(object):
 
         :param flight: A Flight instance
         """
-        response = APIRequest(Core.flight_data_url.format(flight.id), headers=Core.json_headers, timeout=self.timeout)
-        return response.get_content()
+        def get_content() -> Dict[Any, Any]:
+            response = APIRequest(Core.flight_data_url.format(flight.id), headers=Core.json_headers, timeout=self.timeout, session=self.session)
+            return response.get_content()
+
+        if self.detail_cache is None:
+            return get_content()
+
+        return self.detail_cache.get_or_set(flight, get_content)
+
+    def iter_flight_details(
+        self,
+        flights: Iterable[Flight],
+        max_in_flight: Optional[int] = None
+    ) -> Iterator[Tuple[Flight, Optional[Dict], Optional[Exception]]]:
+        """
+        Fetch the details of many flights concurrently, yielding them as they arrive.
+
+        Each item is a tuple (flight, details, error). A failed request does not stop
+        the others: its details are None and the error is returned instead.
+
+        :param flights: Flight instances
+        :param max_in_flight: Maximum number of concurrent requests (defaults to the API setting)
+        """
+        max_in_flight = max_in_flight if max_in_flight is not None else self.max_in_flight
+        return bounded_map(self.get_flight_details, flights, max_in_flight)
 
     def get_flights(
         self,
@@ -436,7 +507,9 @@ class FlightRadar24API(object):
         registration: Optional[str] = None,
         aircraft_type: Optional[str] = None,
         *,
-        details: bool = False
+        details: bool = False,
+        flight_filter: Optional[FlightFilter] = None,
+        geofences: Optional[GeofenceSet] = None
     ) -> List[Flight]:
         """
         Return a list of flights. See more options at set_flight_tracker_config() method.
@@ -445,40 +518,256 @@ class FlightRadar24API(object):
         :param bounds: Coordinates (y1, y2 ,x1, x2). Ex: "75.78,-75.78,-427.56,427.56"
         :param registration: Aircraft registration
         :param aircraft_type: Aircraft model code. Ex: "B737"
-        :param details: If True, it returns flights with detailed information
+        :param details: If True, it returns flights with detailed information, fetched concurrently. Flights whose details could not be fetched are returned without them
+        :param flight_filter: Filter applied before fetching the details, to the raw rows if it can be (see FlightFilter.can_match_rows()) (optional)
+        :param geofences: Only the flights inside any geofence are returned, before fetching their details. The bounds default to their bounding box (optional)
         """
-        request_params = dataclasses.asdict(self.__flight_tracker_config)
+        if geofences is not None and bounds is None: bounds = geofences.get_bounds()
+
+        content = self.__get_flights_data(airline, bounds, registration, aircraft_type)
 
-        if self.__login_data is not None:
-            request_params["enc"] = self.__login_data["cookies"]["_frPl"]
+        # Filters with criteria that are not in the feed are applied to the flights.
+        predicate = flight_filter.match_row if flight_filter and flight_filter.can_match_rows() else None
+        flights = list(iter_parsed_flights(content, predicate))
 
-        # Insert the method parameters into the dictionary for the request.
-        if airline: request_params["airline"] = airline
-        if bounds: request_params["bounds"] = bounds.replace(",", "%2C")
-        if registration: request_params["reg"] = registration
-        if aircraft_type: request_params["type"] = aircraft_type
+        if flight_filter and predicate is None: flights = flight_filter.filter(flights)
+
+        if geofences is not None: flights = geofences.filter(flights)
+
+        # Set flight details.
+        if details: self.__set_flights_details(flights)
+
+        return flights
+
+    def __get_flights_data(
+        self,
+        airline: Optional[str] = None,
+        bounds: Optional[str] = None,
+        registration: Optional[str] = None,
+        aircraft_type: Optional[str] = None
+    ) -> Dict:
+        """
+        Return the raw response of the Real Time Flight Tracker.
+        """
+        request_params = build_flights_params(
+            dataclasses.asdict(self.__flight_tracker_config), self.__login_data,
+            airline, bounds, registration, aircraft_type
+        )
 
         # Get all flights from Data Live FlightRadar24.
-        response = APIRequest(Core.real_time_flight_tracker_data_url, request_params, Core.json_headers, timeout=self.timeout)
-        response = response.get_content()
+        response = APIRequest(Core.real_time_flight_tracker_data_url, request_params, Core.json_headers, timeout=self.timeout, session=self.session)
+        return response.get_content()
 
-        flights: List[Flight] = list()
+    def __set_flights_details(self, flights: List[Flight]) -> None:
+        """
+        Fetch the details of the flights concurrently and set them to the instances.
+        """
+        for flight, flight_details, error in self.iter_flight_details(flights):
+            if error is None: flight.set_flight_details(flight_details)
+
+    def get_flights_by_zones(
+        self,
+        zones: Optional[Dict[str, Dict]] = None,
+        airline: Optional[str] = None,
+        registration: Optional[str] = None,
+        aircraft_type: Optional[str] = None,
+        *,
+        details: bool = False
+    ) -> ZonesSnapshot:
+        """
+        Fetch the flights of the leaf subzones concurrently and return them as one snapshot.
 
-        for flight_id, flight_info in response.items():
+        Aircraft seen by more than one zone (at their borders) are returned once. The snapshot
+        also has the time spent on each zone and the errors of the zones that could not be fetched.
 
-            # Get flights only.
-            if not flight_id[0].isnumeric():
+        :param zones: Dictionary of zones, like the one returned by get_zones(). Defaults to all zones
+        :param airline: The airline ICAO. Ex: "DAL"
+        :param registration: Aircraft registration
+        :param aircraft_type: Aircraft model code. Ex: "B737"
+        :param details: If True, it returns flights with detailed information
+        """
+        zones = zones if zones is not None else self.get_zones()
+        start_time = time.perf_counter()
+
+        def get_leaf_zones(zones: Dict[str, Dict]) -> Iterator[Tuple[str, Dict]]:
+            for name, zone in zones.items():
+                if zone.get("subzones"): yield from get_leaf_zones(zone["subzones"])
+                else: yield name, zone
+
+        def fetch_zone(leaf_zone: Tuple[str, Dict]) -> Tuple[List[Flight], float]:
+            zone_start_time = time.perf_counter()
+            content = self.__get_flights_data(airline, self.get_bounds(leaf_zone[1]), registration, aircraft_type)
+            return parse_flights(content), time.perf_counter() - zone_start_time
+
+        flights: Dict[str, Flight] = dict()
+        timings: Dict[str, float] = dict()
+        errors: Dict[str, Exception] = dict()
+
+        for (name, _), result, error in bounded_map(fetch_zone, get_leaf_zones(zones), self.max_in_flight):
+            if error is not None:
+                errors[name] = error
                 continue
 
-            flight = Flight(flight_id, flight_info)
-            flights.append(flight)
+            zone_flights, timings[name] = result
 
-            # Set flight details.
-            if details:
-                flight_details = self.get_flight_details(flight)
-                flight.set_flight_details(flight_details)
+            for flight in zone_flights:
+                flights.setdefault(flight.id, flight)
 
-        return flights
+        if truncated_tiles:
+            warnings.warn(
+                "{} tiles reached the limit of {} flights at the maximum depth ({}), so some flights may be missing: {}".format(
+                    len(truncated_tiles), limit, max_depth, "; ".join(truncated_tiles)
+                ),
+                RuntimeWarning,
+                stacklevel=2
+            )
+
+        flights_list = list(flights.values())
+
+        # Set flight details.
+        if details: self.__set_flights_details(flights_list)
+
+        return ZonesSnapshot(flights_list, timings, errors, time.perf_counter() - start_time)
+
+    def get_flights_columns(
+        self,
+        airline: Optional[str] = None,
+        bounds: Optional[str] = None,
+        registration: Optional[str] = None,
+        aircraft_type: Optional[str] = None,
+        *,
+        flight_filter: Optional[FlightFilter] = None,
+        geofences: Optional[GeofenceSet] = None
+    ) -> Dict[str, "numpy.ndarray"]:
+        """
+        Return the flights as a dictionary of arrays (one per attribute), without creating Flight instances.
+
+        :param airline: The airline ICAO. Ex: "DAL"
+        :param bounds: Coordinates (y1, y2 ,x1, x2). Ex: "75.78,-75.78,-427.56,427.56"
+        :param registration: Aircraft registration
+        :param aircraft_type: Aircraft model code. Ex: "B737"
+        :param flight_filter: Filter applied to the arrays with vectorised operations (optional)
+        :param geofences: Only the flights inside any geofence are returned. The bounds default to their bounding box (optional)
+        """
+        if geofences is not None and bounds is None: bounds = geofences.get_bounds()
+
+        columns = parse_feed_columns(self.__get_flights_data(airline, bounds, registration, aircraft_type))
+
+        if flight_filter: columns = flight_filter.filter_columns(columns)
+        return geofences.filter_columns(columns) if geofences is not None else columns
+
+    def get_flights_frame(
+        self,
+        airline: Optional[str] = None,
+        bounds: Optional[str] = None,
+        registration: Optional[str] = None,
+        aircraft_type: Optional[str] = None,
+        *,
+        flight_filter: Optional[FlightFilter] = None,
+        geofences: Optional[GeofenceSet] = None
+    ) -> "pandas.DataFrame":
+        """
+        Return the flights as a pandas DataFrame indexed by the flight ID. See get_flights_columns().
+        """
+        columns = self.get_flights_columns(airline, bounds, registration, aircraft_type, flight_filter=flight_filter, geofences=geofences)
+        return columns_to_dataframe(columns)
+
+    def get_flights_tiled(
+        self,
+        airline: Optional[str] = None,
+        bounds: Optional[str] = None,
+        registration: Optional[str] = None,
+        aircraft_type: Optional[str] = None,
+        *,
+        max_depth: int = 6,
+        details: bool = False
+    ) -> List[Flight]:
+        """
+        Return a list of flights without the truncation caused by the "limit" option of the flight tracker config.
+
+        The bounds are scanned as an adaptive quadtree: each tile whose response reaches the limit
+        is split into four tiles, and the tiles are fetched concurrently. Flights are merged by ID.
+
+        If a tile still reaches the limit at the maximum depth, some of its flights may be missing and
+        a RuntimeWarning with the bounds of those tiles is issued.
+
+        :param airline: The airline ICAO. Ex: "DAL"
+        :param bounds: Coordinates (y1, y2 ,x1, x2). Ex: "75.78,-75.78,-427.56,427.56". Defaults to the whole globe
+        :param registration: Aircraft registration
+        :param aircraft_type: Aircraft model code. Ex: "B737"
+        :param max_depth: Maximum number of times a tile can be split
+        :param details: If True, it returns flights with detailed information
+        """
+        limit = int(self.__flight_tracker_config.limit)
+        zone = parse_bounds(bounds) if bounds else {"tl_y": 90, "br_y": -90, "tl_x": -180, "br_x": 180}
+
+        def fetch_tile(tile: Tuple[Dict[str, float], int]) -> List[Flight]:
+            return parse_flights(self.__get_flights_data(airline, self.get_bounds(tile[0]), registration, aircraft_type))
+
+        truncated_tiles: List[str] = list()
+
+        def split_tile(tile: Tuple[Dict[str, float], int], tile_flights: List[Flight]) -> List[Tuple[Dict[str, float], int]]:
+            tile_zone, depth = tile
+
+            # Refine only the tiles that may have been truncated.
+            if len(tile_flights) < limit:
+                return []
+
+            if depth >= max_depth:
+                truncated_tiles.append(self.get_bounds(tile_zone))
+                return []
+
+            return [(subzone, depth + 1) for subzone in split_zone(tile_zone)]
+
+        flights: Dict[str, Flight] = dict()
+
+        for _, tile_flights, error in bounded_crawl(fetch_tile, [(zone, 0)], split_tile, self.max_in_flight):
+            if error is not None: raise error
+
+            for flight in tile_flights:
+                flights[flight.id] = flight
+
+        if truncated_tiles:
+            warnings.warn(
+                "{} tiles reached the limit of {} flights at the maximum depth ({}), so some flights may be missing: {}".format(
+                    len(truncated_tiles), limit, max_depth, "; ".join(truncated_tiles)
+                ),
+                RuntimeWarning,
+                stacklevel=2
+            )
+
+        flights_list = list(flights.values())
+
+        # Set flight details.
+        if details: self.__set_flights_details(flights_list)
+
+        return flights_list
+
+    def iter_flights(
+        self,
+        predicate: Optional[Callable[[List[Any]], bool]] = None,
+        airline: Optional[str] = None,
+        bounds: Optional[str] = None,
+        registration: Optional[str] = None,
+        aircraft_type: Optional[str] = None
+    ) -> Iterator[Flight]:
+        """
+        Yield the flights one by one, creating only those whose raw row passes the predicate.
+
+        The predicate receives the raw row of the Real Time Flight Tracker, a list whose indexes are
+        in Flight.feed_fields. Ex: lambda row: row[Flight.feed_fields["altitude"]] < 10000
+
+        The generator can be given directly to iter_flight_details() to start the detail requests
+        while the rest of the rows are processed.
+
+        :param predicate: Function that returns True for the rows to be kept (optional)
+        :param airline: The airline ICAO. Ex: "DAL"
+        :param bounds: Coordinates (y1, y2 ,x1, x2). Ex: "75.78,-75.78,-427.56,427.56"
+        :param registration: Aircraft registration
+        :param aircraft_type: Aircraft model code. Ex: "B737"
+        """
+        content = self.__get_flights_data(airline, bounds, registration, aircraft_type)
+        return iter_parsed_flights(content, predicate)
 
     def get_flight_tracker_config(self) -> FlightTrackerConfig:
         """
@@ -505,7 +794,7 @@ class FlightRadar24API(object):
         response = APIRequest(
             Core.historical_data_url.format(flight.id, file_type, timestamp),
             headers=Core.json_headers, cookies=self.__login_data["cookies"],
-            timeout=self.timeout
+            timeout=self.timeout, session=self.session
         )
 
         content = response.get_content()
@@ -524,14 +813,14 @@ class FlightRadar24API(object):
         """
         Return the most tracked data.
         """
-        response = APIRequest(Core.most_tracked_url, headers=Core.json_headers, timeout=self.timeout)
+        response = APIRequest(Core.most_tracked_url, headers=Core.json_headers, timeout=self.timeout, session=self.session)
         return response.get_content()
 
     def get_volcanic_eruptions(self) -> Dict:
         """
         Return boundaries of volcanic eruptions and ash clouds impacting aviation.
         """
-        response = APIRequest(Core.volcanic_eruption_data_url, headers=Core.json_headers, timeout=self.timeout)
+        response = APIRequest(Core.volcanic_eruption_data_url, headers=Core.json_headers, timeout=self.timeout, session=self.session)
         return response.get_content()
 
     def get_zones(self) -> Dict[str, Dict]:
@@ -552,20 +841,8 @@ class FlightRadar24API(object):
         """
         Return the search result.
         """
-        response = APIRequest(Core.search_data_url.format(query, limit), headers=Core.json_headers, timeout=self.timeout)
-        results = response.get_content().get("results", [])
-        stats = response.get_content().get("stats", {})
-
-        i = 0
-        counted_total = 0
-        data = {}
-        for name, count in stats.get("count", {}).items():
-            data[name] = []
-            while i < counted_total + count and i < len(results):
-                data[name].append(results[i])
-                i += 1
-            counted_total += count
-        return data
+        response = APIRequest(Core.search_data_url.format(query, limit), headers=Core.json_headers, timeout=self.timeout, session=self.session)
+        return parse_search_results(response.get_content())
 
     def is_logged_in(self) -> bool:
         """
@@ -587,7 +864,7 @@ class FlightRadar24API(object):
             "type": "web"
         }
 
-        response = APIRequest(Core.user_login_url, headers=Core.json_headers, data=data, timeout=self.timeout)
+        response = APIRequest(Core.user_login_url, headers=Core.json_headers, data=data, timeout=self.timeout, session=self.session)
         status_code = response.get_status_code()
         content = response.get_content()
 
@@ -611,7 +888,7 @@ class FlightRadar24API(object):
         cookies = self.__login_data["cookies"]
         self.__login_data = None
 
-        response = APIRequest(Core.user_login_url, headers=Core.json_headers, cookies=cookies, timeout=self.timeout)
+        response = APIRequest(Core.user_login_url, headers=Core.json_headers, cookies=cookies, timeout=self.timeout, session=self.session)
         return str(response.get_status_code()).startswith("2")
 
     def set_flight_tracker_config(
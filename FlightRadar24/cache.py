@@ -0,0 +1,340 @@
+# -*- coding: utf-8 -*-
+
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+import pickle
+import sqlite3
+import threading
+import time
+
+
+class ResponseCache(object):
+    """
+    Two-tier cache for data that rarely changes (airports, airlines, logos...).
+
+    Entries live in a size-bounded in-memory LRU and, optionally, in a SQLite
+    file that survives restarts. Each endpoint has its own time to live.
+    Values are stored pickled, so callers always receive a fresh copy.
+    """
+
+    default_ttls: Dict[str, float] = {
+        "airport": 24 * 60 * 60,
+        "airport_details": 5 * 60,
+        "airlines": 24 * 60 * 60,
+        "airports": 7 * 24 * 60 * 60,
+        "airline_logo": 30 * 24 * 60 * 60,
+        "country_flag": 30 * 24 * 60 * 60
+    }
+
+    __missing = object()
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttls: Optional[Dict[str, float]] = None,
+        path: Optional[str] = None,
+        max_disk_entries: int = 100000
+    ):
+        """
+        Constructor of the ResponseCache class.
+
+        :param max_entries: Maximum number of entries kept in memory
+        :param ttls: Time to live, in seconds, of each endpoint. It updates the default_ttls
+        :param path: Path of the SQLite file used as the on-disk tier (optional)
+        :param max_disk_entries: Maximum number of entries kept on disk
+        """
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+
+        self.ttls = self.default_ttls.copy()
+        self.ttls.update(ttls or dict())
+
+        self.__lock = threading.Lock()
+        self.__memory: "OrderedDict[Tuple[str, Hashable], Tuple[float, bytes]]" = OrderedDict()
+        self.__stats = {"hits": 0, "misses": 0, "memory_hits": 0, "disk_hits": 0, "evictions": 0}
+
+        self.__database: Optional[sqlite3.Connection] = None
+
+        if path is not None:
+            self.__database = sqlite3.connect(path, check_same_thread=False)
+            self.__database.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "endpoint TEXT, key TEXT, expires_at REAL, accessed_at REAL, value BLOB, "
+                "PRIMARY KEY (endpoint, key))"
+            )
+            self.__database.commit()
+
+    def __get_ttl(self, endpoint: str) -> float:
+        if endpoint not in self.ttls:
+            raise KeyError(f"Unknown endpoint: '{endpoint}'")
+
+        return self.ttls[endpoint]
+
+    def __store_in_memory(self, entry_key: Tuple[str, Hashable], expires_at: float, value: bytes) -> None:
+        self.__memory[entry_key] = (expires_at, value)
+        self.__memory.move_to_end(entry_key)
+
+        while len(self.__memory) > self.max_entries:
+            self.__memory.popitem(last=False)
+            self.__stats["evictions"] += 1
+
+    def __load(self, endpoint: str, key: Hashable) -> Any:
+        """
+        Return the pickled value of an entry, or the __missing sentinel. Must be called with the lock held.
+        """
+        now = time.time()
+        entry_key = (endpoint, key)
+
+        # Search in memory first.
+        entry = self.__memory.get(entry_key)
+
+        if entry is not None:
+            if entry[0] > now:
+                self.__memory.move_to_end(entry_key)
+                self.__stats["memory_hits"] += 1
+                return entry[1]
+
+            del self.__memory[entry_key]
+
+        # Search on disk.
+        if self.__database is not None:
+            row = self.__database.execute(
+                "SELECT expires_at, value FROM cache WHERE endpoint = ? AND key = ?", (endpoint, repr(key))
+            ).fetchone()
+
+            if row is not None and row[0] > now:
+                self.__database.execute(
+                    "UPDATE cache SET accessed_at = ? WHERE endpoint = ? AND key = ?", (now, endpoint, repr(key))
+                )
+                self.__database.commit()
+
+                self.__store_in_memory(entry_key, row[0], row[1])
+                self.__stats["disk_hits"] += 1
+                return row[1]
+
+        return self.__missing
+
+    def get(self, endpoint: str, key: Hashable, default: Any = None) -> Any:
+        """
+        Return a cached value, or the default if it is missing or expired.
+
+        :param endpoint: Name of the endpoint. Ex: "airport"
+        :param key: Key of the entry inside the endpoint. Ex: "MAD"
+        """
+        self.__get_ttl(endpoint)
+
+        with self.__lock:
+            value = self.__load(endpoint, key)
+
+            if value is self.__missing:
+                self.__stats["misses"] += 1
+                return default
+
+            self.__stats["hits"] += 1
+
+        return pickle.loads(value)
+
+    def set(self, endpoint: str, key: Hashable, value: Any) -> None:
+        """
+        Store a value with the time to live of its endpoint.
+
+        :param endpoint: Name of the endpoint. Ex: "airport"
+        :param key: Key of the entry inside the endpoint. Ex: "MAD"
+        :param value: Any picklable object
+        """
+        now = time.time()
+        expires_at = now + self.__get_ttl(endpoint)
+        value = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+
+        with self.__lock:
+            self.__store_in_memory((endpoint, key), expires_at, value)
+
+            if self.__database is None:
+                return
+
+            self.__database.execute(
+                "INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?, ?)", (endpoint, repr(key), expires_at, now, value)
+            )
+
+            # Remove the expired entries and the least recently used ones.
+            self.__database.execute("DELETE FROM cache WHERE expires_at <= ?", (now,))
+            self.__database.execute(
+                "DELETE FROM cache WHERE rowid IN (SELECT rowid FROM cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_disk_entries,)
+            )
+            self.__database.commit()
+
+    def get_or_set(self, endpoint: str, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """
+        Return a cached value. If it is missing or expired, call the factory and cache its result.
+
+        :param endpoint: Name of the endpoint. Ex: "airport"
+        :param key: Key of the entry inside the endpoint. Ex: "MAD"
+        :param factory: Function that returns the value when it is not cached
+        """
+        self.__get_ttl(endpoint)
+
+        with self.__lock:
+            value = self.__load(endpoint, key)
+            self.__stats["hits" if value is not self.__missing else "misses"] += 1
+
+        if value is not self.__missing:
+            return pickle.loads(value)
+
+        value = factory()
+        self.set(endpoint, key, value)
+
+        return value
+
+    def clear(self) -> None:
+        """
+        Remove all the entries from memory and disk.
+        """
+        with self.__lock:
+            self.__memory.clear()
+
+            if self.__database is not None:
+                self.__database.execute("DELETE FROM cache")
+                self.__database.commit()
+
+    def close(self) -> None:
+        """
+        Close the on-disk tier.
+        """
+        with self.__lock:
+            if self.__database is not None:
+                self.__database.close()
+                self.__database = None
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Return the hit and miss counters and the number of entries in memory.
+        """
+        with self.__lock:
+            stats = self.__stats.copy()
+            stats["entries"] = len(self.__memory)
+
+        return stats
+
+
+class FlightDetailCache(object):
+    """
+    In-memory cache of flight details, keyed by the FlightRadar24 flight ID.
+
+    Each entry keeps a fingerprint of the flight, built from fields of the Real Time Flight Tracker.
+    When a later snapshot of the same flight has a different fingerprint (ex: it took off or landed),
+    or the entry is older than its time to live, the details are fetched again.
+
+    The position timestamp ("time") is not in the default fingerprint, because it changes on every
+    update of an airborne aircraft and no entry would ever be reused.
+    """
+
+    default_fingerprint_fields: Tuple[str, ...] = (
+        "on_ground", "squawk", "origin_airport_iata", "destination_airport_iata",
+        "number", "callsign", "registration", "aircraft_code"
+    )
+
+    __missing = object()
+
+    def __init__(self, ttl: float = 10 * 60, max_entries: int = 10000, fingerprint_fields: Optional[Tuple[str, ...]] = None):
+        """
+        Constructor of the FlightDetailCache class.
+
+        :param ttl: Time to live of the entries, in seconds
+        :param max_entries: Maximum number of flights kept in memory
+        :param fingerprint_fields: Flight attributes whose change invalidates the details. Defaults to default_fingerprint_fields
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.fingerprint_fields = fingerprint_fields if fingerprint_fields is not None else self.default_fingerprint_fields
+
+        self.__lock = threading.Lock()
+        self.__entries: "OrderedDict[str, Tuple[float, Tuple, bytes]]" = OrderedDict()
+        self.__stats = {"hits": 0, "misses": 0, "changes": 0, "expirations": 0, "evictions": 0}
+
+    def get_fingerprint(self, flight: Any) -> Tuple:
+        """
+        Return the values of the fingerprint fields of a flight.
+        """
+        return tuple(getattr(flight, name, None) for name in self.fingerprint_fields)
+
+    def get(self, flight: Any, default: Any = None) -> Any:
+        """
+        Return the cached details of a flight, or the default if they are missing, expired or the flight has changed.
+
+        :param flight: A Flight instance
+        """
+        fingerprint = self.get_fingerprint(flight)
+
+        with self.__lock:
+            entry = self.__entries.get(flight.id)
+
+            if entry is None:
+                self.__stats["misses"] += 1
+                return default
+
+            if entry[0] <= time.time() or entry[1] != fingerprint:
+                del self.__entries[flight.id]
+
+                self.__stats["misses"] += 1
+                self.__stats["expirations" if entry[1] == fingerprint else "changes"] += 1
+                return default
+
+            self.__entries.move_to_end(flight.id)
+            self.__stats["hits"] += 1
+
+        return pickle.loads(entry[2])
+
+    def set(self, flight: Any, details: Any) -> None:
+        """
+        Store the details of a flight, with its current fingerprint.
+
+        :param flight: A Flight instance
+        :param details: Details returned by FlightRadar24API.get_flight_details()
+        """
+        entry = (time.time() + self.ttl, self.get_fingerprint(flight), pickle.dumps(details, protocol=pickle.HIGHEST_PROTOCOL))
+
+        with self.__lock:
+            self.__entries[flight.id] = entry
+            self.__entries.move_to_end(flight.id)
+
+            while len(self.__entries) > self.max_entries:
+                self.__entries.popitem(last=False)
+                self.__stats["evictions"] += 1
+
+    def get_or_set(self, flight: Any, factory: Callable[[], Any]) -> Any:
+        """
+        Return the cached details of a flight. If they are missing or invalid, call the factory and cache its result.
+        """
+        details = self.get(flight, self.__missing)
+
+        if details is self.__missing:
+            details = factory()
+            self.set(flight, details)
+
+        return details
+
+    def invalidate(self, flight_id: str) -> None:
+        """
+        Remove the details of a flight.
+        """
+        with self.__lock:
+            self.__entries.pop(flight_id, None)
+
+    def clear(self) -> None:
+        """
+        Remove all the entries.
+        """
+        with self.__lock:
+            self.__entries.clear()
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Return the hit and miss counters, the invalidations by change and expiration, and the number of entries.
+        """
+        with self.__lock:
+            stats = self.__stats.copy()
+            stats["entries"] = len(self.__entries)
+
+        return stats
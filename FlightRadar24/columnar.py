@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+
+"""
+Columnar parsing of the Real Time Flight Tracker data, for vectorised filtering and analytics.
+"""
+
+from numbers import Real
+from typing import Any, Dict, List
+
+import numpy as np
+
+from .entities.flight import Flight
+
+# Type of each column. Numbers are stored as float64, so missing values become NaN.
+column_types: Dict[str, Any] = {
+    "icao_24bit": object,
+    "latitude": np.float64,
+    "longitude": np.float64,
+    "heading": np.float64,
+    "altitude": np.float64,
+    "ground_speed": np.float64,
+    "squawk": object,
+    "aircraft_code": object,
+    "registration": object,
+    "time": np.float64,
+    "origin_airport_iata": object,
+    "destination_airport_iata": object,
+    "number": object,
+    "on_ground": np.bool_,
+    "vertical_speed": np.float64,
+    "callsign": object,
+    "airline_icao": object
+}
+
+
+def parse_feed_columns(content: Dict) -> Dict[str, np.ndarray]:
+    """
+    Parse a response of the Real Time Flight Tracker into one array per attribute,
+    without creating Flight instances. The "id" column has the flight IDs.
+
+    :param content: Decoded response of the Real Time Flight Tracker
+    """
+    flight_ids: List[str] = list()
+    rows: List[List[Any]] = list()
+
+    for flight_id, flight_info in content.items():
+
+        # Get flights only.
+        if not flight_id[0].isnumeric():
+            continue
+
+        flight_ids.append(flight_id)
+        rows.append(flight_info)
+
+    columns: Dict[str, np.ndarray] = {"id": np.array(flight_ids, dtype=object)}
+
+    # Transpose the rows, so each field is read only once.
+    fields = list(zip(*rows)) if rows else [()] * (max(Flight.feed_fields.values()) + 1)
+
+    for name, index in Flight.feed_fields.items():
+        values = fields[index]
+
+        # Non-numeric values of numeric fields (ex: "N/A") become NaN, so one bad row does not abort the parse.
+        if column_types[name] is np.float64:
+            values = [value if isinstance(value, Real) else np.nan for value in values]
+
+        columns[name] = np.array(values, dtype=column_types[name])
+
+    # Same as Flight.airline_iata.
+    columns["airline_iata"] = np.array([number[:2] if number else "" for number in columns["number"]], dtype=object)
+
+    return columns
+
+
+def columns_to_dataframe(columns: Dict[str, np.ndarray]) -> "pandas.DataFrame":
+    """
+    Return a pandas DataFrame, indexed by the flight ID, with the columns returned by parse_feed_columns().
+    """
+    # pandas is imported here, so importing the package does not load it.
+    import pandas
+
+    return pandas.DataFrame(columns).set_index("id")
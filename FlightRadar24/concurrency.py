@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Deque, Dict, Iterable, Iterator, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+_exhausted = object()
+
+
+def bounded_map(
+    function: Callable[[T], R],
+    items: Iterable[T],
+    max_in_flight: int = 10
+) -> Iterator[Tuple[T, Optional[R], Optional[Exception]]]:
+    """
+    Call a function for each item in a thread pool, yielding the results as soon as they are ready.
+
+    At most "max_in_flight" calls run at the same time. A failed call does not stop the others:
+    each result is yielded as a tuple (item, result, error), where error is None on success.
+
+    :param function: Function called with each item
+    :param items: Items to process (consumed lazily)
+    :param max_in_flight: Maximum number of concurrent calls
+    """
+    return bounded_crawl(function, items, None, max_in_flight)
+
+
+def bounded_crawl(
+    function: Callable[[T], R],
+    items: Iterable[T],
+    expand: Optional[Callable[[T, R], Iterable[T]]],
+    max_in_flight: int = 10
+) -> Iterator[Tuple[T, Optional[R], Optional[Exception]]]:
+    """
+    Same as bounded_map(), but each successful result may add new items to process.
+
+    :param function: Function called with each item
+    :param items: Initial items to process (consumed lazily)
+    :param expand: Function called with each item and its result, returning the new items (optional)
+    :param max_in_flight: Maximum number of concurrent calls
+    """
+    if max_in_flight < 1:
+        raise ValueError("max_in_flight must be greater than zero.")
+
+    items = iter(items)
+    queue: Deque[T] = deque()
+    pending: Dict[Future, T] = dict()
+
+    with ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+
+        def submit_next() -> bool:
+            if queue:
+                item = queue.popleft()
+            else:
+                item = next(items, _exhausted)
+                if item is _exhausted: return False
+
+            pending[executor.submit(function, item)] = item
+            return True
+
+        # Fill the window of concurrent calls.
+        while len(pending) < max_in_flight and submit_next():
+            pass
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                item = pending.pop(future)
+                error = future.exception()
+
+                if error is None and expand is not None:
+                    queue.extend(expand(item, future.result()))
+
+                yield (item, None, error) if error is not None else (item, future.result(), None)
+
+            # Keep the window full.
+            while len(pending) < max_in_flight and submit_next():
+                pass
@@ -3,11 +3,72 @@
 from typing import Any, Dict, Optional
 from .entity import Entity
 
+_plugin_data = ("airport", "pluginData")
+
+
+def _get_reviews_url(airport: "Airport") -> Any:
+    """
+    Return the absolute URL of the reviews of an airport, from its details.
+    """
+    reviews_url = airport._details
+
+    for key in _plugin_data + ("flightdiary",):
+        reviews_url = reviews_url.get(key)
+        if reviews_url is None or reviews_url == Entity._default_text: reviews_url = dict()
+
+    reviews_url = reviews_url.get("url")
+
+    if reviews_url and isinstance(reviews_url, str):
+        return "https://www.flightradar24.com" + reviews_url
+
+    return reviews_url if reviews_url is not None and reviews_url != Entity._default_text else Entity._default_text
+
 
 class Airport(Entity):
     """
     Airport representation.
     """
+
+    __slots__ = (
+        "altitude", "name", "icao", "iata", "country", "country_code", "city", "timezone_name",
+        "timezone_offset", "timezone_offset_hours", "timezone_abbr", "timezone_abbr_name", "visible", "website"
+    )
+
+    # Attributes resolved from the airport details. See set_airport_details().
+    _detail_fields = {
+        # Airport location.
+        "country_id": (_plugin_data + ("details", "position", "country", "id"), None),
+
+        # Airport reviews.
+        "reviews_url": _get_reviews_url,
+        "reviews": (_plugin_data + ("flightdiary", "reviews"), None),
+        "evaluation": (_plugin_data + ("flightdiary", "evaluation"), None),
+        "average_rating": (_plugin_data + ("flightdiary", "ratings", "avg"), None),
+        "total_rating": (_plugin_data + ("flightdiary", "ratings", "total"), None),
+
+        # Weather information.
+        "weather": (_plugin_data + ("weather",), dict),
+
+        # Runway information.
+        "runways": (_plugin_data + ("runways",), None),
+
+        # Aircraft count information.
+        "aircraft_on_ground": (_plugin_data + ("aircraftCount", "onGround", "total"), None),
+        "aircraft_visible_on_ground": (_plugin_data + ("aircraftCount", "onGround", "visible"), None),
+
+        # Schedule information.
+        "arrivals": (_plugin_data + ("schedule", "arrivals"), dict),
+        "departures": (_plugin_data + ("schedule", "departures"), dict),
+
+        # Link for more information.
+        "wikipedia": (_plugin_data + ("details", "url", "wikipedia"), None),
+
+        # Other information.
+        "images": (_plugin_data + ("details", "airportImages"), dict),
+    }
+
+    _raw_detail_fields = frozenset(["runways"])
+
     def __init__(self, basic_info: Dict = dict(), info: Dict = dict()):
         """
         Constructor of the Airport class.
@@ -85,7 +146,12 @@ class Airport(Entity):
     def set_airport_details(self, airport_details: Dict) -> None:
         """
         Set airport details to the instance. Use FlightRadar24API.get_airport_details(...) method to get it.
+
+        The basic information is set now. The other detail attributes (reviews, weather, runways,
+        schedule...) are kept as received and resolved on their first access.
         """
+        self._set_details(airport_details)
+
         # Get airport data.
         airport = self.__get_info(airport_details.get("airport"), dict())
         airport = self.__get_info(airport.get("pluginData"), dict())
@@ -99,20 +165,9 @@ class Airport(Entity):
         country = self.__get_info(position.get("country"), dict())
         region = self.__get_info(position.get("region"), dict())
 
-        # Get reviews of the airport.
-        flight_diary = self.__get_info(airport.get("flightdiary"), dict())
-        ratings = self.__get_info(flight_diary.get("ratings"), dict())
-
-        # Get schedule information.
-        schedule = self.__get_info(airport.get("schedule"), dict())
-
         # Get timezone information.
         timezone = self.__get_info(details.get("timezone"), dict())
 
-        # Get aircraft count.
-        aircraft_count = self.__get_info(airport.get("aircraftCount"), dict())
-        aircraft_on_ground = self.__get_info(aircraft_count.get("onGround"), dict())
-
         # Get URLs for more information about the airport.
         urls = self.__get_info(details.get("url"), dict())
 
@@ -127,7 +182,6 @@ class Airport(Entity):
         # Airport location.
         self.country = self.__get_info(country.get("name"))
         self.country_code = self.__get_info(country.get("code"))
-        self.country_id = self.__get_info(country.get("id"))
         self.city = self.__get_info(region.get("city"))
 
         # Airport timezone.
@@ -141,38 +195,8 @@ class Airport(Entity):
             self.timezone_offset_hours = f"{self.timezone_offset_hours}:00"
         else: self.timezone_offset_hours = self.__get_info(None)
 
-        # Airport reviews.
-        self.reviews_url = flight_diary.get("url")
-
-        if self.reviews_url and isinstance(self.reviews_url, str):
-            self.reviews_url = "https://www.flightradar24.com" + self.reviews_url
-        else:
-            self.reviews_url = self.__get_info(self.reviews_url)
-
-        self.reviews = self.__get_info(flight_diary.get("reviews"))
-        self.evaluation = self.__get_info(flight_diary.get("evaluation"))
-
-        self.average_rating = self.__get_info(ratings.get("avg"))
-        self.total_rating = self.__get_info(ratings.get("total"))
-
-        # Weather information.
-        self.weather = self.__get_info(airport.get("weather"), dict())
-
-        # Runway information.
-        self.runways = airport.get("runways", list())
-
-        # Aircraft count information.
-        self.aircraft_on_ground = self.__get_info(aircraft_on_ground.get("total"))
-        self.aircraft_visible_on_ground = self.__get_info(aircraft_on_ground.get("visible"))
-
-        # Schedule information.
-        self.arrivals = self.__get_info(schedule.get("arrivals"), dict())
-        self.departures = self.__get_info(schedule.get("departures"), dict())
-
-        # Link for the homepage and more information
+        # Link for the homepage.
         self.website = self.__get_info(urls.get("homepage"))
-        self.wikipedia = self.__get_info(urls.get("wikipedia"))
 
         # Other information.
         self.visible = self.__get_info(details.get("visible"))
-        self.images = self.__get_info(details.get("airportImages"), dict())
@@ -1,16 +1,33 @@
 # -*- coding: utf-8 -*-
 
 from abc import ABC
-from math import acos, cos, radians, sin
+from math import asin, cos, radians, sin, sqrt
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .. import geo
 
 
 class Entity(ABC):
     """
     Representation of a real entity, at some location.
+
+    Entities use __slots__ to keep large snapshots small. Detailed information is kept
+    as the received dictionary and each detail attribute is only resolved on its first access.
     """
 
+    __slots__ = ("latitude", "longitude", "_details", "_details_cache")
+
     _default_text = "N/A"
 
+    # Path of each detail attribute inside the details dictionary and its default value
+    # (or a function that receives the entity and returns the value). Defined by the subclasses.
+    _detail_fields: Dict[str, Union[Tuple[Tuple[str, ...], Optional[Callable[[], Any]]], Callable[["Entity"], Any]]] = dict()
+
+    # Detail attributes returned as they were received, without replacing empty values.
+    _raw_detail_fields: FrozenSet[str] = frozenset()
+
     def __init__(self, latitude: float, longitude: float):
         """
         Constructor of the Entity class.
@@ -18,6 +35,52 @@ class Entity(ABC):
         self.latitude = latitude
         self.longitude = longitude
 
+    def __getattr__(self, name: str) -> Any:
+        # Called only when the attribute is not set. Resolve it from the details, if possible.
+        if name.startswith("_") or name not in self._detail_fields:
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+
+        try:
+            details, cache = self._details, self._details_cache
+        except AttributeError:
+            details = None
+
+        if details is None:
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+
+        if name not in cache:
+            cache[name] = self.__resolve_detail(name, details)
+
+        return cache[name]
+
+    def __get_detail_info(self, info: Any, default: Optional[Any] = None) -> Any:
+        default = default if default is not None else self._default_text
+        return info if info is not None and info != self._default_text else default
+
+    def __resolve_detail(self, name: str, details: Dict) -> Any:
+        field = self._detail_fields[name]
+
+        if callable(field):
+            return field(self)
+
+        path, default = field
+
+        # Missing or empty dictionaries along the path are replaced by empty ones.
+        for key in path[:-1]:
+            details = self.__get_detail_info(details.get(key), dict())
+
+        if name in self._raw_detail_fields:
+            return details[path[-1]] if path[-1] in details else list()
+
+        return self.__get_detail_info(details.get(path[-1]), default() if default is not None else None)
+
+    def _set_details(self, details: Dict) -> None:
+        """
+        Keep the received details, clearing the attributes resolved from the previous ones.
+        """
+        self._details = details
+        self._details_cache = dict()
+
     def get_distance_from(self, entity: "Entity") -> float:
         """
         Return the distance from another entity (in kilometers).
@@ -28,4 +91,33 @@ class Entity(ABC):
         lat1, lon1 = radians(lat1), radians(lon1)
         lat2, lon2 = radians(lat2), radians(lon2)
 
-        return acos(sin(lat1) * sin(lat2) + cos(lat1) * cos(lat2) * cos(lon2 - lon1)) * 6371
+        # Haversine formula, which is accurate for short distances too.
+        a = sin((lat2 - lat1) / 2) ** 2 + cos(lat1) * cos(lat2) * sin((lon2 - lon1) / 2) ** 2
+        return 2 * geo.earth_radius * asin(sqrt(min(a, 1)))
+
+    def get_distances_from(self, entities: Sequence["Entity"]) -> np.ndarray:
+        """
+        Return an array with the distance (in kilometers) to each entity, computed with NumPy.
+
+        Ex: airport.get_distances_from(flights) <= 50 selects the flights within 50 km of the airport.
+        """
+        latitudes, longitudes = geo.get_positions(entities)
+        return geo.get_distances(self.latitude, self.longitude, latitudes, longitudes)
+
+    def get_nearest(self, entities: Sequence["Entity"], k: int = 1) -> List[Tuple["Entity", float]]:
+        """
+        Return the "k" nearest entities, sorted by distance, as tuples (entity, distance in kilometers).
+        """
+        latitudes, longitudes = geo.get_positions(entities)
+        indexes, distances = geo.get_nearest([self.latitude], [self.longitude], latitudes, longitudes, k)
+
+        return [(entities[index], float(distance)) for index, distance in zip(indexes[0], distances[0])]
+
+    @staticmethod
+    def get_distance_matrix(entities: Sequence["Entity"], others: Sequence["Entity"]) -> np.ndarray:
+        """
+        Return a matrix with the distance (in kilometers) from each entity (rows) to each of the others (columns).
+
+        For arrays of positions, such as the columns of get_flights_columns(), see FlightRadar24.geo.
+        """
+        return geo.get_distance_matrix(*geo.get_positions(entities), *geo.get_positions(others))
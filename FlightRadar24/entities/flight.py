@@ -4,10 +4,100 @@ from typing import Any, Dict, List, Optional
 from .entity import Entity
 
 
+def _get_airport_detail_fields(prefix: str, key: str) -> Dict[str, Any]:
+    """
+    Return the detail fields of the origin or destination airport of a flight.
+    """
+    airport = ("airport", key)
+
+    return {
+        # Airport position.
+        prefix + "_airport_altitude": (airport + ("position", "altitude"), None),
+        prefix + "_airport_country_code": (airport + ("position", "country", "code"), None),
+        prefix + "_airport_country_name": (airport + ("position", "country", "name"), None),
+        prefix + "_airport_latitude": (airport + ("position", "latitude"), None),
+        prefix + "_airport_longitude": (airport + ("position", "longitude"), None),
+
+        # Airport information.
+        prefix + "_airport_icao": (airport + ("code", "icao"), None),
+        prefix + "_airport_baggage": (airport + ("info", "baggage"), None),
+        prefix + "_airport_gate": (airport + ("info", "gate"), None),
+        prefix + "_airport_name": (airport + ("name",), None),
+        prefix + "_airport_terminal": (airport + ("info", "terminal"), None),
+        prefix + "_airport_visible": (airport + ("visible",), None),
+        prefix + "_airport_website": (airport + ("website",), None),
+
+        # Airport timezone.
+        prefix + "_airport_timezone_abbr": (airport + ("timezone", "abbr"), None),
+        prefix + "_airport_timezone_abbr_name": (airport + ("timezone", "abbrName"), None),
+        prefix + "_airport_timezone_name": (airport + ("timezone", "name"), None),
+        prefix + "_airport_timezone_offset": (airport + ("timezone", "offset"), None),
+        prefix + "_airport_timezone_offset_hours": (airport + ("timezone", "offsetHours"), None),
+    }
+
+
 class Flight(Entity):
     """
     Flight representation.
     """
+
+    __slots__ = (
+        "id", "icao_24bit", "heading", "altitude", "ground_speed", "squawk", "aircraft_code",
+        "registration", "time", "origin_airport_iata", "destination_airport_iata", "number",
+        "airline_iata", "on_ground", "vertical_speed", "callsign", "airline_icao"
+    )
+
+    # Index of each attribute in the rows of the Real Time Flight Tracker data.
+    feed_fields: Dict[str, int] = {
+        "icao_24bit": 0,
+        "latitude": 1,
+        "longitude": 2,
+        "heading": 3,
+        "altitude": 4,
+        "ground_speed": 5,
+        "squawk": 6,
+        "aircraft_code": 8,
+        "registration": 9,
+        "time": 10,
+        "origin_airport_iata": 11,
+        "destination_airport_iata": 12,
+        "number": 13,
+        "on_ground": 14,
+        "vertical_speed": 15,
+        "callsign": 16,
+        "airline_icao": 18
+    }
+
+    # Attributes resolved from the flight details. See set_flight_details().
+    _detail_fields = {
+        # Aircraft information.
+        "aircraft_age": (("aircraft", "age"), None),
+        "aircraft_country_id": (("aircraft", "countryId"), None),
+        "aircraft_history": (("flightHistory", "aircraft"), None),
+        "aircraft_images": (("aircraft", "images"), None),
+        "aircraft_model": (("aircraft", "model", "text"), None),
+
+        # Airline information.
+        "airline_name": (("airline", "name"), None),
+        "airline_short_name": (("airline", "short"), None),
+
+        # Destination and origin airports.
+        **_get_airport_detail_fields("destination", "destination"),
+        **_get_airport_detail_fields("origin", "origin"),
+
+        # Flight status.
+        "status_icon": (("status", "icon"), None),
+        "status_text": (("status", "text"), None),
+
+        # Time details.
+        "time_details": (("time",), dict),
+
+        # Flight trail.
+        "trail": (("trail",), None),
+    }
+
+    _raw_detail_fields = frozenset(["aircraft_history", "aircraft_images", "trail"])
+
     def __init__(self, flight_id: str, info: List[Any]):
         """
         Constructor of the Flight class.
@@ -57,23 +147,12 @@ class Flight(Entity):
         to compare numeric data with ">" or "<".
 
         Example: check_info(min_altitude = 6700, max_altitude = 13000, airline_icao = "THY")
-        """
-
-        comparison_functions = {"max": max, "min": min}
-
-        for key, value in info.items():
 
-            # Separate the comparison prefix if it exists.
-            prefix, key = key.split("_", maxsplit=1) if key[:4] == "max_" or key[:4] == "min_" else (None, key)
-
-            # Check if the value is greater than or less than the attribute value.
-            if prefix and key in self.__dict__:
-                if comparison_functions[prefix](value, self.__dict__[key]) != value: return False
-
-            # Check if the value is equal.
-            elif key in self.__dict__ and value != self.__dict__[key]: return False
+        To check many flights, build a FlightRadar24.filters.FlightFilter once and reuse it.
+        """
+        from ..filters import FlightFilter
 
-        return True
+        return FlightFilter(**info)(self)
 
     def get_altitude(self) -> str:
         """
@@ -108,101 +187,7 @@ class Flight(Entity):
     def set_flight_details(self, flight_details: Dict) -> None:
         """
         Set flight details to the instance. Use FlightRadar24API.get_flight_details(...) method to get it.
-        """
-        # Get aircraft data.
-        aircraft = self.__get_info(flight_details.get("aircraft"), dict())
-
-        # Get airline data.
-        airline = self.__get_info(flight_details.get("airline"), dict())
-
-        # Get airport data.
-        airport = self.__get_info(flight_details.get("airport"), dict())
-
-        # Get destination data.
-        dest_airport = self.__get_info(airport.get("destination"), dict())
-        dest_airport_code = self.__get_info(dest_airport.get("code"), dict())
-        dest_airport_info = self.__get_info(dest_airport.get("info"), dict())
-        dest_airport_position = self.__get_info(dest_airport.get("position"), dict())
-        dest_airport_country = self.__get_info(dest_airport_position.get("country"), dict())
-        dest_airport_timezone = self.__get_info(dest_airport.get("timezone"), dict())
-
-        # Get origin data.
-        orig_airport = self.__get_info(airport.get("origin"), dict())
-        orig_airport_code = self.__get_info(orig_airport.get("code"), dict())
-        orig_airport_info = self.__get_info(orig_airport.get("info"), dict())
-        orig_airport_position = self.__get_info(orig_airport.get("position"), dict())
-        orig_airport_country = self.__get_info(orig_airport_position.get("country"), dict())
-        orig_airport_timezone = self.__get_info(orig_airport.get("timezone"), dict())
-
-        # Get flight history.
-        history = self.__get_info(flight_details.get("flightHistory"), dict())
-
-        # Get flight status.
-        status = self.__get_info(flight_details.get("status"), dict())
 
-        # Aircraft information.
-        self.aircraft_age = self.__get_info(aircraft.get("age"))
-        self.aircraft_country_id = self.__get_info(aircraft.get("countryId"))
-        self.aircraft_history = history.get("aircraft", list())
-        self.aircraft_images = aircraft.get("images", list())
-        self.aircraft_model = self.__get_info(self.__get_info(aircraft.get("model"), dict()).get("text"))
-
-        # Airline information.
-        self.airline_name = self.__get_info(airline.get("name"))
-        self.airline_short_name = self.__get_info(airline.get("short"))
-
-        # Destination airport position.
-        self.destination_airport_altitude = self.__get_info(dest_airport_position.get("altitude"))
-        self.destination_airport_country_code = self.__get_info(dest_airport_country.get("code"))
-        self.destination_airport_country_name = self.__get_info(dest_airport_country.get("name"))
-        self.destination_airport_latitude = self.__get_info(dest_airport_position.get("latitude"))
-        self.destination_airport_longitude = self.__get_info(dest_airport_position.get("longitude"))
-
-        # Destination airport information.
-        self.destination_airport_icao = self.__get_info(dest_airport_code.get("icao"))
-        self.destination_airport_baggage = self.__get_info(dest_airport_info.get("baggage"))
-        self.destination_airport_gate = self.__get_info(dest_airport_info.get("gate"))
-        self.destination_airport_name = self.__get_info(dest_airport.get("name"))
-        self.destination_airport_terminal = self.__get_info(dest_airport_info.get("terminal"))
-        self.destination_airport_visible = self.__get_info(dest_airport.get("visible"))
-        self.destination_airport_website = self.__get_info(dest_airport.get("website"))
-
-        # Destination airport timezone.
-        self.destination_airport_timezone_abbr = self.__get_info(dest_airport_timezone.get("abbr"))
-        self.destination_airport_timezone_abbr_name = self.__get_info(dest_airport_timezone.get("abbrName"))
-        self.destination_airport_timezone_name = self.__get_info(dest_airport_timezone.get("name"))
-        self.destination_airport_timezone_offset = self.__get_info(dest_airport_timezone.get("offset"))
-        self.destination_airport_timezone_offset_hours = self.__get_info(dest_airport_timezone.get("offsetHours"))
-
-        # Origin airport position.
-        self.origin_airport_altitude = self.__get_info(orig_airport_position.get("altitude"))
-        self.origin_airport_country_code = self.__get_info(orig_airport_country.get("code"))
-        self.origin_airport_country_name = self.__get_info(orig_airport_country.get("name"))
-        self.origin_airport_latitude = self.__get_info(orig_airport_position.get("latitude"))
-        self.origin_airport_longitude = self.__get_info(orig_airport_position.get("longitude"))
-
-        # Origin airport information.
-        self.origin_airport_icao = self.__get_info(orig_airport_code.get("icao"))
-        self.origin_airport_baggage = self.__get_info(orig_airport_info.get("baggage"))
-        self.origin_airport_gate = self.__get_info(orig_airport_info.get("gate"))
-        self.origin_airport_name = self.__get_info(orig_airport.get("name"))
-        self.origin_airport_terminal = self.__get_info(orig_airport_info.get("terminal"))
-        self.origin_airport_visible = self.__get_info(orig_airport.get("visible"))
-        self.origin_airport_website = self.__get_info(orig_airport.get("website"))
-
-        # Origin airport timezone.
-        self.origin_airport_timezone_abbr = self.__get_info(orig_airport_timezone.get("abbr"))
-        self.origin_airport_timezone_abbr_name = self.__get_info(orig_airport_timezone.get("abbrName"))
-        self.origin_airport_timezone_name = self.__get_info(orig_airport_timezone.get("name"))
-        self.origin_airport_timezone_offset = self.__get_info(orig_airport_timezone.get("offset"))
-        self.origin_airport_timezone_offset_hours = self.__get_info(orig_airport_timezone.get("offsetHours"))
-
-        # Flight status.
-        self.status_icon = self.__get_info(status.get("icon"))
-        self.status_text = self.__get_info(status.get("text"))
-
-        # Time details.
-        self.time_details = self.__get_info(flight_details.get("time"), dict())
-
-        # Flight trail.
-        self.trail = flight_details.get("trail", list())
+        The details are kept as received and each detail attribute is resolved on its first access.
+        """
+        self._set_details(flight_details)
@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+
+"""
+Detection of takeoffs and landings from consecutive snapshots of the Real Time Flight Tracker.
+"""
+
+from numbers import Real
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import dataclasses
+import time
+
+from .entities.airport import Airport
+from .entities.flight import Flight
+from .snapshot import SnapshotStore
+from .spatial import AirportIndex
+
+
+@dataclasses.dataclass
+class FlightEvent(object):
+    """
+    Data class with a takeoff or a landing.
+
+    The timestamp is estimated from the feed: the position timestamps around the transition,
+    the altitude above the airport and the vertical speed. The reason is "on_ground", when the
+    transition was seen, or "climb", when the aircraft was first seen climbing near the airport.
+    """
+    kind: str
+    flight: Flight
+    airport: Airport
+    timestamp: float
+    distance: float
+    reason: str
+
+
+def _to_number(value: Any) -> Optional[float]:
+    return value if isinstance(value, Real) else None
+
+
+class EventDetector(object):
+    """
+    Detect takeoffs and landings at some airports, comparing each snapshot of flights with the previous one.
+
+    Only the feed is used, so detail requests are only needed to enrich the events. The snapshots must
+    be frequent enough for the aircraft to be seen at both sides of the transition inside the bounds.
+
+    The events of each flight are remembered until it is not seen for "memory" seconds, so an aircraft
+    that leaves the bounds for a while and comes back does not produce the same event again.
+
+    Example:
+        detector = EventDetector([fr_api.get_airport("MAD")])
+        events = detector.update(fr_api.get_flights(bounds = bounds))
+    """
+
+    def __init__(
+        self,
+        airports: Iterable[Airport],
+        radius: float = 8,
+        climb_radius: float = 25,
+        max_altitude: float = 4000,
+        min_vertical_speed: float = 300,
+        memory: float = 90 * 60
+    ):
+        """
+        Constructor of the EventDetector class.
+
+        :param airports: Airports whose takeoffs and landings are detected
+        :param radius: Maximum distance (in kilometers) from the airport to the aircraft on the ground
+        :param climb_radius: Maximum distance (in kilometers) from the airport to an aircraft first seen climbing
+        :param max_altitude: Maximum altitude (in feet) of an aircraft first seen climbing to be a takeoff
+        :param min_vertical_speed: Minimum vertical speed (in feet per minute) of an aircraft first seen climbing to be a takeoff
+        :param memory: Time, in seconds, that the events of a flight are remembered after it was last seen
+        """
+        self.radius = radius
+        self.climb_radius = climb_radius
+        self.max_altitude = max_altitude
+        self.min_vertical_speed = min_vertical_speed
+        self.memory = memory
+
+        self.airport_index = AirportIndex(list(airports))
+        self.updates = 0
+
+        self.__snapshots = SnapshotStore(state_fields=("on_ground",))
+        self.__detected: Dict[str, Set[str]] = dict()
+        self.__last_seen: Dict[str, float] = dict()
+
+    def __get_airport(self, flight: Flight, radius: float) -> Optional[Tuple[Airport, float]]:
+        """
+        Return the nearest airport within the radius and its distance, or None.
+        """
+        if _to_number(flight.latitude) is None or _to_number(flight.longitude) is None:
+            return None
+
+        nearest = self.airport_index.get_k_nearest(flight.latitude, flight.longitude, 1, radius)
+        return nearest[0] if nearest else None
+
+    @staticmethod
+    def __get_height(flight: Flight, airport: Airport) -> float:
+        # Altitude above the airport (in feet). Missing altitudes are 0.
+        altitude = _to_number(flight.altitude) or 0
+        return max(altitude - (_to_number(getattr(airport, "altitude", None)) or 0), 0)
+
+    def __estimate_takeoff(self, previous: Optional[Flight], flight: Flight, airport: Airport) -> float:
+        """
+        Return the estimated takeoff time: the climb at the current vertical speed, limited to the interval since the previous snapshot.
+        """
+        timestamp = _to_number(flight.time) or 0
+        vertical_speed = _to_number(flight.vertical_speed)
+
+        earliest = _to_number(previous.time) if previous is not None else None
+        earliest = earliest if earliest is not None else timestamp - 30 * 60
+
+        if vertical_speed is None or vertical_speed <= 0:
+            return (earliest + timestamp) / 2 if previous is not None else timestamp
+
+        return min(max(timestamp - self.__get_height(flight, airport) / vertical_speed * 60, earliest), timestamp)
+
+    def __estimate_landing(self, previous: Flight, flight: Flight, airport: Airport) -> float:
+        """
+        Return the estimated landing time: the descent of the previous snapshot at its vertical speed, limited to the interval.
+        """
+        timestamp = _to_number(flight.time) or 0
+        earliest = _to_number(previous.time)
+        vertical_speed = _to_number(previous.vertical_speed)
+
+        if earliest is None:
+            return timestamp
+
+        if vertical_speed is None or vertical_speed >= 0:
+            return (earliest + timestamp) / 2
+
+        return min(max(earliest + self.__get_height(previous, airport) / -vertical_speed * 60, earliest), timestamp)
+
+    def __add_event(self, events: List[FlightEvent], kind: str, flight: Flight, airport: Tuple[Airport, float], timestamp: float, reason: str) -> None:
+        detected = self.__detected.setdefault(flight.id, set())
+
+        # A flight has a single takeoff and a single landing.
+        if kind in detected: return
+
+        detected.add(kind)
+        events.append(FlightEvent(kind, flight, airport[0], timestamp, airport[1], reason))
+
+    def update(self, flights: Iterable[Flight], now: Optional[float] = None) -> List[FlightEvent]:
+        """
+        Compare a new snapshot of flights with the previous one and return the new takeoffs and landings.
+
+        In the first update there is no previous snapshot, so only the aircraft climbing near an airport are detected.
+
+        :param flights: Flights of the snapshot. Ex: the result of get_flights()
+        :param now: Time of the snapshot (defaults to the current time)
+        """
+        now = now if now is not None else time.time()
+        flights = list(flights)
+
+        delta = self.__snapshots.update(flights)
+        events: List[FlightEvent] = list()
+
+        for change in delta.changed:
+            flight, previous = change.flight, change.previous
+
+            if previous.on_ground and not flight.on_ground:
+                # The position on the ground tells the airport.
+                airport = self.__get_airport(previous, self.radius)
+                if airport: self.__add_event(events, "takeoff", flight, airport, self.__estimate_takeoff(previous, flight, airport[0]), "on_ground")
+
+            elif flight.on_ground and not previous.on_ground:
+                airport = self.__get_airport(flight, self.radius)
+                if airport: self.__add_event(events, "landing", flight, airport, self.__estimate_landing(previous, flight, airport[0]), "on_ground")
+
+        # Aircraft first seen just after their takeoff.
+        for flight in delta.new:
+            vertical_speed = _to_number(flight.vertical_speed)
+            altitude = _to_number(flight.altitude)
+
+            if flight.on_ground or vertical_speed is None or altitude is None: continue
+            if vertical_speed < self.min_vertical_speed or altitude > self.max_altitude: continue
+
+            airport = self.__get_airport(flight, self.climb_radius)
+
+            # The origin of the flight must be the airport, if it is known.
+            if airport and flight.origin_airport_iata in (getattr(airport[0], "iata", None), "", Flight._default_text):
+                self.__add_event(events, "takeoff", flight, airport, self.__estimate_takeoff(None, flight, airport[0]), "climb")
+
+        for flight in flights:
+            if flight.id in self.__detected: self.__last_seen[flight.id] = now
+
+        # The events are forgotten only when the flight has not been seen for a while.
+        for flight_id in [flight_id for flight_id, last_seen in self.__last_seen.items() if now - last_seen > self.memory]:
+            del self.__last_seen[flight_id]
+            self.__detected.pop(flight_id, None)
+
+        self.updates += 1
+        return events
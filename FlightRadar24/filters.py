@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+
+"""
+Reusable flight filters, compiled once and evaluated against many flights.
+"""
+
+import operator
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+import numpy as np
+
+from .entities.flight import Flight
+
+_missing = object()
+
+
+def _in(attribute: Any, values: frozenset) -> bool:
+    return attribute in values
+
+
+def _in_range(attribute: Any, value_range: Tuple[Any, Any]) -> bool:
+    return value_range[0] <= attribute <= value_range[1]
+
+
+class FlightFilter(object):
+    """
+    Filter of flights, built once from criteria with the same syntax of Flight.check_info().
+
+    - "min_<attribute>" and "max_<attribute>" compare numeric data (inclusive).
+    - "range_<attribute>" receives a tuple (minimum, maximum), both inclusive.
+    - "<attribute>" checks the equality or, for a set, list or tuple, the membership.
+
+    Criteria about attributes that a flight does not have are ignored.
+
+    Example: FlightFilter(min_altitude = 6700, max_altitude = 13000, airline_icao = {"THY", "IBE"})
+    """
+
+    def __init__(self, **criteria: Any):
+        """
+        Constructor of the FlightFilter class.
+        """
+        self.criteria = criteria
+        self.__tests: List[Tuple[str, Callable[[Any, Any], bool], Any]] = list()
+
+        for key, value in criteria.items():
+            self.__tests.append(self.__compile(key, value))
+
+        # Index of the criteria in the rows of the Real Time Flight Tracker data (see match_row()).
+        self.__row_tests = [
+            (Flight.feed_fields.get(name), name, test, value) for name, test, value in self.__tests
+            if name in Flight.feed_fields or name == "airline_iata"
+        ]
+
+        # Criteria that are not in the rows (ex: "id"), which can only be checked on the Flight instances.
+        self.__instance_names = [
+            name for name, test, value in self.__tests if name not in Flight.feed_fields and name != "airline_iata"
+        ]
+
+    def __repr__(self) -> str:
+        return "FlightFilter({})".format(", ".join("{}={!r}".format(key, value) for key, value in self.criteria.items()))
+
+    @staticmethod
+    def __compile(key: str, value: Any) -> Tuple[str, Callable[[Any, Any], bool], Any]:
+        # Flight.check_info() semantics: "max_" passes while the attribute is not greater than the value.
+        if key[:4] == "max_":
+            return key[4:], operator.le, value
+
+        if key[:4] == "min_":
+            return key[4:], operator.ge, value
+
+        if key[:6] == "range_":
+            minimum, maximum = value
+            return key[6:], _in_range, (minimum, maximum)
+
+        if isinstance(value, (set, frozenset, list, tuple)):
+            return key, _in, frozenset(value)
+
+        return key, operator.eq, value
+
+    def __call__(self, flight: Flight) -> bool:
+        """
+        Return True if the flight passes the filter.
+        """
+        for name, test, value in self.__tests:
+            attribute = getattr(flight, name, _missing)
+            if attribute is not _missing and not test(attribute, value): return False
+
+        return True
+
+    def filter(self, flights: Iterable[Flight]) -> List[Flight]:
+        """
+        Return the flights that pass the filter.
+        """
+        return [flight for flight in flights if self(flight)]
+
+    def can_match_rows(self) -> bool:
+        """
+        Return True if all the criteria are about attributes of the feed, so match_row() can be used.
+        """
+        return not self.__instance_names
+
+    def match_row(self, row: List[Any]) -> bool:
+        """
+        Return True if a raw row of the Real Time Flight Tracker passes the filter, without creating a Flight.
+
+        It can be given as predicate to FlightRadar24API.iter_flights(). A ValueError is raised if there are
+        criteria about attributes that are not in the feed (see can_match_rows()).
+        """
+        if self.__instance_names:
+            raise ValueError("The criteria about {} cannot be checked on the raw rows.".format(", ".join(self.__instance_names)))
+
+        default_text = Flight._default_text
+
+        for index, name, test, value in self.__row_tests:
+            attribute = row[index] if index is not None else row[Flight.feed_fields["number"]][:2]
+
+            # Same as the Flight attributes.
+            if attribute is None: attribute = default_text
+            if not test(attribute, value): return False
+
+        return True
+
+    def mask(self, columns: Any) -> np.ndarray:
+        """
+        Return a boolean array with the flights that pass the filter, evaluated with vectorised operations.
+
+        Missing numeric values (NaN) do not pass the numeric criteria.
+
+        :param columns: Dictionary of arrays returned by parse_feed_columns() or a pandas DataFrame
+        """
+        size = len(np.asarray(columns[next(iter(columns))])) if len(columns) else 0
+        mask = np.ones(size, dtype=bool)
+
+        for name, test, value in self.__tests:
+            if name not in columns: continue
+
+            column = np.asarray(columns[name])
+
+            if test is _in:
+                mask &= np.isin(column, list(value))
+
+            elif test is _in_range:
+                mask &= (column >= value[0]) & (column <= value[1])
+
+            else:
+                mask &= test(column, value)
+
+        return mask
+
+    def filter_columns(self, columns: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """
+        Return the dictionary of arrays keeping only the flights that pass the filter. See mask().
+        """
+        mask = self.mask(columns)
+        return {name: column[mask] for name, column in columns.items()}
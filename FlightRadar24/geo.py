@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+
+"""
+Vectorised great-circle distances (haversine formula) between arrays of positions.
+"""
+
+from numbers import Real
+from typing import Any, Iterable, Tuple
+
+import numpy as np
+
+# Mean radius of the Earth (in kilometers).
+earth_radius = 6371
+
+
+def get_positions(entities: Iterable[Any]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Return the latitudes and longitudes of the entities as two arrays. Unknown positions become NaN.
+    """
+    positions = [
+        (entity.latitude, entity.longitude)
+        if isinstance(entity.latitude, Real) and isinstance(entity.longitude, Real) else (np.nan, np.nan)
+        for entity in entities
+    ]
+    positions = np.array(positions, dtype=np.float64).reshape(-1, 2)
+
+    return positions[:, 0], positions[:, 1]
+
+
+def get_distances(latitudes1: Any, longitudes1: Any, latitudes2: Any, longitudes2: Any) -> np.ndarray:
+    """
+    Return the distances (in kilometers) between positions, element-wise with NumPy broadcasting.
+
+    The haversine formula is stable for short distances, unlike the spherical law of cosines.
+    """
+    lat1, lon1 = np.radians(latitudes1), np.radians(longitudes1)
+    lat2, lon2 = np.radians(latitudes2), np.radians(longitudes2)
+
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+
+    return 2 * earth_radius * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+
+
+def get_distance_matrix(latitudes1: Any, longitudes1: Any, latitudes2: Any, longitudes2: Any) -> np.ndarray:
+    """
+    Return a matrix with the distance (in kilometers) from each position of the
+    first group (rows) to each position of the second group (columns).
+    """
+    latitudes1, longitudes1 = np.asarray(latitudes1, dtype=np.float64), np.asarray(longitudes1, dtype=np.float64)
+    latitudes2, longitudes2 = np.asarray(latitudes2, dtype=np.float64), np.asarray(longitudes2, dtype=np.float64)
+
+    return get_distances(latitudes1[:, np.newaxis], longitudes1[:, np.newaxis], latitudes2[np.newaxis, :], longitudes2[np.newaxis, :])
+
+
+def get_nearest(
+    latitudes1: Any,
+    longitudes1: Any,
+    latitudes2: Any,
+    longitudes2: Any,
+    k: int = 1
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Return the indexes and the distances (in kilometers) of the "k" nearest positions of the
+    second group to each position of the first group, sorted by distance. Both arrays have a shape (n, k).
+
+    :param k: Number of positions to return for each position (limited to the size of the second group)
+    """
+    distances = get_distance_matrix(latitudes1, longitudes1, latitudes2, longitudes2)
+    k = min(k, distances.shape[1])
+
+    if k < 1:
+        return np.empty((distances.shape[0], 0), dtype=np.intp), np.empty((distances.shape[0], 0))
+
+    # Select the k nearest positions without sorting every row, then sort only those.
+    indexes = np.argpartition(distances, k - 1, axis=1)[:, :k] if k < distances.shape[1] else np.indices(distances.shape)[1]
+    nearest_distances = np.take_along_axis(distances, indexes, axis=1)
+
+    order = np.argsort(nearest_distances, axis=1)
+    return np.take_along_axis(indexes, order, axis=1), np.take_along_axis(nearest_distances, order, axis=1)
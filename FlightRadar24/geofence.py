@@ -0,0 +1,318 @@
+# -*- coding: utf-8 -*-
+
+"""
+Geofences (polygons and circles with an altitude band) tested against whole snapshots of flights with vectorised operations.
+"""
+
+from abc import ABC, abstractmethod
+from numbers import Real
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import math
+
+import numpy as np
+
+from . import geo
+from .entities.flight import Flight
+
+# Box of a geofence: (minimum latitude, maximum latitude, minimum longitude, maximum longitude).
+Box = Tuple[float, float, float, float]
+
+
+def _get_arrays(flights: Any) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Return the latitudes, longitudes and altitudes of a list of flights, or of the arrays returned
+    by parse_feed_columns() or a pandas DataFrame. Unknown values become NaN.
+    """
+    if isinstance(flights, dict) or hasattr(flights, "columns"):
+        return tuple(np.asarray(flights[name], dtype=np.float64) for name in ("latitude", "longitude", "altitude"))
+
+    flights = flights if isinstance(flights, list) else list(flights)
+    latitudes, longitudes = geo.get_positions(flights)
+
+    altitudes = np.array(
+        [flight.altitude if isinstance(flight.altitude, Real) else np.nan for flight in flights], dtype=np.float64
+    )
+    return latitudes, longitudes, altitudes
+
+
+class Geofence(ABC):
+    """
+    Base class of the geofences: an area with an optional altitude band (in feet).
+
+    Positions or altitudes that are unknown (NaN) are outside. Ex: with a band, flights without altitude are outside.
+    """
+
+    def __init__(self, name: str, min_altitude: Optional[float] = None, max_altitude: Optional[float] = None):
+        """
+        Constructor of the Geofence class.
+
+        :param name: Name of the geofence. Ex: "MAD 32L approach"
+        :param min_altitude: Minimum altitude (in feet), inclusive (optional)
+        :param max_altitude: Maximum altitude (in feet), inclusive (optional)
+        """
+        self.name = name
+        self.min_altitude = min_altitude
+        self.max_altitude = max_altitude
+
+    def __repr__(self) -> str:
+        return "<{} {} - Altitude: {} to {}>".format(type(self).__name__, self.name, self.min_altitude, self.max_altitude)
+
+    @abstractmethod
+    def get_box(self) -> Box:
+        """
+        Return the bounding box of the area: (minimum latitude, maximum latitude, minimum longitude, maximum longitude).
+        """
+
+    def get_bounds(self) -> str:
+        """
+        Return the bounding box as a string "y1, y2, x1, x2", like FlightRadar24API.get_bounds(). It can be given to get_flights().
+        """
+        return _box_to_bounds(self.get_box())
+
+    @abstractmethod
+    def _contains_positions(self, latitudes: np.ndarray, longitudes: np.ndarray) -> np.ndarray:
+        """
+        Return a boolean array with the positions inside the area. The positions are inside the bounding box.
+        """
+
+    def contains(self, latitudes: Any, longitudes: Any, altitudes: Any = None) -> np.ndarray:
+        """
+        Return a boolean array with the positions inside the geofence.
+
+        Only the positions inside the bounding box are tested against the area.
+
+        :param latitudes: Array of latitudes
+        :param longitudes: Array of longitudes
+        :param altitudes: Array of altitudes (in feet). Required if the geofence has an altitude band
+        """
+        latitudes = np.asarray(latitudes, dtype=np.float64)
+        longitudes = np.asarray(longitudes, dtype=np.float64)
+
+        lat_min, lat_max, lon_min, lon_max = self.get_box()
+        mask = (latitudes >= lat_min) & (latitudes <= lat_max) & (longitudes >= lon_min) & (longitudes <= lon_max)
+
+        if self.min_altitude is not None or self.max_altitude is not None:
+            altitudes = np.asarray(altitudes, dtype=np.float64)
+
+            if self.min_altitude is not None: mask &= altitudes >= self.min_altitude
+            if self.max_altitude is not None: mask &= altitudes <= self.max_altitude
+
+        indexes = np.flatnonzero(mask)
+        mask[indexes] = self._contains_positions(latitudes[indexes], longitudes[indexes])
+
+        return mask
+
+
+class PolygonGeofence(Geofence):
+    """
+    Geofence with a polygon area. Ex: a runway approach corridor.
+
+    The edges are straight lines in latitude and longitude, which is accurate enough for areas of a few
+    hundred kilometers. Polygons must not cross the antimeridian.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        vertices: Sequence[Tuple[float, float]],
+        min_altitude: Optional[float] = None,
+        max_altitude: Optional[float] = None
+    ):
+        """
+        Constructor of the PolygonGeofence class.
+
+        :param name: Name of the geofence. Ex: "MAD 32L approach"
+        :param vertices: Vertices of the polygon as (latitude, longitude), in order. The polygon is closed automatically
+        :param min_altitude: Minimum altitude (in feet), inclusive (optional)
+        :param max_altitude: Maximum altitude (in feet), inclusive (optional)
+        """
+        super().__init__(name, min_altitude, max_altitude)
+
+        self.vertices = np.array(vertices, dtype=np.float64).reshape(-1, 2)
+
+        if len(self.vertices) < 3:
+            raise ValueError("A polygon needs at least 3 vertices.")
+
+    def get_box(self) -> Box:
+        latitudes, longitudes = self.vertices[:, 0], self.vertices[:, 1]
+        return latitudes.min(), latitudes.max(), longitudes.min(), longitudes.max()
+
+    def _contains_positions(self, latitudes: np.ndarray, longitudes: np.ndarray) -> np.ndarray:
+        # Ray casting: a position is inside if a ray towards the east crosses an odd number of edges.
+        # Each edge is tested against all the positions at once.
+        inside = np.zeros(len(latitudes), dtype=bool)
+        previous = self.vertices[-1]
+
+        for vertex in self.vertices:
+            (lat1, lon1), (lat2, lon2) = previous, vertex
+            previous = vertex
+
+            crosses = (lat1 > latitudes) != (lat2 > latitudes)
+            if not crosses.any(): continue
+
+            # Horizontal edges never cross, so there is no division by zero.
+            crossing_longitudes = lon1 + (lon2 - lon1) * (latitudes[crosses] - lat1) / (lat2 - lat1)
+            inside[crosses] ^= longitudes[crosses] < crossing_longitudes
+
+        return inside
+
+
+class CircleGeofence(Geofence):
+    """
+    Geofence with a circular area. Ex: a terminal area around an airport.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        latitude: float,
+        longitude: float,
+        radius: float,
+        min_altitude: Optional[float] = None,
+        max_altitude: Optional[float] = None
+    ):
+        """
+        Constructor of the CircleGeofence class.
+
+        :param name: Name of the geofence. Ex: "MAD terminal area"
+        :param latitude: Latitude of the center
+        :param longitude: Longitude of the center
+        :param radius: Radius (in kilometers)
+        :param min_altitude: Minimum altitude (in feet), inclusive (optional)
+        :param max_altitude: Maximum altitude (in feet), inclusive (optional)
+        """
+        super().__init__(name, min_altitude, max_altitude)
+
+        self.latitude = latitude
+        self.longitude = longitude
+        self.radius = radius
+
+    def get_box(self) -> Box:
+        angle = math.degrees(self.radius / geo.earth_radius)
+
+        lat_min, lat_max = max(self.latitude - angle, -90), min(self.latitude + angle, 90)
+
+        # Circles around a pole include all the longitudes.
+        if lat_min == -90 or lat_max == 90:
+            return lat_min, lat_max, -180, 180
+
+        lon_angle = math.degrees(math.asin(min(math.sin(self.radius / geo.earth_radius) / math.cos(math.radians(self.latitude)), 1)))
+        return lat_min, lat_max, self.longitude - lon_angle, self.longitude + lon_angle
+
+    def _contains_positions(self, latitudes: np.ndarray, longitudes: np.ndarray) -> np.ndarray:
+        return geo.get_distances(latitudes, longitudes, self.latitude, self.longitude) <= self.radius
+
+
+def _box_to_bounds(box: Box) -> str:
+    lat_min, lat_max, lon_min, lon_max = box
+    return "{},{},{},{}".format(float(lat_max), float(lat_min), float(lon_min), float(lon_max))
+
+
+class GeofenceSet(object):
+    """
+    Group of geofences tested against whole snapshots of flights. A flight can be inside several geofences.
+
+    Example:
+        fences = GeofenceSet([
+            CircleGeofence("terminal", 40.47, -3.56, 15, max_altitude = 6000),
+            PolygonGeofence("approach 32L", [(40.35, -3.48), (40.37, -3.45), (40.22, -3.30), (40.20, -3.34)], max_altitude = 8000)
+        ])
+        flights = fr_api.get_flights(geofences = fences)
+        tags = fences.tag(flights)
+    """
+
+    def __init__(self, geofences: Iterable[Geofence]):
+        """
+        Constructor of the GeofenceSet class.
+
+        :param geofences: Geofences of the group. Their names must be unique
+        """
+        self.geofences: List[Geofence] = list(geofences)
+        self.names = [geofence.name for geofence in self.geofences]
+
+        if len(set(self.names)) != len(self.names):
+            raise ValueError("The names of the geofences must be unique.")
+
+    def __len__(self) -> int:
+        return len(self.geofences)
+
+    def __iter__(self) -> Iterator[Geofence]:
+        return iter(self.geofences)
+
+    def get_box(self) -> Box:
+        """
+        Return the bounding box of all the geofences: (minimum latitude, maximum latitude, minimum longitude, maximum longitude).
+        """
+        if not self.geofences:
+            raise ValueError("The set has no geofences.")
+
+        boxes = np.array([geofence.get_box() for geofence in self.geofences], dtype=np.float64)
+        return boxes[:, 0].min(), boxes[:, 1].max(), boxes[:, 2].min(), boxes[:, 3].max()
+
+    def get_bounds(self) -> str:
+        """
+        Return the bounding box of all the geofences as a string "y1, y2, x1, x2". It can be given to get_flights().
+        """
+        return _box_to_bounds(self.get_box())
+
+    def get_masks(self, flights: Any) -> np.ndarray:
+        """
+        Return a boolean matrix with a row per geofence and a column per flight, True if the flight is inside the geofence.
+
+        :param flights: List of flights, arrays returned by parse_feed_columns() or a pandas DataFrame
+        """
+        latitudes, longitudes, altitudes = _get_arrays(flights)
+        masks = np.zeros((len(self.geofences), len(latitudes)), dtype=bool)
+
+        for index, geofence in enumerate(self.geofences):
+            masks[index] = geofence.contains(latitudes, longitudes, altitudes)
+
+        return masks
+
+    def mask(self, flights: Any) -> np.ndarray:
+        """
+        Return a boolean array with the flights that are inside any geofence. See get_masks().
+        """
+        return self.get_masks(flights).any(axis=0)
+
+    def filter(self, flights: Iterable[Flight]) -> List[Flight]:
+        """
+        Return the flights that are inside any geofence.
+        """
+        flights = list(flights)
+        return [flight for flight, inside in zip(flights, self.mask(flights)) if inside]
+
+    def filter_columns(self, columns: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """
+        Return the dictionary of arrays returned by parse_feed_columns() keeping only the flights inside any geofence.
+        """
+        mask = self.mask(columns)
+        return {name: column[mask] for name, column in columns.items()}
+
+    def tag(self, flights: Any) -> Dict[str, List[str]]:
+        """
+        Return the names of the geofences of each flight inside any geofence, by flight ID.
+
+        Ex: {"2f4ea15c": ["terminal", "approach 32L"]}
+
+        :param flights: List of flights, arrays returned by parse_feed_columns() or a pandas DataFrame (indexed by the flight ID)
+        """
+        if not (isinstance(flights, dict) or hasattr(flights, "columns")):
+            flights = list(flights)
+
+        masks = self.get_masks(flights)
+
+        if isinstance(flights, dict):
+            flight_ids = flights["id"]
+        elif hasattr(flights, "columns"):
+            flight_ids = flights.index
+        else:
+            flight_ids = [flight.id for flight in flights]
+
+        tags: Dict[str, List[str]] = dict()
+
+        for index, column in zip(*np.nonzero(masks.T)):
+            tags.setdefault(flight_ids[index], list()).append(self.names[column])
+
+        return tags
@@ -0,0 +1,227 @@
+# -*- coding: utf-8 -*-
+
+from bisect import bisect_left
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import dataclasses
+import functools
+import threading
+
+from .core import Core
+
+
+@functools.lru_cache(maxsize=None)
+def get_endpoint_names() -> Tuple[Tuple[str, str], ...]:
+    """
+    Return the (URL prefix, name) pairs of all the URLs of the Core class, longest prefix first.
+    """
+    endpoints = list()
+
+    for attribute, value in vars(Core).items():
+        if not attribute.endswith("_url") or attribute.endswith("_base_url"):
+            continue
+
+        prefix = value.split("{", maxsplit=1)[0].split("?", maxsplit=1)[0]
+        endpoints.append((prefix, attribute[:-len("_url")]))
+
+    return tuple(sorted(endpoints, key=lambda endpoint: len(endpoint[0]), reverse=True))
+
+
+def get_endpoint_name(url: str) -> str:
+    """
+    Return the name of the Core endpoint of a URL. Ex: "flight_data" for the clickhandler URL.
+    """
+    for prefix, name in get_endpoint_names():
+        if url.startswith(prefix): return name
+
+    return "other"
+
+
+@dataclasses.dataclass
+class RequestSample(object):
+    """
+    Data class with the measurements of one HTTP request.
+    """
+    endpoint: str
+    method: str
+    status_code: int
+    ttfb: float
+    total: float
+    compressed_bytes: int
+
+
+@dataclasses.dataclass
+class DecodeSample(object):
+    """
+    Data class with the measurements of the decoding of one response.
+
+    The synchronous API receives the bodies already decompressed by requests, so its decode_time only has the parsing.
+    """
+    endpoint: str
+    compressed_bytes: int
+    decompressed_bytes: int
+    decode_time: float
+
+
+class MetricsHook(object):
+    """
+    Base class of the objects that receive the measurements of the requests.
+    """
+
+    def on_request(self, sample: RequestSample) -> None:
+        """
+        Called after each HTTP request, including the retried ones.
+        """
+        pass
+
+    def on_decode(self, sample: DecodeSample) -> None:
+        """
+        Called after a response body is decompressed and parsed.
+        """
+        pass
+
+
+class Histogram(object):
+    """
+    Histogram with fixed upper bounds, in the Prometheus style.
+    """
+
+    default_buckets: Sequence[float] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    def __init__(self, buckets: Optional[Sequence[float]] = None):
+        self.buckets = tuple(sorted(buckets if buckets is not None else self.default_buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def get_cumulative_counts(self) -> List[Tuple[str, int]]:
+        """
+        Return the (upper bound, cumulative count) pairs, ending with "+Inf".
+        """
+        bounds = [str(bucket) for bucket in self.buckets] + ["+Inf"]
+        cumulative, total = list(), 0
+
+        for bound, count in zip(bounds, self.counts):
+            total += count
+            cumulative.append((bound, total))
+
+        return cumulative
+
+
+class EndpointMetrics(object):
+    """
+    Measurements aggregated for one endpoint.
+    """
+
+    def __init__(self):
+        self.requests = 0
+        self.status_codes: Dict[int, int] = dict()
+        self.ttfb = Histogram()
+        self.total = Histogram()
+        self.decode_time = Histogram()
+        self.compressed_bytes = 0
+        self.decompressed_bytes = 0
+
+
+class MetricsCollector(MetricsHook):
+    """
+    Thread-safe hook that aggregates the measurements by endpoint and exports them.
+    """
+
+    def __init__(self, prefix: str = "fr24"):
+        """
+        Constructor of the MetricsCollector class.
+
+        :param prefix: Prefix of the metric names in the Prometheus format
+        """
+        self.prefix = prefix
+
+        self.__lock = threading.Lock()
+        self.__endpoints: Dict[str, EndpointMetrics] = dict()
+
+    def __get_endpoint(self, endpoint: str) -> EndpointMetrics:
+        if endpoint not in self.__endpoints:
+            self.__endpoints[endpoint] = EndpointMetrics()
+
+        return self.__endpoints[endpoint]
+
+    def on_request(self, sample: RequestSample) -> None:
+        with self.__lock:
+            metrics = self.__get_endpoint(sample.endpoint)
+            metrics.requests += 1
+            metrics.status_codes[sample.status_code] = metrics.status_codes.get(sample.status_code, 0) + 1
+            metrics.ttfb.observe(sample.ttfb)
+            metrics.total.observe(sample.total)
+
+    def on_decode(self, sample: DecodeSample) -> None:
+        with self.__lock:
+            metrics = self.__get_endpoint(sample.endpoint)
+            metrics.compressed_bytes += sample.compressed_bytes
+            metrics.decompressed_bytes += sample.decompressed_bytes
+            metrics.decode_time.observe(sample.decode_time)
+
+    def get_summary(self) -> Dict[str, Dict]:
+        """
+        Return a dictionary with the counters and the average times of each endpoint.
+        """
+        summary = dict()
+
+        with self.__lock:
+            for endpoint, metrics in self.__endpoints.items():
+                summary[endpoint] = {
+                    "requests": metrics.requests,
+                    "status_codes": metrics.status_codes.copy(),
+                    "avg_ttfb": metrics.ttfb.sum / metrics.ttfb.count if metrics.ttfb.count else None,
+                    "avg_total": metrics.total.sum / metrics.total.count if metrics.total.count else None,
+                    "avg_decode_time": metrics.decode_time.sum / metrics.decode_time.count if metrics.decode_time.count else None,
+                    "compressed_bytes": metrics.compressed_bytes,
+                    "decompressed_bytes": metrics.decompressed_bytes
+                }
+
+        return summary
+
+    def to_prometheus(self) -> str:
+        """
+        Return all the metrics in the Prometheus text exposition format.
+        """
+        prefix = self.prefix
+        lines = list()
+
+        def add_histogram(name: str, description: str, attribute: str) -> None:
+            lines.append(f"# HELP {prefix}_{name} {description}")
+            lines.append(f"# TYPE {prefix}_{name} histogram")
+
+            for endpoint, metrics in self.__endpoints.items():
+                histogram: Histogram = getattr(metrics, attribute)
+
+                for bound, count in histogram.get_cumulative_counts():
+                    lines.append(f'{prefix}_{name}_bucket{{endpoint="{endpoint}",le="{bound}"}} {count}')
+
+                lines.append(f'{prefix}_{name}_sum{{endpoint="{endpoint}"}} {histogram.sum}')
+                lines.append(f'{prefix}_{name}_count{{endpoint="{endpoint}"}} {histogram.count}')
+
+        with self.__lock:
+            lines.append(f"# HELP {prefix}_requests_total Requests sent to FlightRadar24, by status code.")
+            lines.append(f"# TYPE {prefix}_requests_total counter")
+
+            for endpoint, metrics in self.__endpoints.items():
+                for status_code, count in sorted(metrics.status_codes.items()):
+                    lines.append(f'{prefix}_requests_total{{endpoint="{endpoint}",status="{status_code}"}} {count}')
+
+            lines.append(f"# HELP {prefix}_response_bytes_total Size of the response bodies.")
+            lines.append(f"# TYPE {prefix}_response_bytes_total counter")
+
+            for endpoint, metrics in self.__endpoints.items():
+                lines.append(f'{prefix}_response_bytes_total{{endpoint="{endpoint}",encoding="compressed"}} {metrics.compressed_bytes}')
+                lines.append(f'{prefix}_response_bytes_total{{endpoint="{endpoint}",encoding="decompressed"}} {metrics.decompressed_bytes}')
+
+            add_histogram("ttfb_seconds", "Time until the response headers were received.", "ttfb")
+            add_histogram("request_seconds", "Total time of the requests, including the body download.", "total")
+            add_histogram("decode_seconds", "Time spent decompressing and parsing the response bodies.", "decode_time")
+
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,350 @@
+# -*- coding: utf-8 -*-
+
+"""
+Request building and response parsing shared by the synchronous and asynchronous APIs.
+"""
+
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union
+
+from bs4 import BeautifulSoup, FeatureNotFound, SoupStrainer
+
+from .entities.airport import Airport
+from .entities.flight import Flight
+from .errors import AirportNotFoundError
+
+# Parser of the HTML pages. lxml is much faster than the built-in "html.parser", used if lxml is not installed.
+try:
+    BeautifulSoup("", "lxml")
+    html_parser = "lxml"
+except FeatureNotFound:
+    html_parser = "html.parser"
+
+# The data of the HTML pages is in the body of their table, so the rest of the document is not parsed.
+_table_body_strainer = SoupStrainer("tbody")
+
+
+def check_airport_code(code: str) -> None:
+    """
+    Raise ValueError if the code is not a valid IATA or ICAO of an airport.
+    """
+    if 4 < len(code) or len(code) < 3:
+        raise ValueError(f"The code '{code}' is invalid. It must be the IATA or ICAO of the airport.")
+
+
+def parse_bounds(bounds: str) -> Dict[str, float]:
+    """
+    Convert a string "y1, y2, x1, x2" to a coordinate dictionary with the keys tl_y, br_y, tl_x, br_x.
+    """
+    tl_y, br_y, tl_x, br_x = (float(value) for value in bounds.replace("%2C", ",").split(","))
+    return {"tl_y": tl_y, "br_y": br_y, "tl_x": tl_x, "br_x": br_x}
+
+
+def split_zone(zone: Dict[str, float]) -> List[Dict[str, float]]:
+    """
+    Split a coordinate dictionary into its four quadrants.
+    """
+    mid_y = (zone["tl_y"] + zone["br_y"]) / 2
+    mid_x = (zone["tl_x"] + zone["br_x"]) / 2
+
+    return [
+        {"tl_y": zone["tl_y"], "br_y": mid_y, "tl_x": zone["tl_x"], "br_x": mid_x},
+        {"tl_y": zone["tl_y"], "br_y": mid_y, "tl_x": mid_x, "br_x": zone["br_x"]},
+        {"tl_y": mid_y, "br_y": zone["br_y"], "tl_x": zone["tl_x"], "br_x": mid_x},
+        {"tl_y": mid_y, "br_y": zone["br_y"], "tl_x": mid_x, "br_x": zone["br_x"]}
+    ]
+
+
+def build_flights_params(
+    config: Dict[str, str],
+    login_data: Optional[Dict] = None,
+    airline: Optional[str] = None,
+    bounds: Optional[str] = None,
+    registration: Optional[str] = None,
+    aircraft_type: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Return the params of a request to the Real Time Flight Tracker.
+
+    :param config: Dictionary with the settings of the Real Time Flight Tracker
+    :param login_data: Login data of the FlightRadar24 account (optional)
+    """
+    request_params: Dict[str, Any] = dict(config)
+
+    if login_data is not None:
+        request_params["enc"] = login_data["cookies"]["_frPl"]
+
+    # Insert the method parameters into the dictionary for the request.
+    if airline: request_params["airline"] = airline
+    if bounds: request_params["bounds"] = bounds.replace(",", "%2C")
+    if registration: request_params["reg"] = registration
+    if aircraft_type: request_params["type"] = aircraft_type
+
+    return request_params
+
+
+def parse_flights(content: Dict) -> List[Flight]:
+    """
+    Return the flights of a response from the Real Time Flight Tracker.
+    """
+    return list(iter_flights(content))
+
+
+def iter_flights(content: Dict, predicate: Optional[Callable[[List[Any]], bool]] = None) -> Iterator[Flight]:
+    """
+    Yield the flights of a response from the Real Time Flight Tracker.
+
+    :param content: Decoded response of the Real Time Flight Tracker
+    :param predicate: Function called with the raw row of each flight (see Flight.feed_fields).
+                      Rows for which it returns False are skipped before creating a Flight
+    """
+    for flight_id, flight_info in content.items():
+
+        # Get flights only.
+        if not flight_id[0].isnumeric():
+            continue
+
+        if predicate is not None and not predicate(flight_info):
+            continue
+
+        yield Flight(flight_id, flight_info)
+
+
+def parse_airport(code: str, content: Any) -> Airport:
+    """
+    Return an Airport instance from the airport data received from FlightRadar24.
+    """
+    if not content or not isinstance(content, dict) or not content.get("details"):
+        raise AirportNotFoundError(f"Could not find an airport by the code '{code}'.")
+
+    return Airport(info=content["details"])
+
+
+def build_airport_details_params(
+    code: str,
+    flight_limit: int,
+    page: int,
+    login_data: Optional[Dict] = None
+) -> Dict[str, Any]:
+    """
+    Return the params of a request for the airport details.
+    """
+    request_params: Dict[str, Any] = {"format": "json"}
+
+    if login_data is not None:
+        request_params["token"] = login_data["cookies"]["_frPl"]
+
+    # Insert the method parameters into the dictionary for the request.
+    request_params["code"] = code
+    request_params["limit"] = flight_limit
+    request_params["page"] = page
+
+    return request_params
+
+
+def parse_airport_details(code: str, status_code: int, content: Dict) -> Dict:
+    """
+    Return the airport details of a response, raising an error if no airport was found.
+    """
+    if status_code == 400 and content.get("errors"):
+        errors = content["errors"]["errors"]["parameters"]
+
+        if errors.get("limit"):
+            raise ValueError(errors["limit"]["notBetween"])
+
+        raise AirportNotFoundError(f"Could not find an airport by the code '{code}'.", errors)
+
+    result = content["result"]["response"]
+
+    # Check whether it received data of an airport.
+    data = result.get("airport", dict()).get("pluginData", dict())
+
+    if "details" not in data and len(data.get("runways", [])) == 0 and len(data) <= 3:
+        raise AirportNotFoundError(f"Could not find an airport by the code '{code}'.")
+
+    # Return the airport details.
+    return result
+
+
+def parse_search_results(content: Dict) -> Dict:
+    """
+    Group the results of a search by their type.
+    """
+    results = content.get("results", [])
+    stats = content.get("stats", {})
+
+    i = 0
+    counted_total = 0
+    data = {}
+    for name, count in stats.get("count", {}).items():
+        data[name] = []
+        while i < counted_total + count and i < len(results):
+            data[name].append(results[i])
+            i += 1
+        counted_total += count
+    return data
+
+
+def _get_table_body(html_content: Union[bytes, str]) -> Any:
+    """
+    Return the first "tbody" element of an HTML page, or None.
+    """
+    return BeautifulSoup(html_content, html_parser, parse_only=_table_body_strainer).find("tbody")
+
+
+def parse_airlines(html_content: Union[bytes, str]) -> List[Dict]:
+    """
+    Return the airlines of the HTML page of airlines.
+    """
+    airlines_data = []
+
+    # Parse only the table body of the HTML content.
+    tbody = _get_table_body(html_content)
+
+    if not tbody:
+        return []
+
+    # Extract data from HTML content.
+    tr_elements = tbody.find_all("tr")
+
+    for tr in tr_elements:
+        td_notranslate = tr.find("td", class_="notranslate")
+
+        if td_notranslate:
+            a_element = td_notranslate.find("a", href=lambda href: href and href.startswith("/data/airlines"))
+
+            if a_element:
+                td_elements = tr.find_all("td")
+
+                # Extract airline name.
+                airline_name = a_element.get_text(strip=True)
+
+                if len(airline_name) < 2:
+                    continue
+
+                # Extract IATA / ICAO codes.
+                iata = None
+                icao = None
+
+                if len(td_elements) >= 4:
+                    codes_text = td_elements[3].get_text(strip=True)
+
+                    if " / " in codes_text:
+                        parts = codes_text.split(" / ")
+
+                        if len(parts) == 2:
+                            iata = parts[0].strip()
+                            icao = parts[1].strip()
+
+                    elif len(codes_text) == 2:
+                        iata = codes_text
+
+                    elif len(codes_text) == 3:
+                        icao = codes_text
+
+                # Extract number of aircrafts.
+                n_aircrafts = None
+
+                if len(td_elements) >= 5:
+                    aircrafts_text = td_elements[4].get_text(strip=True)
+
+                    if aircrafts_text:
+                        n_aircrafts = aircrafts_text.split(" ", maxsplit=1)[0].strip()
+                        n_aircrafts = int(n_aircrafts)
+
+                airline_data = {
+                    "Name": airline_name,
+                    "ICAO": icao,
+                    "IATA": iata,
+                    "n_aircrafts": n_aircrafts
+                }
+
+                airlines_data.append(airline_data)
+
+    return airlines_data
+
+
+def parse_country_airports(country_href: str, html_content: Union[bytes, str]) -> List[Dict]:
+    """
+    Return the airports, in the "basic_info" format of the Airport class, of the HTML page of a country.
+
+    :param country_href: URL of the page of the country
+    :param html_content: HTML page of the country
+    """
+    # Parse only the table body of the HTML content.
+    tbody = _get_table_body(html_content)
+
+    if not tbody:
+        return []
+
+    # Extract country name from the URL
+    country_name = country_href.split("/")[-1].replace("-", " ").title()
+
+    tr_elements = tbody.find_all("tr")
+    airports_data = []
+
+    for tr in tr_elements:
+        a_elements = tr.find_all("a", attrs={"data-iata": True, "data-lat": True, "data-lon": True})
+
+        if a_elements:
+            a_element = a_elements[0]
+
+            icao = ""
+            iata = a_element.get("data-iata", "").strip()
+            latitude = a_element.get("data-lat", "").strip()
+            longitude = a_element.get("data-lon", "").strip()
+
+            airport_text = a_element.get_text(strip=True)
+            name_part = airport_text
+
+            # Get IATA / ICAO from airport text.
+            small_element = a_element.find("small")
+
+            if small_element:
+                codes_text = small_element.get_text(strip=True)
+                codes_text = codes_text.lstrip("(")
+                codes_text = codes_text.rstrip(")")
+                codes_text = codes_text.strip()
+
+                # Remove IATA / ICAO from name part.
+                name_part = name_part.replace(codes_text, "")
+                name_part = name_part.replace("()", "").strip()
+
+                # Parse codes (can be "IATA/ICAO", "IATA", or "ICAO")
+                if "/" in codes_text:
+                    codes = codes_text.split("/")
+
+                    code1 = codes[0].strip()
+                    code2 = codes[1].strip()
+
+                    iata = code1 if len(code1) == 3 else code2
+                    icao = code1 if len(code1) == 4 else code2
+
+                elif len(codes_text) == 3:
+                    iata = codes_text
+
+                elif len(codes_text) == 4:
+                    icao = codes_text
+
+            # Convert latitude and longitude to float
+            try:
+                lat_float = float(latitude) if latitude else 0.0
+                lon_float = float(longitude) if longitude else 0.0
+
+            except ValueError:
+                lat_float = 0.0
+                lon_float = 0.0
+
+            # Create Airport instance with basic_info format
+            airport_data = {
+                "name": name_part,
+                "icao": icao,
+                "iata": iata,
+                "lat": lat_float,
+                "lon": lon_float,
+                "alt": None,  # Altitude not available in this format
+                "country": country_name
+            }
+
+            airports_data.append(airport_data)
+
+    return airports_data
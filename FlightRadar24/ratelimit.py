@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+
+from email.utils import parsedate_to_datetime
+from typing import Dict, Iterable, Optional
+from urllib.parse import urlsplit
+
+import random
+import threading
+import time
+
+
+class TokenBucket(object):
+    """
+    Token bucket that allows "rate" requests per second, with bursts of up to "capacity" requests.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        """
+        Constructor of the TokenBucket class.
+
+        :param rate: Tokens added per second
+        :param capacity: Maximum number of tokens stored
+        """
+        self.rate = rate
+        self.capacity = capacity
+
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def reserve(self) -> float:
+        """
+        Take one token and return how many seconds the caller must wait before using it.
+
+        The bucket may go into debt, so concurrent callers are queued in order.
+        """
+        now = time.monotonic()
+
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= 1
+
+        return -self.tokens / self.rate if self.tokens < 0 else 0.0
+
+
+class RateLimiter(object):
+    """
+    Thread-safe rate limiter with one token bucket per host.
+
+    The rate of a host is halved every time it answers with a throttling status code
+    (429, 520...) and slowly recovers after successful responses.
+    """
+
+    def __init__(
+        self,
+        rate: float = 10.0,
+        burst: float = 10.0,
+        min_rate: float = 0.5,
+        recovery: float = 0.1,
+        host_rates: Optional[Dict[str, float]] = None,
+        max_retries: int = 4,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+        retry_status_codes: Iterable[int] = (429, 520)
+    ):
+        """
+        Constructor of the RateLimiter class.
+
+        :param rate: Default maximum number of requests per second to each host
+        :param burst: Maximum number of requests sent at once to a host
+        :param min_rate: Lowest rate reached when the host keeps throttling the requests
+        :param recovery: Requests per second added to the rate of a host after each successful response
+        :param host_rates: Maximum rate of specific hosts. Ex: {"data-live.flightradar24.com": 5}
+        :param max_retries: Maximum number of retries of a throttled request
+        :param backoff_base: Base delay of the exponential backoff, in seconds
+        :param backoff_max: Maximum delay between two retries, in seconds
+        :param retry_status_codes: Status codes which make the request be retried
+        """
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.recovery = recovery
+        self.host_rates = host_rates if host_rates is not None else dict()
+
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retry_status_codes = frozenset(retry_status_codes)
+
+        self.__lock = threading.Lock()
+        self.__buckets: Dict[str, TokenBucket] = dict()
+
+    def __get_bucket(self, url: str) -> TokenBucket:
+        host = urlsplit(url).netloc
+
+        if host not in self.__buckets:
+            self.__buckets[host] = TokenBucket(self.host_rates.get(host, self.rate), self.burst)
+
+        return self.__buckets[host]
+
+    def reserve(self, url: str) -> float:
+        """
+        Reserve a request to the host of the URL and return how many seconds to wait before sending it.
+        """
+        with self.__lock:
+            return self.__get_bucket(url).reserve()
+
+    def acquire(self, url: str) -> None:
+        """
+        Block until a request to the host of the URL is allowed.
+        """
+        delay = self.reserve(url)
+        if delay > 0: time.sleep(delay)
+
+    def penalize(self, url: str) -> None:
+        """
+        Slow down the requests to the host of the URL after a throttling response.
+        """
+        with self.__lock:
+            bucket = self.__get_bucket(url)
+            bucket.rate = max(self.min_rate, bucket.rate / 2)
+
+    def reward(self, url: str) -> None:
+        """
+        Speed up the requests to the host of the URL after a successful response, up to its maximum rate.
+        """
+        with self.__lock:
+            bucket = self.__get_bucket(url)
+            max_rate = self.host_rates.get(urlsplit(url).netloc, self.rate)
+            bucket.rate = min(max_rate, bucket.rate + self.recovery)
+
+    def get_rate(self, url: str) -> float:
+        """
+        Return the current rate of the host of the URL, in requests per second.
+        """
+        with self.__lock:
+            return self.__get_bucket(url).rate
+
+    def get_backoff(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """
+        Return how many seconds to wait before retrying a throttled request.
+
+        The "Retry-After" header is honoured when present. Otherwise, an exponential
+        backoff with jitter is used.
+
+        :param attempt: Number of the retry, starting from zero
+        :param retry_after: Value of the "Retry-After" header of the response (optional)
+        """
+        if retry_after:
+            try:
+                return min(self.backoff_max, max(0.0, float(retry_after)))
+            except ValueError:
+                pass
+
+            try:
+                return min(self.backoff_max, max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time()))
+            except (TypeError, ValueError):
+                pass
+
+        delay = min(self.backoff_max, self.backoff_base * 2 ** attempt)
+        return random.uniform(delay / 2, delay)
@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+
+from typing import Any, Dict, Iterable, List, Optional
+
+import json
+import sqlite3
+import threading
+import time
+
+from .entities.airport import Airport
+
+
+class ReferenceStore(object):
+    """
+    Persistent SQLite store of the reference data: airports of each country, airlines and airports
+    received by FlightRadar24API.get_airport().
+
+    The stored data is served without requests, whatever its age, so a process can start without
+    scraping again. FlightRadar24API.refresh_reference_data() fetches again only the stale data.
+    """
+
+    # Age, in seconds, after which the data of each kind is stale.
+    default_max_ages: Dict[str, float] = {
+        "airports": 7 * 24 * 60 * 60,
+        "airlines": 24 * 60 * 60,
+        "airport": 7 * 24 * 60 * 60
+    }
+
+    def __init__(self, path: str, max_ages: Optional[Dict[str, float]] = None):
+        """
+        Constructor of the ReferenceStore class.
+
+        :param path: Path of the SQLite file
+        :param max_ages: Age, in seconds, after which the data of each kind is stale. It updates the default_max_ages
+        """
+        self.max_ages = self.default_max_ages.copy()
+        self.max_ages.update(max_ages or dict())
+
+        self.__lock = threading.Lock()
+        self.__database = sqlite3.connect(path, check_same_thread=False)
+
+        self.__database.executescript(
+            "CREATE TABLE IF NOT EXISTS countries (country TEXT PRIMARY KEY, updated_at REAL);"
+            "CREATE TABLE IF NOT EXISTS airports ("
+            "country TEXT, position INTEGER, name TEXT, icao TEXT, iata TEXT, lat REAL, lon REAL, alt REAL, country_name TEXT);"
+            "CREATE INDEX IF NOT EXISTS airports_country ON airports (country, position);"
+            "CREATE INDEX IF NOT EXISTS airports_iata ON airports (iata);"
+            "CREATE INDEX IF NOT EXISTS airports_icao ON airports (icao);"
+            "CREATE INDEX IF NOT EXISTS airports_country_name ON airports (country_name COLLATE NOCASE);"
+            "CREATE TABLE IF NOT EXISTS airlines (position INTEGER, name TEXT, icao TEXT, iata TEXT, n_aircrafts INTEGER);"
+            "CREATE INDEX IF NOT EXISTS airlines_iata ON airlines (iata);"
+            "CREATE INDEX IF NOT EXISTS airlines_icao ON airlines (icao);"
+            "CREATE TABLE IF NOT EXISTS airport_info (code TEXT PRIMARY KEY, content TEXT, updated_at REAL);"
+            "CREATE TABLE IF NOT EXISTS updates (kind TEXT PRIMARY KEY, updated_at REAL);"
+        )
+        self.__database.commit()
+
+    def __query(self, query: str, parameters: Iterable[Any] = ()) -> List[tuple]:
+        with self.__lock:
+            return self.__database.execute(query, tuple(parameters)).fetchall()
+
+    def __is_stale(self, kind: str, updated_at: Optional[float]) -> bool:
+        return updated_at is None or time.time() - updated_at >= self.max_ages[kind]
+
+    @staticmethod
+    def __to_basic_info(row: tuple) -> Dict:
+        return {"name": row[0], "icao": row[1], "iata": row[2], "lat": row[3], "lon": row[4], "alt": row[5], "country": row[6]}
+
+    @staticmethod
+    def __get_where_clause(conditions: Dict[str, Any]) -> str:
+        # Conditions whose value is None are not used.
+        return " AND ".join(condition for condition, value in conditions.items() if value is not None) or "1"
+
+    def get_country_airports(self, country: str) -> Optional[List[Dict]]:
+        """
+        Return the airports of a country, in the "basic_info" format of the Airport class, or None if it is not stored.
+
+        :param country: Value of the Countries enum. Ex: "spain"
+        """
+        if not self.__query("SELECT 1 FROM countries WHERE country = ?", (country,)):
+            return None
+
+        rows = self.__query(
+            "SELECT name, icao, iata, lat, lon, alt, country_name FROM airports WHERE country = ? ORDER BY position", (country,)
+        )
+        return [self.__to_basic_info(row) for row in rows]
+
+    def set_country_airports(self, country: str, airports_data: List[Dict]) -> None:
+        """
+        Replace the airports of a country.
+
+        :param country: Value of the Countries enum. Ex: "spain"
+        :param airports_data: Airports in the "basic_info" format of the Airport class
+        """
+        rows = [
+            (country, position, airport["name"], airport["icao"], airport["iata"], airport["lat"], airport["lon"], airport["alt"], airport["country"])
+            for position, airport in enumerate(airports_data)
+        ]
+
+        with self.__lock, self.__database:
+            self.__database.execute("DELETE FROM airports WHERE country = ?", (country,))
+            self.__database.executemany("INSERT INTO airports VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            self.__database.execute("INSERT OR REPLACE INTO countries VALUES (?, ?)", (country, time.time()))
+
+    def get_countries(self) -> List[str]:
+        """
+        Return the countries with stored airports.
+        """
+        return [row[0] for row in self.__query("SELECT country FROM countries ORDER BY country")]
+
+    def get_stale_countries(self, countries: Optional[Iterable[str]] = None) -> List[str]:
+        """
+        Return the countries whose airports are stale or not stored.
+
+        :param countries: Values of the Countries enum. Defaults to the stored countries
+        """
+        updates = dict(self.__query("SELECT country, updated_at FROM countries"))
+        countries = countries if countries is not None else updates.keys()
+
+        return [country for country in countries if self.__is_stale("airports", updates.get(country))]
+
+    def find_airports(self, *, iata: Optional[str] = None, icao: Optional[str] = None, country: Optional[str] = None) -> List[Airport]:
+        """
+        Return the stored airports with the given IATA, ICAO and/or country name (case insensitive). Ex: country = "Spain"
+        """
+        conditions = {"iata = ?": iata, "icao = ?": icao, "country_name = ? COLLATE NOCASE": country}
+
+        rows = self.__query(
+            "SELECT name, icao, iata, lat, lon, alt, country_name FROM airports WHERE " + self.__get_where_clause(conditions) +
+            " ORDER BY country, position", (value for value in conditions.values() if value is not None)
+        )
+        return [Airport(basic_info=self.__to_basic_info(row)) for row in rows]
+
+    def get_airlines(self) -> Optional[List[Dict]]:
+        """
+        Return the stored airlines, in the format of FlightRadar24API.get_airlines(), or None if they are not stored.
+        """
+        if not self.__query("SELECT 1 FROM updates WHERE kind = 'airlines'"):
+            return None
+
+        rows = self.__query("SELECT name, icao, iata, n_aircrafts FROM airlines ORDER BY position")
+        return [{"Name": row[0], "ICAO": row[1], "IATA": row[2], "n_aircrafts": row[3]} for row in rows]
+
+    def set_airlines(self, airlines_data: List[Dict]) -> None:
+        """
+        Replace the airlines.
+
+        :param airlines_data: Airlines in the format of FlightRadar24API.get_airlines()
+        """
+        rows = [
+            (position, airline["Name"], airline["ICAO"], airline["IATA"], airline["n_aircrafts"])
+            for position, airline in enumerate(airlines_data)
+        ]
+
+        with self.__lock, self.__database:
+            self.__database.execute("DELETE FROM airlines")
+            self.__database.executemany("INSERT INTO airlines VALUES (?, ?, ?, ?, ?)", rows)
+            self.__database.execute("INSERT OR REPLACE INTO updates VALUES ('airlines', ?)", (time.time(),))
+
+    def are_airlines_stale(self) -> bool:
+        """
+        Return True if the airlines are stale or not stored.
+        """
+        rows = self.__query("SELECT updated_at FROM updates WHERE kind = 'airlines'")
+        return self.__is_stale("airlines", rows[0][0] if rows else None)
+
+    def find_airlines(self, *, iata: Optional[str] = None, icao: Optional[str] = None) -> List[Dict]:
+        """
+        Return the stored airlines with the given IATA and/or ICAO.
+        """
+        conditions = {"iata = ?": iata, "icao = ?": icao}
+
+        rows = self.__query(
+            "SELECT name, icao, iata, n_aircrafts FROM airlines WHERE " + self.__get_where_clause(conditions) + " ORDER BY position",
+            (value for value in conditions.values() if value is not None)
+        )
+        return [{"Name": row[0], "ICAO": row[1], "IATA": row[2], "n_aircrafts": row[3]} for row in rows]
+
+    def get_airport_content(self, code: str) -> Optional[Any]:
+        """
+        Return the stored response of FlightRadar24API.get_airport() for an airport code, or None.
+        """
+        rows = self.__query("SELECT content FROM airport_info WHERE code = ?", (code,))
+        return json.loads(rows[0][0]) if rows else None
+
+    def set_airport_content(self, code: str, content: Dict) -> None:
+        """
+        Store the response of FlightRadar24API.get_airport() for an airport code. It must be a decoded JSON object.
+        """
+        if not isinstance(content, dict):
+            raise TypeError("The airport content must be a dictionary, not {}.".format(type(content).__name__))
+
+        with self.__lock, self.__database:
+            self.__database.execute("INSERT OR REPLACE INTO airport_info VALUES (?, ?, ?)", (code, json.dumps(content), time.time()))
+
+    def get_stale_airport_codes(self) -> List[str]:
+        """
+        Return the codes of the stored airport responses that are stale.
+        """
+        rows = self.__query("SELECT code, updated_at FROM airport_info ORDER BY code")
+        return [code for code, updated_at in rows if self.__is_stale("airport", updated_at)]
+
+    def close(self) -> None:
+        """
+        Close the SQLite file.
+        """
+        with self.__lock:
+            self.__database.close()
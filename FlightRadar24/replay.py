@@ -0,0 +1,278 @@
+# -*- coding: utf-8 -*-
+
+"""
+Record and replay of FlightRadar24 responses, for offline tests and benchmarks.
+"""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+import dataclasses
+import datetime
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+
+import requests
+import requests.adapters
+import requests.structures
+import requests.utils
+
+
+@dataclasses.dataclass
+class Fixture(object):
+    """
+    Data class with a recorded response.
+    """
+    method: str
+    url: str
+    status_code: int
+    headers: Dict[str, str]
+    body: bytes
+
+
+class FixtureStore(object):
+    """
+    Directory with recorded responses. Each response is saved in a JSON file with
+    its metadata and a ".body" file with its content, named after the request.
+    """
+
+    # Headers that describe the transfer, not the content. The bodies are saved already decoded.
+    excluded_headers = {"content-encoding", "content-length", "transfer-encoding", "connection", "keep-alive"}
+
+    def __init__(self, path: str):
+        """
+        Constructor of the FixtureStore class.
+
+        :param path: Directory of the fixtures. It is created if it does not exist
+        """
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+
+    def get_key(self, method: str, url: str) -> str:
+        """
+        Return the name of the files of a request.
+        """
+        url = requests.utils.requote_uri(url)
+        return hashlib.sha1(f"{method.upper()} {url}".encode("utf-8")).hexdigest()
+
+    def save(self, method: str, url: str, status_code: int, headers: Dict[str, str], body: bytes) -> None:
+        """
+        Save a response, replacing the previous one of the same request.
+        """
+        key = self.get_key(method, url)
+
+        metadata = {
+            "method": method.upper(),
+            "url": url,
+            "status_code": status_code,
+            "headers": {name: value for name, value in headers.items() if name.lower() not in self.excluded_headers}
+        }
+
+        with open(os.path.join(self.path, key + ".body"), "wb") as file:
+            file.write(body)
+
+        with open(os.path.join(self.path, key + ".json"), "w", encoding="utf-8") as file:
+            json.dump(metadata, file, indent=2)
+
+    def load(self, method: str, url: str) -> Optional[Fixture]:
+        """
+        Return the recorded response of a request, or None if it was not recorded.
+        """
+        key = self.get_key(method, url)
+        metadata_path = os.path.join(self.path, key + ".json")
+
+        if not os.path.exists(metadata_path):
+            return None
+
+        with open(metadata_path, "r", encoding="utf-8") as file:
+            metadata = json.load(file)
+
+        with open(os.path.join(self.path, key + ".body"), "rb") as file:
+            body = file.read()
+
+        return Fixture(body=body, **metadata)
+
+    def get_urls(self) -> List[str]:
+        """
+        Return the URLs of all the recorded requests.
+        """
+        urls = list()
+
+        for filename in sorted(os.listdir(self.path)):
+            if not filename.endswith(".json"): continue
+
+            with open(os.path.join(self.path, filename), "r", encoding="utf-8") as file:
+                urls.append(json.load(file)["url"])
+
+        return urls
+
+
+class ReplayAdapter(requests.adapters.BaseAdapter):
+    """
+    Transport adapter for requests that answers with the recorded responses instead of using the network.
+    Requests that were not recorded receive a 404 response.
+    """
+
+    def __init__(self, store: FixtureStore):
+        super().__init__()
+        self.store = store
+
+    def send(self, request: requests.models.PreparedRequest, **kwargs) -> requests.models.Response:
+        fixture = self.store.load(request.method, request.url)
+
+        response = requests.models.Response()
+        response.request = request
+        response.url = request.url
+        response.elapsed = datetime.timedelta(0)
+
+        if fixture is None:
+            response.status_code = 404
+            response.headers = requests.structures.CaseInsensitiveDict({"Content-Type": "text/plain"})
+            response._content = b"No fixture recorded for " + request.url.encode("utf-8")
+            return response
+
+        response.status_code = fixture.status_code
+        response.headers = requests.structures.CaseInsensitiveDict(fixture.headers)
+        response._content = fixture.body
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+
+        return response
+
+    def close(self) -> None:
+        pass
+
+
+def get_redirected_url(url: str, base_url: str) -> str:
+    """
+    Return the URL of a stand-in server for a FlightRadar24 URL.
+    Ex: "https://data-live.flightradar24.com/clickhandler/" -> "http://127.0.0.1:8024/data-live.flightradar24.com/clickhandler/"
+
+    :param url: Original URL
+    :param base_url: Base URL of the stand-in server
+    """
+    url_parts = urlsplit(url)
+    redirected_url = base_url.rstrip("/") + "/" + url_parts.netloc + url_parts.path
+
+    return redirected_url + "?" + url_parts.query if url_parts.query else redirected_url
+
+
+class FixtureServer(object):
+    """
+    Local HTTP server that stands in for FlightRadar24, answering with the recorded responses.
+
+    Use HTTPSession(redirect_url=server.base_url) to send all the Core URLs to it.
+    """
+
+    def __init__(
+        self,
+        store: FixtureStore,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        error_status_code: int = 520
+    ):
+        """
+        Constructor of the FixtureServer class.
+
+        :param store: FixtureStore with the recorded responses
+        :param host: Host of the server
+        :param port: Port of the server. If 0, a free port is chosen
+        :param latency: Seconds added before each response
+        :param jitter: Maximum random seconds added to the latency
+        :param error_rate: Probability (from 0 to 1) of answering with an error
+        :param error_status_code: Status code of the injected errors
+        """
+        self.store = store
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status_code = error_status_code
+
+        self.__server = ThreadingHTTPServer((host, port), self.__create_handler())
+        self.__server.daemon_threads = True
+        self.__thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.__server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __create_handler(self) -> type:
+        server = self
+
+        class FixtureRequestHandler(BaseHTTPRequestHandler):
+
+            def do_GET(self) -> None:
+                server.handle_request(self)
+
+            def do_POST(self) -> None:
+                server.handle_request(self)
+
+            def log_message(self, format: str, *args) -> None:
+                pass
+
+        return FixtureRequestHandler
+
+    def handle_request(self, handler: BaseHTTPRequestHandler) -> None:
+        """
+        Answer a request of the stand-in server with the recorded response of the original URL.
+        """
+        # Consume the body of POST requests.
+        content_length = int(handler.headers.get("Content-Length", 0) or 0)
+        if content_length: handler.rfile.read(content_length)
+
+        delay = self.latency + random.uniform(0, self.jitter)
+        if delay > 0: time.sleep(delay)
+
+        if self.error_rate and random.random() < self.error_rate:
+            body, status_code, headers = b"Injected error", self.error_status_code, {"Content-Type": "text/plain"}
+
+        else:
+            url = "https://" + handler.path.lstrip("/")
+            fixture = self.store.load(handler.command, url)
+
+            if fixture is None:
+                body, status_code, headers = b"No fixture recorded for " + url.encode("utf-8"), 404, {"Content-Type": "text/plain"}
+            else:
+                body, status_code, headers = fixture.body, fixture.status_code, fixture.headers
+
+        handler.send_response(status_code)
+
+        for name, value in headers.items():
+            handler.send_header(name, value)
+
+        handler.send_header("Content-Length", str(len(body)))
+        handler.end_headers()
+        handler.wfile.write(body)
+
+    def start(self) -> "FixtureServer":
+        """
+        Start serving in a background thread.
+        """
+        self.__thread = threading.Thread(target=self.__server.serve_forever, daemon=True)
+        self.__thread.start()
+        return self
+
+    def stop(self) -> None:
+        """
+        Stop the server.
+        """
+        self.__server.shutdown()
+        self.__server.server_close()
+
+        if self.__thread is not None:
+            self.__thread.join()
+            self.__thread = None
+
+    def __enter__(self) -> "FixtureServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
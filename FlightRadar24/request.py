@@ -1,26 +1,198 @@
 # -*- coding: utf-8 -*-
 
-from typing import Dict, List, Optional, Union
+from http.cookiejar import DefaultCookiePolicy
+from typing import Any, Callable, Dict, List, Optional, Union
 
 import brotli
 import json
 import gzip
+import threading
+import time
 
 import requests
+import requests.adapters
 import requests.structures
 
 from .errors import CloudflareError
+from .metrics import DecodeSample, MetricsHook, RequestSample, get_endpoint_name
+from .ratelimit import RateLimiter
+from .replay import FixtureStore, get_redirected_url
+
+
+try:
+    import orjson
+    json_loads: Callable[[Union[bytes, str]], Any] = orjson.loads
+except ImportError:
+    json_loads = json.loads
+
+
+def set_json_loads(loads: Callable[[Union[bytes, str]], Any]) -> None:
+    """
+    Set the function used to parse the JSON responses. By default, orjson is used if it is installed.
+
+    :param loads: Function that receives bytes and returns the parsed JSON. Ex: json.loads
+    """
+    global json_loads
+    json_loads = loads
+
+
+content_encodings = {
+    "": lambda x: x,
+    "br": brotli.decompress,
+    "gzip": gzip.decompress
+}
+
+
+def decompress_content(content: bytes, content_encoding: str) -> bytes:
+    """
+    Decompress a response body. Bodies that cannot be decompressed are returned as they are.
+
+    :param content: Body of the response
+    :param content_encoding: Value of the "Content-Encoding" header
+    """
+    try: return content_encodings[content_encoding](content)
+    except Exception: return content
+
+
+def decode_content(content: bytes, content_encoding: str, content_type: str) -> Union[Dict, bytes]:
+    """
+    Decompress a response body and return a dictionary if the content type is JSON.
+
+    :param content: Body of the response
+    :param content_encoding: Value of the "Content-Encoding" header
+    :param content_type: Value of the "Content-Type" header
+    """
+    # Try to decode the content.
+    content = decompress_content(content, content_encoding)
+
+    # Return a dictionary if the content type is JSON.
+    if "application/json" in content_type:
+        return json_loads(content)
+
+    return content
+
+
+class HTTPSession(object):
+    """
+    Thread-safe pool of keep-alive connections shared by the requests to the FlightRadar24.
+    """
+
+    def __init__(
+        self,
+        pool_size: int = 10,
+        keep_alive: bool = True,
+        idle_timeout: Optional[float] = 60.0,
+        rate_limiter: Optional[RateLimiter] = None,
+        metrics_hooks: Optional[List[MetricsHook]] = None,
+        transport: Optional[requests.adapters.BaseAdapter] = None,
+        recorder: Optional[FixtureStore] = None,
+        redirect_url: Optional[str] = None
+    ):
+        """
+        Constructor of the HTTPSession class.
+
+        :param pool_size: Maximum number of connections kept open for each host
+        :param keep_alive: If False, every connection is closed after its response
+        :param idle_timeout: Seconds without requests after which the pooled connections are dropped (None to keep them forever)
+        :param rate_limiter: RateLimiter applied to every request sent through this session (optional)
+        :param metrics_hooks: MetricsHook instances that receive the measurements of every request (optional)
+        :param transport: Transport adapter used instead of the connection pool. Ex: ReplayAdapter (optional)
+        :param recorder: FixtureStore where every received response is saved (optional)
+        :param redirect_url: Base URL of a stand-in server (ex: FixtureServer) that receives all the requests (optional)
+        """
+        self.pool_size = pool_size
+        self.keep_alive = keep_alive
+        self.idle_timeout = idle_timeout
+        self.rate_limiter = rate_limiter
+        self.metrics_hooks: List[MetricsHook] = list(metrics_hooks or [])
+        self.transport = transport
+        self.recorder = recorder
+        self.redirect_url = redirect_url
+
+        self.__lock = threading.Lock()
+        self.__session: Optional[requests.Session] = None
+        self.__last_used: float = 0.0
+        self.__in_flight = 0
+
+    def __create_session(self) -> requests.Session:
+        """
+        Create a new requests session with a connection pool mounted for HTTP and HTTPS.
+        """
+        session = requests.Session()
+
+        # The cookies are given per request (login data), so the session must not keep them.
+        session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+
+        adapter = self.transport
+
+        if adapter is None:
+            adapter = requests.adapters.HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+
+        if not self.keep_alive:
+            session.headers["Connection"] = "close"
+
+        return session
+
+    def __acquire_session(self) -> requests.Session:
+        """
+        Return the current session, creating a new one if there is none or if it has been idle for too long,
+        and count the request as in flight. It must be followed by __release_session().
+        """
+        with self.__lock:
+            now = time.monotonic()
+            expired = self.idle_timeout is not None and now - self.__last_used > self.idle_timeout
+
+            # The session is not replaced while other requests are using its connections.
+            if self.__session is not None and expired and not self.__in_flight:
+                self.__session.close()
+                self.__session = None
+
+            if self.__session is None:
+                self.__session = self.__create_session()
+
+            self.__last_used = now
+            self.__in_flight += 1
+            return self.__session
+
+    def __release_session(self) -> None:
+        with self.__lock:
+            self.__last_used = time.monotonic()
+            self.__in_flight -= 1
+
+    def request(self, method: str, url: str, **kwargs) -> requests.models.Response:
+        """
+        Send a request through the connection pool.
+        """
+        request_url = get_redirected_url(url, self.redirect_url) if self.redirect_url else url
+        session = self.__acquire_session()
+
+        try:
+            response = session.request(method, request_url, **kwargs)
+        finally:
+            self.__release_session()
+
+        if self.recorder is not None:
+            self.recorder.save(method, url, response.status_code, dict(response.headers), response.content)
+
+        return response
+
+    def close(self) -> None:
+        """
+        Close all the pooled connections.
+        """
+        with self.__lock:
+            if self.__session is not None:
+                self.__session.close()
+                self.__session = None
 
 
 class APIRequest(object):
     """
     Class to make requests to the FlightRadar24.
     """
-    __content_encodings = {
-        "": lambda x: x,
-        "br": brotli.decompress,
-        "gzip": gzip.decompress
-    }
 
     def __init__(
         self,
@@ -30,7 +202,8 @@ class APIRequest(object):
         timeout: int = 30,
         data: Optional[Dict] = None,
         cookies: Optional[Dict] = None,
-        exclude_status_codes: List[int] = list()
+        exclude_status_codes: List[int] = list(),
+        session: Optional[HTTPSession] = None
     ):
         """
         Constructor of the APIRequest class.
@@ -41,8 +214,11 @@ class APIRequest(object):
         :param data: data for the request. If "data" is None, request will be a GET. Otherwise, it will be a POST
         :param cookies: cookies for the request
         :param exclude_status_codes: raise for status code except those on the excluded list
+        :param session: HTTPSession used to send the request. If None, a new connection is opened
         """
         self.url = url
+        self.__content: Optional[Union[Dict, bytes]] = None
+        self.__metrics_hooks = session.metrics_hooks if session is not None else []
 
         self.request_params = {
             "params": params,
@@ -52,10 +228,46 @@ class APIRequest(object):
             "cookies": cookies
         }
 
-        request_method = requests.get if data is None else requests.post
+        request_method = "GET" if data is None else "POST"
+        send = session.request if session is not None else requests.request
+        rate_limiter = session.rate_limiter if session is not None else None
 
         if params: url += "?" + "&".join(["{}={}".format(k, v) for k, v in params.items()])
-        self.__response = request_method(url, headers=headers, cookies=cookies, data=data, timeout=timeout)
+
+        attempt = 0
+
+        while True:
+            if rate_limiter is not None: rate_limiter.acquire(url)
+
+            start_time = time.perf_counter()
+            self.__response = send(request_method, url, headers=headers, cookies=cookies, data=data, timeout=timeout)
+
+            if self.__metrics_hooks:
+                sample = RequestSample(
+                    endpoint=get_endpoint_name(self.url),
+                    method=request_method,
+                    status_code=self.get_status_code(),
+                    ttfb=self.__response.elapsed.total_seconds(),
+                    total=time.perf_counter() - start_time,
+                    compressed_bytes=self.__get_compressed_size()
+                )
+                for hook in self.__metrics_hooks: hook.on_request(sample)
+
+            if rate_limiter is None:
+                break
+
+            # Slow down and retry the request if the server is throttling us.
+            if self.get_status_code() not in rate_limiter.retry_status_codes:
+                rate_limiter.reward(url)
+                break
+
+            rate_limiter.penalize(url)
+
+            if attempt >= rate_limiter.max_retries:
+                break
+
+            time.sleep(rate_limiter.get_backoff(attempt, self.__response.headers.get("Retry-After")))
+            attempt += 1
 
         if self.get_status_code() == 520:
             raise CloudflareError(
@@ -68,22 +280,34 @@ class APIRequest(object):
 
     def get_content(self) -> Union[Dict, bytes]:
         """
-        Return the received content from the request.
+        Return the received content from the request. It is decoded only once.
         """
-        content = self.__response.content
+        if self.__content is not None:
+            return self.__content
 
-        content_encoding = self.__response.headers.get("Content-Encoding", "")
         content_type = self.__response.headers["Content-Type"]
 
-        # Try to decode the content.
-        try: content = self.__content_encodings[content_encoding](content)
-        except Exception: pass
+        # The body was already decompressed by requests, so the "Content-Encoding" header is not used again.
+        start_time = time.perf_counter()
+        self.__content = decode_content(self.__response.content, "", content_type)
 
-        # Return a dictionary if the content type is JSON.
-        if "application/json" in content_type:
-            return json.loads(content)
+        if self.__metrics_hooks:
+            sample = DecodeSample(
+                endpoint=get_endpoint_name(self.url),
+                compressed_bytes=self.__get_compressed_size(),
+                decompressed_bytes=len(self.__response.content),
+                decode_time=time.perf_counter() - start_time
+            )
+            for hook in self.__metrics_hooks: hook.on_decode(sample)
+
+        return self.__content
 
-        return content
+    def __get_compressed_size(self) -> int:
+        """
+        Return the size of the body as it was sent by the server.
+        """
+        content_length = self.__response.headers.get("Content-Length", "")
+        return int(content_length) if content_length.isdecimal() else len(self.__response.content)
 
     def get_cookies(self) -> Dict:
         """
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+
+"""
+Flattening of the arrivals and departures of the airport details.
+"""
+
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+import dataclasses
+
+# Keys of the schedule in the airport details and the kind of their records.
+schedule_kinds: Dict[str, str] = {"arrivals": "arrival", "departures": "departure"}
+
+
+@dataclasses.dataclass
+class ScheduleRecord(object):
+    """
+    Data class with one arrival or departure of an airport schedule.
+    """
+    kind: str
+    page: int
+    flight_id: Optional[str]
+    number: Optional[str]
+    callsign: Optional[str]
+    airline_name: Optional[str]
+    airline_iata: Optional[str]
+    airline_icao: Optional[str]
+    aircraft_model: Optional[str]
+    aircraft_registration: Optional[str]
+    origin_airport_iata: Optional[str]
+    destination_airport_iata: Optional[str]
+    scheduled_departure: Optional[int]
+    scheduled_arrival: Optional[int]
+    estimated_departure: Optional[int]
+    estimated_arrival: Optional[int]
+    real_departure: Optional[int]
+    real_arrival: Optional[int]
+    status_text: Optional[str]
+    flight: Dict = dataclasses.field(repr=False)
+
+
+def _get(data: Any, *keys: str) -> Any:
+    """
+    Return the value of nested dictionaries, or None if a key is missing.
+    """
+    for key in keys:
+        if not isinstance(data, dict): return None
+        data = data.get(key)
+
+    return data
+
+
+def get_page_count(airport_details: Dict, kinds: Iterable[str] = tuple(schedule_kinds)) -> int:
+    """
+    Return the number of pages of the schedule of the airport details (the largest one among the kinds).
+
+    :param airport_details: Response of FlightRadar24API.get_airport_details()
+    :param kinds: Keys of the schedule. Ex: ["arrivals"]
+    """
+    schedule = _get(airport_details, "airport", "pluginData", "schedule")
+    return max([_get(schedule, kind, "page", "total") or 1 for kind in kinds] + [1])
+
+
+def iter_schedule_records(airport_details: Dict, kinds: Iterable[str] = tuple(schedule_kinds)) -> Iterator[ScheduleRecord]:
+    """
+    Yield the arrivals and departures of one page of the airport details as flat records.
+
+    :param airport_details: Response of FlightRadar24API.get_airport_details()
+    :param kinds: Keys of the schedule. Ex: ["arrivals"]
+    """
+    schedule = _get(airport_details, "airport", "pluginData", "schedule")
+
+    for kind in kinds:
+        page = _get(schedule, kind, "page", "current") or 1
+
+        for item in _get(schedule, kind, "data") or []:
+            flight = item.get("flight") or dict()
+            time = flight.get("time")
+
+            yield ScheduleRecord(
+                kind=schedule_kinds[kind],
+                page=page,
+                flight_id=_get(flight, "identification", "id"),
+                number=_get(flight, "identification", "number", "default"),
+                callsign=_get(flight, "identification", "callsign"),
+                airline_name=_get(flight, "airline", "name"),
+                airline_iata=_get(flight, "airline", "code", "iata"),
+                airline_icao=_get(flight, "airline", "code", "icao"),
+                aircraft_model=_get(flight, "aircraft", "model", "text"),
+                aircraft_registration=_get(flight, "aircraft", "registration"),
+                origin_airport_iata=_get(flight, "airport", "origin", "code", "iata"),
+                destination_airport_iata=_get(flight, "airport", "destination", "code", "iata"),
+                scheduled_departure=_get(time, "scheduled", "departure"),
+                scheduled_arrival=_get(time, "scheduled", "arrival"),
+                estimated_departure=_get(time, "estimated", "departure"),
+                estimated_arrival=_get(time, "estimated", "arrival"),
+                real_departure=_get(time, "real", "departure"),
+                real_arrival=_get(time, "real", "arrival"),
+                status_text=_get(flight, "status", "text"),
+                flight=flight
+            )
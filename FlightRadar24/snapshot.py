@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+
+"""
+Differences between consecutive snapshots of the Real Time Flight Tracker.
+"""
+
+from operator import attrgetter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import dataclasses
+import threading
+
+from .entities.flight import Flight
+
+
+@dataclasses.dataclass
+class FlightChange(object):
+    """
+    Data class with a flight whose state changed, its previous snapshot and the changed
+    attributes, as a dictionary {attribute: (previous value, current value)}.
+    """
+    flight: Flight
+    previous: Flight
+    changes: Dict[str, Tuple[Any, Any]]
+
+
+@dataclasses.dataclass
+class FlightsDelta(object):
+    """
+    Data class with the differences between two snapshots of flights.
+
+    A flight can be both in "moved" and in "changed". Flights that did not move
+    nor change (ex: parked aircraft) are not in the delta.
+    """
+    new: List[Flight] = dataclasses.field(default_factory=list)
+    disappeared: List[Flight] = dataclasses.field(default_factory=list)
+    moved: List[Flight] = dataclasses.field(default_factory=list)
+    changed: List[FlightChange] = dataclasses.field(default_factory=list)
+
+    def is_empty(self) -> bool:
+        """
+        Return True if there are no differences.
+        """
+        return not (self.new or self.disappeared or self.moved or self.changed)
+
+
+class SnapshotStore(object):
+    """
+    Keep the last snapshot of flights, keyed by flight ID, and return the delta of each new snapshot.
+
+    Example:
+        store = SnapshotStore()
+        delta = store.update(fr_api.get_flights(bounds = bounds))
+    """
+
+    default_position_fields: Tuple[str, ...] = ("latitude", "longitude", "altitude", "heading")
+
+    default_state_fields: Tuple[str, ...] = (
+        "on_ground", "squawk", "origin_airport_iata", "destination_airport_iata",
+        "number", "callsign", "registration", "aircraft_code"
+    )
+
+    def __init__(
+        self,
+        position_fields: Optional[Tuple[str, ...]] = None,
+        state_fields: Optional[Tuple[str, ...]] = None
+    ):
+        """
+        Constructor of the SnapshotStore class.
+
+        :param position_fields: Flight attributes whose change means that the flight moved. Defaults to default_position_fields
+        :param state_fields: Flight attributes whose change means that the flight changed. Defaults to default_state_fields
+        """
+        self.position_fields = position_fields if position_fields is not None else self.default_position_fields
+        self.state_fields = state_fields if state_fields is not None else self.default_state_fields
+
+        self.__lock = threading.Lock()
+        self.__snapshot: Dict[str, Tuple[Flight, Tuple, Tuple]] = dict()
+
+    def __len__(self) -> int:
+        return len(self.__snapshot)
+
+    @staticmethod
+    def __get_values(flight: Flight, fields: Tuple[str, ...], getter: Callable[[Flight], Any]) -> Tuple:
+        try:
+            values = getter(flight)
+            return values if len(fields) > 1 else (values,)
+
+        # Missing attributes (ex: details that were not set) are None.
+        except AttributeError:
+            return tuple(getattr(flight, name, None) for name in fields)
+
+    def get_flights(self) -> Dict[str, Flight]:
+        """
+        Return the flights of the last snapshot, by flight ID.
+        """
+        with self.__lock:
+            return {flight_id: entry[0] for flight_id, entry in self.__snapshot.items()}
+
+    def update(self, flights: Iterable[Flight]) -> FlightsDelta:
+        """
+        Replace the snapshot with new flights and return the differences from the previous one.
+
+        In the first update, all the flights are new.
+
+        :param flights: Flights of the new snapshot. Ex: the result of get_flights()
+        """
+        delta = FlightsDelta()
+        snapshot: Dict[str, Tuple[Flight, Tuple, Tuple]] = dict()
+
+        get_position = attrgetter(*self.position_fields)
+        get_state = attrgetter(*self.state_fields)
+
+        with self.__lock:
+            previous_snapshot = self.__snapshot
+
+            for flight in flights:
+                position = self.__get_values(flight, self.position_fields, get_position)
+                entry = (flight, position, self.__get_values(flight, self.state_fields, get_state))
+                snapshot[flight.id] = entry
+
+                previous_entry = previous_snapshot.get(flight.id)
+
+                if previous_entry is None:
+                    delta.new.append(flight)
+                    continue
+
+                if previous_entry[1] != entry[1]:
+                    delta.moved.append(flight)
+
+                if previous_entry[2] != entry[2]:
+                    changes = {
+                        name: (previous_value, value)
+                        for name, previous_value, value in zip(self.state_fields, previous_entry[2], entry[2])
+                        if previous_value != value
+                    }
+                    delta.changed.append(FlightChange(flight, previous_entry[0], changes))
+
+            delta.disappeared = [entry[0] for flight_id, entry in previous_snapshot.items() if flight_id not in snapshot]
+            self.__snapshot = snapshot
+
+        return delta
+
+    def clear(self) -> None:
+        """
+        Remove the snapshot, so the next update returns all the flights as new.
+        """
+        with self.__lock:
+            self.__snapshot = dict()
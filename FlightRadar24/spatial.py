@@ -0,0 +1,442 @@
+# -*- coding: utf-8 -*-
+
+"""
+Spatial indexes over airports, for nearest-airport and radius queries, and over the zones.
+"""
+
+from heapq import heappush, heappushpop
+from math import isnan, sin
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import os
+
+import numpy as np
+
+from .core import Core
+from .entities.airport import Airport
+from .geo import earth_radius, get_positions
+
+# Attributes of the airports kept by save(), as the "basic_info" keys of the Airport class.
+_saved_fields = ("name", "icao", "iata", "country")
+
+
+def _to_unit_vectors(latitudes: Any, longitudes: Any) -> np.ndarray:
+    """
+    Return the positions as points (x, y, z) on the unit sphere.
+    """
+    latitudes, longitudes = np.radians(latitudes), np.radians(longitudes)
+    cos_latitudes = np.cos(latitudes)
+
+    return np.stack([cos_latitudes * np.cos(longitudes), cos_latitudes * np.sin(longitudes), np.sin(latitudes)], axis=-1)
+
+
+def _to_kilometers(chord: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
+    """
+    Return the great-circle distance (in kilometers) of a chord of the unit sphere.
+    """
+    return 2 * earth_radius * np.arcsin(np.minimum(np.asarray(chord) / 2, 1))
+
+
+class AirportIndex(object):
+    """
+    KD-tree over the airports, built on their positions on the unit sphere.
+
+    The straight-line (chord) distance between two points of the sphere grows with their
+    great-circle distance, so the tree answers the queries without special cases at the poles
+    or at the antimeridian. Airports without a valid position are not indexed.
+
+    Example: AirportIndex(fr_api.get_airports([Countries.SPAIN])).get_nearest(40.4, -3.7)
+    """
+
+    def __init__(self, airports: Sequence[Airport] = (), leaf_size: int = 16):
+        """
+        Constructor of the AirportIndex class.
+
+        :param airports: Airports to index, like the ones returned by FlightRadar24API.get_airports()
+        :param leaf_size: Maximum number of airports in each leaf of the tree
+        """
+        latitudes, longitudes = get_positions(airports)
+        valid = ~(np.isnan(latitudes) | np.isnan(longitudes))
+
+        self.airports: List[Airport] = [airport for airport, is_valid in zip(airports, valid) if is_valid]
+        self.__points = _to_unit_vectors(latitudes[valid], longitudes[valid]).reshape(-1, 3)
+        self.__tree: Optional[Tuple[List[Tuple[float, ...]], List[Tuple[Any, ...]], List[int]]] = None
+        self.__build(max(leaf_size, 1))
+
+    def __len__(self) -> int:
+        return len(self.airports)
+
+    def __build(self, leaf_size: int) -> None:
+        """
+        Build the tree. Each node covers a contiguous range of "order", with its bounding box.
+        """
+        self.__order = np.arange(len(self.__points))
+        nodes: List[List[Any]] = list()
+
+        def build_node(start: int, end: int) -> int:
+            node = len(nodes)
+            points = self.__points[self.__order[start:end]]
+
+            lower, upper = (points.min(axis=0), points.max(axis=0)) if end > start else (np.zeros(3), np.zeros(3))
+            nodes.append([start, end, -1, -1, lower, upper])
+
+            if end - start <= leaf_size:
+                return node
+
+            # Split at the median of the widest dimension.
+            dimension = int(np.argmax(upper - lower))
+            middle = (end - start) // 2
+
+            partition = np.argpartition(points[:, dimension], middle)
+            self.__order[start:end] = self.__order[start:end][partition]
+
+            nodes[node][2] = build_node(start, start + middle)
+            nodes[node][3] = build_node(start + middle, end)
+
+            return node
+
+        build_node(0, len(self.__points))
+
+        self.__ranges = np.array([node[:2] for node in nodes], dtype=np.intp)
+        self.__children = np.array([node[2:4] for node in nodes], dtype=np.intp)
+        self.__lower = np.array([node[4] for node in nodes], dtype=np.float64)
+        self.__upper = np.array([node[5] for node in nodes], dtype=np.float64)
+
+    def __get_tree(self) -> Tuple[List[Tuple[float, ...]], List[Tuple[Any, ...]], List[int]]:
+        """
+        Return the points and the nodes as Python lists, which are faster than NumPy arrays for the tree traversal.
+
+        Each node is a tuple (start, end, left, right, lower, upper, split dimension, split value).
+        """
+        if self.__tree is None:
+            # Same split dimension chosen by __build(). The left child ends at the split value.
+            dimensions = np.argmax(self.__upper - self.__lower, axis=1)
+            values = self.__upper[self.__children[:, 0], dimensions]
+
+            nodes = list(zip(
+                self.__ranges[:, 0].tolist(), self.__ranges[:, 1].tolist(),
+                self.__children[:, 0].tolist(), self.__children[:, 1].tolist(),
+                [tuple(bounds) for bounds in self.__lower.tolist()], [tuple(bounds) for bounds in self.__upper.tolist()],
+                dimensions.tolist(), values.tolist()
+            ))
+            self.__tree = ([tuple(point) for point in self.__points.tolist()], nodes, self.__order.tolist())
+
+        return self.__tree
+
+    def __search(self, point: Tuple[float, float, float], k: Optional[int], max_chord: float) -> List[Tuple[float, int]]:
+        """
+        Return tuples (chord, airport index) of the "k" nearest airports (or all of them, if k is None) within "max_chord".
+        """
+        found: List[Tuple[float, int]] = list()
+
+        # Max-heap of the nearest airports (by squared chord), while k is not None.
+        nearest: List[Tuple[float, int]] = list()
+        bound = max_chord * max_chord
+
+        if not len(self.__points) or k == 0: return found
+
+        points, nodes, order = self.__get_tree()
+        x, y, z = point
+        stack = [0]
+
+        while stack:
+            start, end, left, right, lower, upper, dimension, value = nodes[stack.pop()]
+
+            # Squared distance from the point to the bounding box of the node.
+            dx = lower[0] - x if x < lower[0] else x - upper[0] if x > upper[0] else 0
+            dy = lower[1] - y if y < lower[1] else y - upper[1] if y > upper[1] else 0
+            dz = lower[2] - z if z < lower[2] else z - upper[2] if z > upper[2] else 0
+            if dx * dx + dy * dy + dz * dz > bound: continue
+
+            if left < 0:
+                for index in order[start:end]:
+                    px, py, pz = points[index]
+                    distance = (px - x) ** 2 + (py - y) ** 2 + (pz - z) ** 2
+
+                    if distance > bound: continue
+
+                    if k is None:
+                        found.append((distance, index))
+
+                    elif len(nearest) < k:
+                        heappush(nearest, (-distance, index))
+                        if len(nearest) == k: bound = min(bound, -nearest[0][0])
+
+                    else:
+                        heappushpop(nearest, (-distance, index))
+                        bound = min(bound, -nearest[0][0])
+
+                continue
+
+            # Visit the nearest child first, so the bound shrinks sooner.
+            stack.extend((right, left) if point[dimension] <= value else (left, right))
+
+        found = found if k is None else [(-distance, index) for distance, index in nearest]
+        return sorted((distance ** 0.5, index) for distance, index in found)
+
+    def __query(self, latitude: float, longitude: float, k: Optional[int], radius: Optional[float]) -> List[Tuple[Airport, float]]:
+        point = tuple(_to_unit_vectors(latitude, longitude).tolist())
+        max_chord = 2 * sin(min(radius / earth_radius, np.pi) / 2) if radius is not None else np.inf
+
+        return [(self.airports[index], float(_to_kilometers(chord))) for chord, index in self.__search(point, k, max_chord)]
+
+    def get_nearest(self, latitude: float, longitude: float) -> Optional[Tuple[Airport, float]]:
+        """
+        Return the nearest airport to a position and its distance (in kilometers), or None if the index is empty.
+        """
+        nearest = self.__query(latitude, longitude, 1, None)
+        return nearest[0] if nearest else None
+
+    def get_k_nearest(self, latitude: float, longitude: float, k: int, radius: Optional[float] = None) -> List[Tuple[Airport, float]]:
+        """
+        Return the "k" nearest airports to a position, sorted by distance, as tuples (airport, distance in kilometers).
+
+        :param radius: Maximum distance (in kilometers) of the airports (optional)
+        """
+        return self.__query(latitude, longitude, k, radius)
+
+    def get_within_radius(self, latitude: float, longitude: float, radius: float) -> List[Tuple[Airport, float]]:
+        """
+        Return the airports within a radius (in kilometers) of a position, sorted by distance,
+        as tuples (airport, distance in kilometers).
+        """
+        return self.__query(latitude, longitude, None, radius)
+
+    def get_nearest_many(self, latitudes: Any, longitudes: Any) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Return the index in "airports" of the nearest airport to each position, and its distance (in kilometers).
+
+        Unknown positions (NaN) get the index -1 and the distance NaN. Useful with the columns of get_flights_columns().
+        """
+        points = _to_unit_vectors(np.asarray(latitudes, dtype=np.float64), np.asarray(longitudes, dtype=np.float64)).reshape(-1, 3)
+
+        indexes = np.full(len(points), -1, dtype=np.intp)
+        distances = np.full(len(points), np.nan)
+
+        for position, point in enumerate(points):
+            if np.isnan(point).any(): continue
+
+            nearest = self.__search(tuple(point.tolist()), 1, np.inf)
+            if nearest: distances[position], indexes[position] = _to_kilometers(nearest[0][0]), nearest[0][1]
+
+        return indexes, distances
+
+    def save(self, path: Union[str, os.PathLike]) -> None:
+        """
+        Save the index, with the basic information of the airports, to a NumPy .npz file.
+        """
+        def get_texts(name: str) -> np.ndarray:
+            return np.array([str(getattr(airport, name, None) or "") for airport in self.airports], dtype=str)
+
+        altitudes = [getattr(airport, "altitude", None) for airport in self.airports]
+
+        np.savez(
+            path,
+            points=self.__points, order=self.__order, ranges=self.__ranges,
+            children=self.__children, lower=self.__lower, upper=self.__upper,
+            latitudes=np.array([airport.latitude for airport in self.airports], dtype=np.float64),
+            longitudes=np.array([airport.longitude for airport in self.airports], dtype=np.float64),
+            altitudes=np.array([altitude if isinstance(altitude, (int, float)) else np.nan for altitude in altitudes], dtype=np.float64),
+            **{"text_" + name: get_texts(name) for name in _saved_fields}
+        )
+
+    @classmethod
+    def load(cls, path: Union[str, os.PathLike]) -> "AirportIndex":
+        """
+        Load an index saved by save(), without building the tree again.
+        """
+        with np.load(path) as data:
+            index = cls()
+            index.__tree = None
+
+            index.__points, index.__order, index.__ranges = data["points"], data["order"], data["ranges"]
+            index.__children, index.__lower, index.__upper = data["children"], data["lower"], data["upper"]
+
+            texts = {key: data["text_" + key].tolist() for key in _saved_fields}
+            altitudes = data["altitudes"].tolist()
+
+            index.airports = [
+                Airport(basic_info={
+                    **{key: texts[key][position] for key in _saved_fields},
+                    "lat": latitude, "lon": longitude,
+                    "alt": altitudes[position] if not isnan(altitudes[position]) else None
+                })
+                for position, (latitude, longitude) in enumerate(zip(data["latitudes"].tolist(), data["longitudes"].tolist()))
+            ]
+
+        return index
+
+
+class ZoneIndex(object):
+    """
+    Grid index over the hierarchy of zones (Core.static_zones), to find the deepest zone of many positions at once.
+
+    A position is in a zone if it is inside its bounding box and inside the boxes of all its parent zones.
+    Among those zones, the deepest one is returned (the first one in the order of the dictionary, if there is a tie).
+
+    The zone of each cell of the grid is computed when the index is built. Only the positions of the cells
+    crossed by the border of a box are tested against the boxes.
+
+    Example: ZoneIndex().get_zones_many(columns["latitude"], columns["longitude"])
+    """
+
+    def __init__(self, zones: Optional[Dict[str, Dict]] = None, cell_size: float = 1.0):
+        """
+        Constructor of the ZoneIndex class.
+
+        :param zones: Dictionary of zones, like the one returned by FlightRadar24API.get_zones(). Defaults to Core.static_zones
+        :param cell_size: Size (in degrees) of the cells of the grid
+        """
+        if cell_size <= 0:
+            raise ValueError("cell_size must be greater than zero.")
+
+        self.names: List[str] = list()
+        self.parents: List[int] = list()
+        self.cell_size = cell_size
+
+        boxes: List[Tuple[float, float, float, float]] = list()
+        depths: List[int] = list()
+
+        # Zones in preorder, so the parents are before their subzones.
+        def add_zones(zones: Dict[str, Any], parent: int, depth: int) -> None:
+            for name, zone in zones.items():
+                if not isinstance(zone, dict) or "tl_y" not in zone: continue
+
+                self.names.append(name)
+                self.parents.append(parent)
+                boxes.append((zone["br_y"], zone["tl_y"], zone["tl_x"], zone["br_x"]))
+                depths.append(depth)
+
+                add_zones(zone.get("subzones", dict()), len(self.names) - 1, depth + 1)
+
+        add_zones(zones if zones is not None else Core.static_zones, -1, 1)
+
+        self.__boxes = np.array(boxes, dtype=np.float64).reshape(-1, 4)
+        self.__depths = np.array(depths, dtype=np.intp)
+        self.__build()
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __locate(self, inside: np.ndarray, partial: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Return the deepest zone of each column of a matrix (zones x positions) with the positions inside each box, or -1.
+
+        If a matrix with the positions that are partially inside each box is given (cells of the grid), it also returns
+        the columns whose zone cannot be decided.
+        """
+        valid = np.zeros(inside.shape, dtype=bool)
+        maybe = np.zeros(inside.shape, dtype=bool)
+
+        for index, parent in enumerate(self.parents):
+            valid[index] = inside[index] if parent < 0 else inside[index] & valid[parent]
+
+            if partial is not None:
+                possible = inside[index] | partial[index]
+                maybe[index] = possible if parent < 0 else possible & (valid[parent] | maybe[parent])
+
+        scores = np.where(valid, self.__depths[:, np.newaxis], 0)
+        zones = np.where(scores.max(axis=0, initial=0) > 0, scores.argmax(axis=0) if len(scores) else 0, -1)
+
+        # Undecided if a zone that is not certain could be deeper, or come first with the same depth.
+        undecided = np.zeros(inside.shape[1], dtype=bool)
+
+        if partial is not None:
+            uncertain_scores = np.where(maybe & ~valid, self.__depths[:, np.newaxis], 0)
+            undecided = uncertain_scores.max(axis=0, initial=0) >= scores.max(axis=0, initial=0)
+            undecided &= uncertain_scores.max(axis=0, initial=0) > 0
+
+        return zones, undecided
+
+    def __build(self) -> None:
+        """
+        Compute the zone of each cell of the grid, or -2 for the cells that need the exact test.
+        """
+        self.__rows = int(np.ceil(180 / self.cell_size))
+        self.__columns = int(np.ceil(360 / self.cell_size))
+
+        rows, columns = np.indices((self.__rows, self.__columns)).reshape(2, -1)
+        lat_min, lon_min = -90 + rows * self.cell_size, -180 + columns * self.cell_size
+        lat_max, lon_max = lat_min + self.cell_size, lon_min + self.cell_size
+
+        bottom, top, left, right = (self.__boxes[:, [position]] for position in range(4))
+
+        # Cells completely inside each box, and cells that only overlap it.
+        inside = (bottom <= lat_min) & (lat_max <= top) & (left <= lon_min) & (lon_max <= right)
+        overlap = (bottom <= lat_max) & (lat_min <= top) & (left <= lon_max) & (lon_min <= right)
+
+        zones, undecided = self.__locate(inside, overlap & ~inside)
+        self.__grid = np.where(undecided, -2, zones).astype(np.intp)
+
+    def __get_boxes_inside(self, latitudes: np.ndarray, longitudes: np.ndarray) -> np.ndarray:
+        bottom, top, left, right = (self.__boxes[:, [position]] for position in range(4))
+        return (bottom <= latitudes) & (latitudes <= top) & (left <= longitudes) & (longitudes <= right)
+
+    def get_zone_indexes(self, latitudes: Any, longitudes: Any) -> np.ndarray:
+        """
+        Return the index in "names" of the deepest zone of each position, or -1 if it is not in any zone.
+
+        Unknown positions (NaN) get -1. Useful with the columns of get_flights_columns().
+        """
+        latitudes = np.asarray(latitudes, dtype=np.float64).reshape(-1)
+        longitudes = np.asarray(longitudes, dtype=np.float64).reshape(-1)
+
+        known = ~(np.isnan(latitudes) | np.isnan(longitudes))
+        indexes = np.full(len(latitudes), -1, dtype=np.intp)
+
+        rows = np.clip(((latitudes[known] + 90) // self.cell_size).astype(np.intp), 0, self.__rows - 1)
+        columns = np.clip(((longitudes[known] + 180) // self.cell_size).astype(np.intp), 0, self.__columns - 1)
+        indexes[known] = self.__grid[rows * self.__columns + columns]
+
+        # Exact test of the positions in the cells crossed by a border.
+        undecided = np.flatnonzero(indexes == -2)
+
+        if len(undecided):
+            inside = self.__get_boxes_inside(latitudes[undecided], longitudes[undecided])
+            indexes[undecided] = self.__locate(inside)[0]
+
+        return indexes
+
+    def get_zones_many(self, latitudes: Any, longitudes: Any) -> np.ndarray:
+        """
+        Return the name of the deepest zone of each position, or None. See get_zone_indexes().
+        """
+        names = np.array(self.names + [None], dtype=object)
+        return names[self.get_zone_indexes(latitudes, longitudes)]
+
+    def get_zone(self, latitude: float, longitude: float) -> Optional[str]:
+        """
+        Return the name of the deepest zone of a position, or None.
+        """
+        return self.get_zones_many([latitude], [longitude])[0]
+
+    def get_path(self, name: str) -> List[str]:
+        """
+        Return the names of a zone and its parents, from the top level. Ex: ["europe", "uk", "london"]
+        """
+        index = self.names.index(name)
+        path = list()
+
+        while index >= 0:
+            path.append(self.names[index])
+            index = self.parents[index]
+
+        return path[::-1]
+
+    def get_counts(self, latitudes: Any, longitudes: Any, include_parents: bool = False) -> Dict[str, int]:
+        """
+        Return the number of positions of each zone.
+
+        :param latitudes: Array of latitudes
+        :param longitudes: Array of longitudes
+        :param include_parents: If True, the positions of the subzones are also counted in their parent zones
+        """
+        indexes = self.get_zone_indexes(latitudes, longitudes)
+        counts = np.bincount(indexes[indexes >= 0], minlength=len(self.names))
+
+        if include_parents:
+            # Subzones are after their parents, so the counts go up from the deepest ones.
+            for index in range(len(self.names) - 1, -1, -1):
+                if self.parents[index] >= 0: counts[self.parents[index]] += counts[index]
+
+        return {name: int(count) for name, count in zip(self.names, counts)}
@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+
+"""
+Recent tracks of the aircraft, built from successive snapshots of the Real Time Flight Tracker.
+"""
+
+from numbers import Real
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+import threading
+import time
+
+import numpy as np
+
+from .entities.flight import Flight
+
+# Fields of each point of a track. The timestamp needs float64; float32 is enough for the others.
+track_dtype = np.dtype([
+    ("time", np.float64),
+    ("latitude", np.float32),
+    ("longitude", np.float32),
+    ("altitude", np.float32),
+    ("ground_speed", np.float32),
+    ("vertical_speed", np.float32)
+])
+
+
+def _to_number(value: Any) -> float:
+    return value if isinstance(value, Real) else np.nan
+
+
+class Track(object):
+    """
+    Fixed-size ring buffer with the last positions of an aircraft. The oldest points are overwritten.
+    """
+
+    __slots__ = ("icao_24bit", "flight_id", "last_seen", "_points", "_size", "_next")
+
+    def __init__(self, icao_24bit: str, capacity: int):
+        """
+        Constructor of the Track class.
+
+        :param icao_24bit: ICAO 24-bit address of the aircraft
+        :param capacity: Maximum number of points
+        """
+        self.icao_24bit = icao_24bit
+        self.flight_id: Optional[str] = None
+        self.last_seen = 0.0
+
+        self._points = np.zeros(capacity, dtype=track_dtype)
+        self._size = 0
+        self._next = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __repr__(self) -> str:
+        return "<Track {} - Flight: {} - Points: {}>".format(self.icao_24bit, self.flight_id, self._size)
+
+    def append(self, flight: Flight) -> bool:
+        """
+        Add the position of a snapshot of the flight. Return False if the position timestamp did not change.
+        """
+        timestamp = _to_number(flight.time)
+        capacity = len(self._points)
+
+        if self._size and self._points["time"][(self._next - 1) % capacity] == timestamp:
+            return False
+
+        self._points[self._next] = (
+            timestamp, _to_number(flight.latitude), _to_number(flight.longitude),
+            _to_number(flight.altitude), _to_number(flight.ground_speed), _to_number(flight.vertical_speed)
+        )
+        self.flight_id = flight.id
+
+        self._next = (self._next + 1) % capacity
+        self._size = min(self._size + 1, capacity)
+
+        return True
+
+    def get_points(self) -> np.ndarray:
+        """
+        Return a copy of the points, from the oldest to the newest, as a structured array (see track_dtype).
+
+        Ex: track.get_points()["altitude"]
+        """
+        if self._size < len(self._points):
+            return self._points[:self._size].copy()
+
+        return np.concatenate((self._points[self._next:], self._points[:self._next]))
+
+
+class TrackStore(object):
+    """
+    In-memory tracks of the aircraft, keyed by their ICAO 24-bit address and fed from every get_flights() poll.
+
+    Aircraft that are not seen for "max_age" seconds are evicted.
+    """
+
+    def __init__(self, capacity: int = 64, max_age: float = 15 * 60):
+        """
+        Constructor of the TrackStore class.
+
+        :param capacity: Maximum number of points of each track
+        :param max_age: Time, in seconds, after which an aircraft that is not seen is evicted
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be greater than zero.")
+
+        self.capacity = capacity
+        self.max_age = max_age
+
+        self.__lock = threading.Lock()
+        self.__tracks: Dict[str, Track] = dict()
+
+    def __len__(self) -> int:
+        return len(self.__tracks)
+
+    def __contains__(self, icao_24bit: str) -> bool:
+        return icao_24bit in self.__tracks
+
+    def __iter__(self) -> Iterator[Track]:
+        with self.__lock:
+            return iter(list(self.__tracks.values()))
+
+    def update(self, flights: Iterable[Flight], now: Optional[float] = None) -> int:
+        """
+        Add the positions of a snapshot of flights and evict the stale aircraft.
+        Return the number of points added.
+
+        Flights without ICAO 24-bit address are ignored.
+
+        :param flights: Flights of the snapshot. Ex: the result of get_flights()
+        :param now: Time of the snapshot (defaults to the current time)
+        """
+        now = now if now is not None else time.time()
+        added = 0
+
+        with self.__lock:
+            for flight in flights:
+                icao_24bit = flight.icao_24bit
+                if not icao_24bit or icao_24bit == Flight._default_text: continue
+
+                track = self.__tracks.get(icao_24bit)
+
+                if track is None:
+                    track = self.__tracks[icao_24bit] = Track(icao_24bit, self.capacity)
+
+                track.last_seen = now
+                added += track.append(flight)
+
+            self.__evict(now)
+
+        return added
+
+    def __evict(self, now: float) -> int:
+        stale = [icao_24bit for icao_24bit, track in self.__tracks.items() if now - track.last_seen > self.max_age]
+
+        for icao_24bit in stale:
+            del self.__tracks[icao_24bit]
+
+        return len(stale)
+
+    def evict(self, now: Optional[float] = None) -> int:
+        """
+        Remove the aircraft that were not seen for "max_age" seconds. Return the number of evicted aircraft.
+        """
+        with self.__lock:
+            return self.__evict(now if now is not None else time.time())
+
+    def get_track(self, icao_24bit: str) -> Optional[Track]:
+        """
+        Return the track of an aircraft, or None.
+        """
+        with self.__lock:
+            return self.__tracks.get(icao_24bit)
+
+    def get_points(self, icao_24bit: str) -> Optional[np.ndarray]:
+        """
+        Return the points of the track of an aircraft, from the oldest to the newest, or None. See Track.get_points().
+        """
+        with self.__lock:
+            track = self.__tracks.get(icao_24bit)
+            return track.get_points() if track is not None else None
+
+    def clear(self) -> None:
+        """
+        Remove all the tracks.
+        """
+        with self.__lock:
+            self.__tracks.clear()
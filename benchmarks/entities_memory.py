@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+
+"""
+Memory benchmark of the Flight entities.
+
+Compares the slotted Flight, which keeps the details dictionary and resolves the detail
+attributes lazily, with the previous design: a per-instance __dict__ with every detail
+attribute copied eagerly.
+
+Usage: python benchmarks/entities_memory.py [number of flights]
+"""
+
+import os
+import sys
+import tracemalloc
+import types
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from FlightRadar24.entities import Flight
+
+
+def make_row(index):
+    return [
+        "%06X" % index, 40.0 + index % 100 / 100, -3.0 - index % 100 / 100, index % 360, 1000 + index % 40000,
+        250, "7000", "F-LEMD1", "A320", "EC-%04d" % index, 1700000000 + index, "MAD", "BCN",
+        "IB%d" % index, 0, 1200, "IBE%d" % index, 0, "IBE"
+    ]
+
+
+def make_details(index):
+    def airport(code, name):
+        return {
+            "name": name, "code": {"iata": code, "icao": "LE" + code[:2]}, "visible": True, "website": None,
+            "info": {"terminal": "4", "baggage": None, "gate": "K%d" % (index % 90)},
+            "position": {"latitude": 40.47, "longitude": -3.56, "altitude": 2000, "country": {"name": "Spain", "code": "ES"}},
+            "timezone": {"name": "Europe/Madrid", "offset": 3600, "abbr": "CET", "abbrName": "Central European Time", "offsetHours": "1:00"}
+        }
+
+    return {
+        "aircraft": {"age": 5, "countryId": 1, "images": [], "model": {"text": "Airbus A320-214"}},
+        "airline": {"name": "Iberia", "short": "Iberia"},
+        "airport": {"origin": airport("MAD", "Madrid Barajas Airport"), "destination": airport("BCN", "Barcelona El Prat Airport")},
+        "flightHistory": {"aircraft": []},
+        "status": {"icon": "green", "text": "Estimated 12:%02d" % (index % 60)},
+        "time": {"real": {"departure": 1700000000 + index}, "scheduled": {"departure": 1700000000}},
+        "trail": []
+    }
+
+
+def measure(build, count):
+    tracemalloc.start()
+    items = [build(index) for index in range(count)]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    del items
+    return current
+
+
+def build_flight(index, details):
+    flight = Flight("3%07x" % index, make_row(index))
+    if details: flight.set_flight_details(make_details(index))
+    return flight
+
+
+def build_legacy_flight(index, details):
+    flight = build_flight(index, details)
+
+    # Same attributes stored in a per-instance __dict__, with the details copied eagerly.
+    attributes = {name: getattr(flight, name) for name in Flight.__slots__ + ("latitude", "longitude")}
+
+    if details:
+        attributes.update({name: getattr(flight, name) for name in Flight._detail_fields})
+
+    return types.SimpleNamespace(**attributes)
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+
+    for details in (False, True):
+        slotted = measure(lambda index: build_flight(index, details), count)
+        legacy = measure(lambda index: build_legacy_flight(index, details), count)
+
+        label = "with details" if details else "feed only"
+        print(f"{count} flights ({label}):")
+        print(f"  __dict__ entities: {legacy / count:8.0f} bytes per flight ({legacy / 2 ** 20:.1f} MiB)")
+        print(f"  slotted entities:  {slotted / count:8.0f} bytes per flight ({slotted / 2 ** 20:.1f} MiB)")
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark of the HTML parsing of get_airports() and get_airlines().
+
+Compares the previous parsing (the whole document with BeautifulSoup and "html.parser")
+with the current one (only the "tbody" element, with lxml if it is installed).
+
+By default, synthetic pages with the structure of the FlightRadar24 pages are used. Saved pages
+can be given in a directory: files named "airlines*.html" are parsed as the page of airlines
+and the other .html files as pages of countries.
+
+Usage: python benchmarks/html_parsers.py [directory with saved HTML pages]
+"""
+
+import glob
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from bs4 import BeautifulSoup
+
+from FlightRadar24 import parsers
+
+# Header, menus and scripts around the table, as in the real pages.
+PAGE_TEMPLATE = """<!DOCTYPE html><html><head><title>{title}</title>{scripts}</head><body>
+<nav>{menu}</nav><div class="content"><table class="table"><thead><tr><th>Name</th><th>Codes</th></tr></thead>
+<tbody>{rows}</tbody></table></div><footer>{menu}</footer></body></html>"""
+
+SCRIPTS = "".join("<script>var config{0} = {{\"key\": \"value {0}\"}};</script>".format(index) for index in range(200))
+MENU = "".join('<ul class="menu"><li><a href="/section/{0}">Section {0}</a></li></ul>'.format(index) for index in range(300))
+
+
+def make_country_page(count):
+    rows = "".join(
+        '<tr><td><a href="/data/airports/x{0}" data-iata="X{0:02d}" data-lat="{1:.4f}" data-lon="{2:.4f}">'
+        'Airport {0} <small>(X{0:02d}/LX{0:02d})</small></a></td><td>Country</td></tr>'.format(index, 40 + index / 100, -3 + index / 100)
+        for index in range(count)
+    )
+    return PAGE_TEMPLATE.format(title="Airports", scripts=SCRIPTS, menu=MENU, rows=rows).encode()
+
+
+def make_airlines_page(count):
+    rows = "".join(
+        '<tr><td></td><td class="notranslate"><a href="/data/airlines/a{0}">Airline {0}</a></td><td></td>'
+        '<td>A{0:1d} / A{0:02d}</td><td>{0} aircraft</td></tr>'.format(index)
+        for index in range(count)
+    )
+    return PAGE_TEMPLATE.format(title="Airlines", scripts=SCRIPTS, menu=MENU, rows=rows).encode()
+
+
+def get_whole_table_body(html_content):
+    # Previous parsing: the whole document with the built-in parser.
+    return BeautifulSoup(html_content, "html.parser").find("tbody")
+
+
+def measure(function, pages, repeat):
+    start_time = time.perf_counter()
+
+    for _ in range(repeat):
+        results = [function(page) for page in pages]
+
+    return (time.perf_counter() - start_time) / repeat, results
+
+
+def compare(label, function, pages, repeat=3):
+    current_time, current_results = measure(function, pages, repeat)
+
+    get_table_body = parsers._get_table_body
+    parsers._get_table_body = get_whole_table_body
+
+    try:
+        previous_time, previous_results = measure(function, pages, repeat)
+    finally:
+        parsers._get_table_body = get_table_body
+
+    assert current_results == previous_results, "The parsers returned different results."
+
+    print(f"{label} ({len(pages)} pages, {sum(len(result) for result in current_results)} rows):")
+    print(f"  html.parser, whole document: {previous_time * 1000:8.1f} ms")
+    print(f"  {parsers.html_parser}, tbody only:{' ' * (16 - len(parsers.html_parser))}{current_time * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        paths = sorted(glob.glob(os.path.join(sys.argv[1], "*.html")))
+        airlines_pages = [open(path, "rb").read() for path in paths if os.path.basename(path).startswith("airlines")]
+        country_pages = [open(path, "rb").read() for path in paths if not os.path.basename(path).startswith("airlines")]
+    else:
+        airlines_pages = [make_airlines_page(1500)]
+        country_pages = [make_country_page(count) for count in (10, 50, 150, 400, 1000)]
+
+    if country_pages:
+        compare("Pages of countries", lambda page: parsers.parse_country_airports("/data/airports/spain", page), country_pages)
+
+    if airlines_pages:
+        compare("Page of airlines", parsers.parse_airlines, airlines_pages)
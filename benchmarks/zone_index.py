@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark of the lookup of the deepest zone (Core.static_zones) of a snapshot of positions.
+
+Compares a linear scan over every box for every position with the ZoneIndex, which resolves
+most positions from its grid and tests against the boxes only those in the cells crossed by a border.
+
+Half of the positions are spread over the globe and the other half over Europe and North America,
+where most of the traffic and most of the subzones are.
+
+Usage: python benchmarks/zone_index.py [number of positions]
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from FlightRadar24 import ZoneIndex
+from FlightRadar24.core import Core
+
+
+def make_positions(count):
+    random = np.random.default_rng(24)
+    half = count // 2
+
+    latitudes = np.concatenate([random.uniform(-70, 80, half), random.uniform(25, 60, count - half)])
+    longitudes = np.concatenate([random.uniform(-180, 180, half), random.choice([-100, 10], count - half) + random.uniform(-30, 30, count - half)])
+
+    return latitudes, longitudes
+
+
+def linear_scan(latitudes, longitudes):
+    # Every box of the hierarchy for every position.
+    def locate(latitude, longitude, zones, depth):
+        best = (None, 0)
+
+        for name, zone in zones.items():
+            if not isinstance(zone, dict) or "tl_y" not in zone: continue
+            if not (zone["br_y"] <= latitude <= zone["tl_y"] and zone["tl_x"] <= longitude <= zone["br_x"]): continue
+
+            if depth > best[1]: best = (name, depth)
+
+            subzone = locate(latitude, longitude, zone.get("subzones", dict()), depth + 1)
+            if subzone[1] > best[1]: best = subzone
+
+        return best
+
+    return [locate(latitude, longitude, Core.static_zones, 1)[0] for latitude, longitude in zip(latitudes.tolist(), longitudes.tolist())]
+
+
+def measure(function, repeat):
+    start_time = time.perf_counter()
+
+    for _ in range(repeat):
+        result = function()
+
+    return (time.perf_counter() - start_time) / repeat, result
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    latitudes, longitudes = make_positions(count)
+
+    build_time, index = measure(ZoneIndex, 3)
+    scan_time, scan_result = measure(lambda: linear_scan(latitudes, longitudes), 3)
+    index_time, index_result = measure(lambda: index.get_zones_many(latitudes, longitudes), 20)
+
+    assert list(index_result) == scan_result, "The lookups returned different zones."
+
+    print(f"{count} positions, {len(index)} zones:")
+    print(f"  linear scan:             {scan_time * 1000:8.2f} ms")
+    print(f"  ZoneIndex:               {index_time * 1000:8.2f} ms")
+    print(f"  ZoneIndex (build once):  {build_time * 1000:8.2f} ms")
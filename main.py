@@ -1,14 +1,13 @@
 import os
-import time
 import pytz
 import gspread
 from fastapi import FastAPI
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from oauth2client.service_account import ServiceAccountCredentials
 from datetime import datetime
 
 # --- IMPORTACIÓN DE LA LIBRERÍA LOCAL (MANTENIDA) ---
-from FlightRadar24 import FlightRadar24API
+from FlightRadar24 import CircleGeofence, EventDetector, FlightDetailCache, FlightRadar24API, GeofenceSet, MetricsCollector, ResponseCache
 
 # --- CONFIGURACIÓN ---
 IATA_CODE = "MAD"
@@ -17,7 +16,31 @@ GOOGLE_JSON = "service_account.json"
 SPREADSHEET_NAME = "Barajas_Master_Data"
 
 app = FastAPI()
-fr_api = FlightRadar24API()
+# Los detalles de un vuelo se reutilizan entre pasadas mientras no despegue, aterrice o cambie de datos
+fr_api = FlightRadar24API(cache=ResponseCache(), detail_cache=FlightDetailCache())
+metricas = MetricsCollector()
+fr_api.add_metrics_hook(metricas)
+
+# Detector de despegues y aterrizajes entre pasadas. Se crea en la primera, con los datos del aeropuerto
+detector = None
+
+# Eventos del detector pendientes de registrar, por id de vuelo de FR24
+eventos_pendientes = {}
+# Vuelos ya registrados (o descartados), para no volver a pedir sus detalles
+vuelos_registrados = set()
+
+# Solo se registran los eventos de los últimos 90 minutos
+VENTANA_SEGUNDOS = 5400
+# Sin hora real publicada, la estimada por el detector se escribe pasado este margen, marcada en la
+# columna de la hora, y la fila se corrige cuando FR24 publica la real
+ESPERA_HORA_REAL = 900
+MARCA_ESTIMADA = " (estimada)"
+
+# Zona de interés: círculo alrededor del aeropuerto por debajo de 10000 pies (se descartan los sobrevuelos).
+# El radio abarca el cuadrado de 100 km de lado que se usaba antes, para no perder salidas entre pasadas
+RADIO_ZONA_KM = 71
+TECHO_ZONA_PIES = 10000
+zona = None
 
 def conectar_y_preparar_hoja():
     try:
@@ -30,6 +53,26 @@ def conectar_y_preparar_hoja():
         print(f"⛔ Error en Sheets: {e}")
         return None
 
+def es_candidato(v):
+    # --- MEJORA 2: ALTITUD ASIMÉTRICA PARA NO PERDER SALIDAS ---
+    # Filtro preventivo basado en IATA para decidir el techo de altitud
+    es_mad_origen = v.origin_airport_iata == IATA_CODE
+    es_mad_destino = v.destination_airport_iata == IATA_CODE
+    altitud = v.altitude if isinstance(v.altitude, (int, float)) else 0
+
+    if not (es_mad_origen or es_mad_destino):
+        return False
+
+    # Si es LLEGADA a MAD, mantenemos el filtro estricto de 6000 pies
+    if es_mad_destino and altitud > 6000:
+        return False
+
+    # Si es SALIDA de MAD, subimos a 10000 pies para cazar los despegues rápidos
+    if es_mad_origen and altitud > 10000:
+        return False
+
+    return True
+
 @app.get("/")
 def home():
     return {"status": "online", "msg": "Recolector Barajas Optimizado - Operativo"}
@@ -37,9 +80,16 @@ def home():
 @app.get("/ping")
 def ping():
     return {"status": "alive", "timestamp": datetime.now(ZONA_HORARIA).isoformat()}
+
+@app.get("/metrics")
+def metrics():
+    # Latencias, tamaños y tiempos de decodificación por endpoint de FR24 (formato Prometheus)
+    return PlainTextResponse(metricas.to_prometheus(), media_type="text/plain; version=0.0.4")
     
 @app.get("/recolectar")
 def recolectar():
+    global detector, zona
+
     sheet = conectar_y_preparar_hoja()
     if not sheet:
         return JSONResponse({"error": "No se pudo conectar a Google Sheets"}, status_code=500)
@@ -52,82 +102,135 @@ def recolectar():
     # Obtenemos los valores del rango final para generar el set de firmas
     data_reciente = sheet.get_values(f"A{inicio_lectura}:N{total_filas}")
     firmas_existentes = {f"{r[1]}_{r[13]}" for r in data_reciente if len(r) > 13}
+    # Filas con la hora estimada por el detector (número de fila por vuelo y tipo), para corregirlas
+    filas_estimadas = {
+        (r[1], r[2]): inicio_lectura + i
+        for i, r in enumerate(data_reciente) if len(r) > 13 and r[8].endswith(MARCA_ESTIMADA)
+    }
     
     try:
         aeropuerto = fr_api.get_airport(code = IATA_CODE)
-        bounds = fr_api.get_bounds_by_point(aeropuerto.latitude, aeropuerto.longitude, 50000)
-        vuelos_radar = fr_api.get_flights(bounds = bounds)
-        
+        if detector is None:
+            detector = EventDetector([aeropuerto])
+            zona = GeofenceSet([
+                CircleGeofence(IATA_CODE, aeropuerto.latitude, aeropuerto.longitude, RADIO_ZONA_KM, max_altitude = TECHO_ZONA_PIES)
+            ])
+
+        # El recuadro de la zona se pasa al feed y los vuelos fuera del círculo o del techo se descartan
+        vuelos_radar = fr_api.get_flights(geofences = zona)
+
         nuevos_registros = []
         ahora = datetime.now(ZONA_HORARIA)
         ahora_ts = ahora.timestamp()
 
-        for v in vuelos_radar:
-            # --- MEJORA 2: ALTITUD ASIMÉTRICA PARA NO PERDER SALIDAS ---
-            # Filtro preventivo basado en IATA para decidir el techo de altitud
-            es_mad_origen = v.origin_airport_iata == IATA_CODE
-            es_mad_destino = v.destination_airport_iata == IATA_CODE
-
-            if not (es_mad_origen or es_mad_destino):
-                continue
-
-            # Si es LLEGADA a MAD, mantenemos el filtro estricto de 6000 pies
-            if es_mad_destino and v.altitude > 6000:
-                continue
-            
-            # Si es SALIDA de MAD, subimos a 10000 pies para cazar los despegues rápidos
-            if es_mad_origen and v.altitude > 10000:
+        # Despegues y aterrizajes detectados comparando con la pasada anterior (solo con el feed).
+        # Quedan pendientes hasta que se registran, aunque falle la petición de detalles
+        for evento in detector.update(vuelos_radar):
+            eventos_pendientes[evento.flight.id] = evento
+
+        for vuelo_id, evento in list(eventos_pendientes.items()):
+            if ahora_ts - evento.timestamp > VENTANA_SEGUNDOS:
+                del eventos_pendientes[vuelo_id]
+
+        vuelos_actuales = {v.id: v for v in vuelos_radar}
+        vuelos_registrados.intersection_update(set(vuelos_actuales) | set(eventos_pendientes))
+
+        # Los eventos pendientes (aunque el vuelo ya haya salido de la zona) y, como respaldo para los
+        # que se escapan al detector entre pasadas, el filtro asimétrico de siempre.
+        # La caché de detalles abarata las peticiones repetidas
+        candidatos = [vuelos_actuales.get(vuelo_id, evento.flight) for vuelo_id, evento in eventos_pendientes.items()]
+        candidatos += [
+            v for v in vuelos_radar
+            if v.id not in eventos_pendientes and v.id not in vuelos_registrados and es_candidato(v)
+        ]
+
+        # Vuelos cuyo evento se da por consumido cuando se guarden las filas nuevas
+        procesados = []
+        # Filas estimadas que se corrigen con la hora real: (número de fila, fila)
+        filas_corregidas = []
+
+        # 3. LLAMADA PESADA: solo para los candidatos, en paralelo. Si falla, se reintenta en la próxima pasada
+        for v, d, error in fr_api.iter_flight_details(candidatos):
+            if error is not None:
                 continue
 
             try:
-                # 3. LLAMADA PESADA: Solo para vuelos que pasaron el filtro asimétrico
-                d = fr_api.get_flight_details(v)
-                
                 es_salida = d['airport']['origin']['code']['iata'] == IATA_CODE
                 es_llegada = d['airport']['destination']['code']['iata'] == IATA_CODE
                 
-                if not (es_salida or es_llegada): continue
+                if not (es_salida or es_llegada):
+                    procesados.append(v.id)
+                    continue
                 
                 apt_key = 'destination' if es_salida else 'origin'
                 ts_key = 'departure' if es_salida else 'arrival'
                 ts_real = d['time']['real'].get(ts_key)
+                ts_estimado = None
+
+                # FR24 tarda en publicar la hora real: se espera y, si no llega, se usa la estimada por el detector
+                if not ts_real:
+                    evento = eventos_pendientes.get(v.id)
+
+                    if not (evento and evento.kind == ("takeoff" if es_salida else "landing")): continue
+                    if ahora_ts - evento.timestamp < ESPERA_HORA_REAL: continue
+
+                    ts_estimado = int(evento.timestamp)
+
+                ts_evento = ts_real or ts_estimado
                 
-                if ts_real and (ahora_ts - ts_real) < 5400:
+                if (ahora_ts - ts_evento) < VENTANA_SEGUNDOS:
                     vuelo_id = d['identification']['number']['default'] or d['aircraft']['registration']
                     categoria = "COMERCIAL" if d['identification']['number']['default'] else "PRIVADO/CHARTER"
                     
-                    firma = f"{vuelo_id}_{ts_real}"
+                    tipo = "SALIDA" if es_salida else "LLEGADA"
+                    firma = f"{vuelo_id}_{ts_evento}"
+                    fila_estimada = filas_estimadas.pop((vuelo_id, tipo), None) if ts_real else None
                     
-                    if firma not in firmas_existentes:
+                    if fila_estimada or firma not in firmas_existentes:
                         ciudad = d['airport'][apt_key]['position']['region']['city']
                         pais = d['airport'][apt_key]['position']['country']['name']
                         aerolinea = d['airline']['name'] if d['airline'] else "Privado"
                         terminal = d['airport']['origin' if es_salida else 'destination']['info']['terminal'] or "N/A"
                         
-                        diff_minutos = int((ts_real - d['time']['scheduled'][ts_key]) / 60)
-                        dt_real = datetime.fromtimestamp(ts_real, ZONA_HORARIA)
+                        diff_minutos = int((ts_evento - d['time']['scheduled'][ts_key]) / 60)
+                        dt_evento = datetime.fromtimestamp(ts_evento, ZONA_HORARIA).strftime('%Y-%m-%d %H:%M:%S')
                         
-                        nuevos_registros.append([
+                        fila = [
                             ahora.strftime('%Y-%m-%d %H:%M:%S'),
                             vuelo_id,
-                            "SALIDA" if es_salida else "LLEGADA",
+                            tipo,
                             d['airport'][apt_key]['code']['iata'],
                             ciudad, pais, aerolinea, terminal,
-                            dt_real.strftime('%Y-%m-%d %H:%M:%S'),
+                            dt_evento + (MARCA_ESTIMADA if ts_estimado else ""),
                             d['aircraft']['model']['text'],
                             d['aircraft']['registration'],
-                            diff_minutos, categoria, ts_real
-                        ])
+                            diff_minutos, categoria, ts_evento
+                        ]
+
+                        if fila_estimada:
+                            filas_corregidas.append((fila_estimada, fila))
+                        else:
+                            nuevos_registros.append(fila)
+
                         firmas_existentes.add(firma)
-                        time.sleep(0.06)
+
+                # Con la hora estimada, el evento sigue pendiente para corregir la fila cuando llegue la real
+                if not ts_estimado:
+                    procesados.append(v.id)
             except:
                 continue
 
         if nuevos_registros:
             sheet.append_rows(nuevos_registros)
-            return {"status": "success", "añadidos": len(nuevos_registros)}
-        
-        return {"status": "success", "añadidos": 0}
+
+        for numero_fila, fila in filas_corregidas:
+            sheet.update(range_name = f"A{numero_fila}:N{numero_fila}", values = [fila])
+
+        for vuelo_id in procesados:
+            vuelos_registrados.add(vuelo_id)
+            eventos_pendientes.pop(vuelo_id, None)
+
+        return {"status": "success", "añadidos": len(nuevos_registros)}
 
     except Exception as e:
         return JSONResponse({"status": "error", "msg": str(e)}, status_code=500)